@@ -3,26 +3,313 @@
 Streamlitを使用したWebインターフェースを提供します
 """
 import os
+import platform
+import re
+import sys
+import time
+import traceback
+from collections import deque
 import streamlit as st
+import numpy as np
 import pandas as pd
 from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
 from src.core.recruitment_service import RecruitmentService
-from src.nlp_processing.matcher import match_requirements
+from src.nlp_processing.matcher import TfidfIndex, score_requirements
 from src.utils.common import setup_logger
 import config
 
 # メインロガーを設定
 logger = setup_logger('app')
 
+# 実行環境情報（Pythonバージョン, OS）。platform.platform()は遅いため起動時に一度だけ取得する
+_PLATFORM_INFO = (sys.version, platform.platform())
+
+# 候補者データのバージョントークン（件数, 最終更新日時）
+DataVersion = Tuple[int, Optional[datetime]]
+
+# データ収集中の進捗表示を更新する最小間隔（秒）
+PROGRESS_UPDATE_INTERVAL = 0.5
+
+# 件数がこれ以下なら部分選択をせず全件を安定ソートする（小さい配列では全件ソートの方が速い）
+TOP_K_PARTIAL_MIN_ROWS = 200
+
+# データ収集の対象ソース（キー, 表示名）
+SOURCES = (("github", "GitHub"), ("qiita", "Qiita"), ("openalex", "OpenAlex"), ("kaken", "KAKEN"))
+
+# 検索キーワードの区切り（半角・全角カンマと読点、前後の空白を含む）
+KEYWORD_SEPARATOR = re.compile(r"\s*[,，、]\s*")
+
+# 候補者一覧で常に表示するカラム（適合度は表示時に付与）
+BASE_COLUMNS = ("ID", "氏名", "所属", "研究者", "エンジニア", "データソース", "GitHub", "Qiita", "ORCID", "経験サマリー")
+
+# 詳細表示で選択できるカラム
+DETAIL_FIELDS = ("メール", "LinkedIn", "個人ブログ", "最終更新日")
+
+# 表示用DataFrameの列型（推論に任せず、文字列列はstring型に固定してArrowへそのまま変換できるようにする）
+DISPLAY_DTYPES = {
+    c: "string" for c in ("ID", "氏名", "所属", "データソース", "GitHub", "Qiita", "ORCID",
+                          "経験サマリー", "メール", "LinkedIn", "個人ブログ")
+}
+
+# QiitaプロフィールURLの接頭辞
+QIITA_URL_PREFIX = "https://qiita.com/"
+
+# 候補者一覧のカラム設定（再実行のたびに組み立て直さないようモジュールで保持）
+BASE_COLUMN_CONFIG = {
+    "ID": st.column_config.Column(width="small"),
+    "氏名": st.column_config.Column(width="medium"),
+    "所属": st.column_config.Column(width="small"),
+    "適合度": st.column_config.NumberColumn(format="%.2f", width="small"),
+    "研究者": st.column_config.CheckboxColumn(width="small"),
+    "エンジニア": st.column_config.CheckboxColumn(width="small"),
+    "データソース": st.column_config.Column(width="medium"),
+    "GitHub": st.column_config.LinkColumn(width="small"),
+    "Qiita": st.column_config.LinkColumn(width="small"),
+    "ORCID": st.column_config.LinkColumn(width="small"),
+    "経験サマリー": st.column_config.Column(width="large")
+}
+DETAIL_COLUMN_CONFIG = {
+    "メール": st.column_config.Column(width="medium"),
+    "LinkedIn": st.column_config.LinkColumn(width="small"),
+    "個人ブログ": st.column_config.LinkColumn(width="small"),
+    "最終更新日": st.column_config.DatetimeColumn(width="medium", format="YYYY-MM-DD HH:mm")
+}
+
+@st.cache_resource(show_spinner=False)
+def get_service() -> RecruitmentService:
+    """
+    サービスオブジェクトをプロセス内で共有する
+    再実行のたびにデータベース初期化が走らないようにキャッシュします
+    """
+    return RecruitmentService()
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _tfidf_index(version: DataVersion) -> Optional[TfidfIndex]:
+    """
+    候補者コーパスのTF-IDFインデックスをデータバージョンごとに1回だけ読み込んで共有する
+
+    Args:
+        version: 候補者データのバージョントークン（キャッシュキー）
+
+    Returns:
+        TF-IDFインデックス（作成できない場合はNone）
+    """
+    # 収集時に保存したインデックスを読み込む（保存がなければサービス側で作成して保存する）
+    return get_service().get_match_index(version)
+
+@st.cache_data(show_spinner="マッチング処理中...", persist="disk", max_entries=32)
+def _match(requirements: str, version: DataVersion) -> List[Tuple[str, float]]:
+    """
+    人材要件に対するマッチング結果をキャッシュする
+    同じ要件・同じデータバージョンの再実行では再計算しません
+
+    Args:
+        requirements: 人材要件テキスト
+        version: 候補者データのバージョントークン（キャッシュキー）
+
+    Returns:
+        (候補者ID, マッチングスコア)のタプルのリスト（スコア降順）
+    """
+    index = _tfidf_index(version)
+    if index is None:
+        return []
+    # インデックスは学習済みのため、要件のベクトル化と疎行列積1回で全候補者を採点する
+    return score_requirements(requirements, index)
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_recent_persons(person_ids: Tuple[str, ...], version: DataVersion) -> List[Dict[str, Any]]:
+    """
+    最近閲覧した候補者を1回のクエリでまとめて取得してキャッシュする
+    （ORMオブジェクトはセッションから切り離されるため、辞書に変換してキャッシュする）
+
+    Args:
+        person_ids: 候補者IDのタプル（表示順）
+        version: 候補者データのバージョントークン（キャッシュキー）
+
+    Returns:
+        候補者の辞書のリスト
+    """
+    return [person.to_dict() for person in get_service().get_persons_by_ids(list(person_ids))]
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _load_person(person_id: str, version: DataVersion) -> Optional[Dict[str, Any]]:
+    """
+    候補者1人を取得して辞書としてキャッシュする（同じ候補者の再選択ではDBを引かない）
+
+    Args:
+        person_id: 候補者ID
+        version: 候補者データのバージョントークン（キャッシュキー）
+
+    Returns:
+        候補者の辞書またはNone（見つからない場合）
+    """
+    person = get_service().get_person_by_id(person_id)
+    return person.to_dict() if person else None
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _sidebar_stats(version: DataVersion) -> Dict[str, Any]:
+    """
+    サイドバーに表示する集計値をデータベースの集計クエリで取得する
+
+    Args:
+        version: 候補者データのバージョントークン（キャッシュキー）
+
+    Returns:
+        件数（総数・研究者・エンジニア・データソース別）と最終更新日時の辞書
+    """
+    return get_service().get_dashboard_stats()
+
+def _to_display_frame(raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    テーブルのカラム名で取得した候補者DataFrameを表示用のDataFrameに変換する
+    研究者・エンジニア列はbool型のままとし、表示はCheckboxColumnで行います
+
+    Args:
+        raw: get_all_persons_df / search_persons_df の戻り値
+
+    Returns:
+        候補者1人を1行とするDataFrame
+    """
+    is_researcher = raw["is_researcher"].fillna(False).astype(bool)
+    is_engineer = raw["is_engineer"].fillna(False).astype(bool)
+
+    # 列ごとの配列から1回で組み立てる（行ごとの辞書やセルごとの文字列は作らない）
+    return pd.DataFrame({
+        # 常に表示する基本フィールド
+        "ID": raw["id"],
+        "氏名": raw["full_name"],
+        "所属": raw["current_affiliation"].fillna(""),
+        "研究者": is_researcher,
+        "エンジニア": is_engineer,
+        "データソース": raw["data_sources"].str.join(", ").fillna(""),
+        "GitHub": raw["github_username"].fillna(""),
+        "Qiita": (QIITA_URL_PREFIX + raw["qiita_id"]).fillna(""),
+        "ORCID": raw["orcid_id"].fillna(""),
+        "経験サマリー": raw["experience_summary"].fillna(""),
+        # 詳細表示用のフィールド
+        "メール": raw["email"].fillna(""),
+        "LinkedIn": raw["linkedin_url"].fillna(""),
+        "個人ブログ": raw["personal_blog_url"].fillna(""),
+        # 書式はcolumn_config側で適用（値はほぼ一意のため変換キャッシュは使わない）
+        "最終更新日": pd.to_datetime(raw["last_updated_at"], cache=False)
+    }, copy=False).astype(DISPLAY_DTYPES)
+
+@st.cache_data(show_spinner=False)
+def _persons_frame(version: DataVersion) -> pd.DataFrame:
+    """
+    全候補者の表示用DataFrameを作成してキャッシュする
+
+    Args:
+        version: 候補者データのバージョントークン（キャッシュキー）
+
+    Returns:
+        候補者1人を1行とするDataFrame
+    """
+    return _to_display_frame(get_service().get_all_persons_df())
+
+@st.cache_data(show_spinner=False, max_entries=128)
+def _search_frame(keyword: str, include_researchers: bool, include_engineers: bool,
+                  version: DataVersion) -> pd.DataFrame:
+    """
+    キーワードと候補者区分でDB側で絞り込んだ表示用DataFrameを取得してキャッシュする
+
+    Args:
+        keyword: 検索キーワード
+        include_researchers: 研究者を含めるか
+        include_engineers: エンジニアを含めるか
+        version: 候補者データのバージョントークン（キャッシュキー）
+
+    Returns:
+        候補者1人を1行とするDataFrame
+    """
+    return _to_display_frame(get_service().search_persons_df(keyword, include_researchers, include_engineers))
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _candidate_frame(version: DataVersion, keyword: str, include_researchers: bool,
+                     include_engineers: bool, detail_fields: Tuple[str, ...]) -> pd.DataFrame:
+    """
+    検索条件で絞り込み、表示カラムだけを抽出した候補者一覧をキャッシュする
+    （条件が変わらない再実行ではDataFrameを組み立て直さない）
+
+    Args:
+        version: 候補者データのバージョントークン（キャッシュキー）
+        keyword: 検索キーワード
+        include_researchers: 研究者を含めるか
+        include_engineers: エンジニアを含めるか
+        detail_fields: 追加で表示する詳細カラム
+
+    Returns:
+        表示カラムのみの候補者DataFrame（適合度は含まない）
+    """
+    if keyword:
+        # キーワード検索はDB側（全文検索＋候補者区分の条件）で絞り込む
+        filtered_df = _search_frame(keyword, include_researchers, include_engineers, version)
+    else:
+        # 全候補者のDataFrame（キャッシュ済み）をbool列のNumPy配列から作ったマスク1回で絞り込む
+        # 両方選択されている場合は絞り込み不要
+        filtered_df = _persons_frame(version)
+        if not (include_researchers and include_engineers):
+            mask = ((filtered_df["研究者"].to_numpy() & include_researchers)
+                    | (filtered_df["エンジニア"].to_numpy() & include_engineers))
+            filtered_df = filtered_df[mask]
+
+    return filtered_df[list(BASE_COLUMNS) + list(detail_fields)]
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _persons_count(version: DataVersion, include_researchers: bool, include_engineers: bool) -> int:
+    """
+    候補者区分の条件に一致する候補者数を取得してキャッシュする
+
+    Args:
+        version: 候補者データのバージョントークン（キャッシュキー）
+        include_researchers: 研究者を含めるか
+        include_engineers: エンジニアを含めるか
+
+    Returns:
+        候補者数
+    """
+    return get_service().count_persons(include_researchers, include_engineers)
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _persons_page(version: DataVersion, include_researchers: bool, include_engineers: bool,
+                  detail_fields: Tuple[str, ...], skip: int, limit: int) -> pd.DataFrame:
+    """
+    候補者一覧の1ページ分だけをSQLのLIMIT/OFFSETで取得してキャッシュする
+
+    Args:
+        version: 候補者データのバージョントークン（キャッシュキー）
+        include_researchers: 研究者を含めるか
+        include_engineers: エンジニアを含めるか
+        detail_fields: 追加で表示する詳細カラム
+        skip: 先頭から読み飛ばす件数
+        limit: 取得する件数
+
+    Returns:
+        表示カラムのみの候補者DataFrame（適合度は含まない）
+    """
+    raw = get_service().get_all_persons_df(skip, limit, include_researchers, include_engineers)
+    return _to_display_frame(raw)[list(BASE_COLUMNS) + list(detail_fields)]
+
+def _clear_data_caches():
+    """
+    候補者データを変更した後に、古いデータバージョンのキャッシュをまとめて破棄する
+    （バージョンが変わればキャッシュキーも変わるが、古いエントリがメモリに残り続けないようにする）
+    """
+    for cached in (_persons_frame, _search_frame, _candidate_frame, _persons_count, _persons_page,
+                   _load_person, _load_recent_persons, _sidebar_stats, _tfidf_index):
+        cached.clear()
+
 def main():
-    # アプリケーション起動時にログを記録
-    logger.info(f"アプリケーション {config.APP_TITLE} を起動しました")
-    logger.debug(f"設定情報: LOG_DIR={config.LOG_DIR}, LOG_LEVEL={config.LOG_LEVEL}")
+    # 起動ログはセッションごとに一度だけ記録（再実行のたびには出さない）
+    if "startup_logged" not in st.session_state:
+        st.session_state.startup_logged = True
+        logger.info(f"アプリケーション {config.APP_TITLE} を起動しました")
+        logger.debug(f"設定情報: LOG_DIR={config.LOG_DIR}, LOG_LEVEL={config.LOG_LEVEL}")
 
-    # 環境とシステム情報をログに記録
-    import platform
-    import sys
-    logger.info(f"実行環境: Python {sys.version}, OS: {platform.platform()}")
+        # 環境とシステム情報をログに記録
+        python_version, os_name = _PLATFORM_INFO
+        logger.info(f"実行環境: Python {python_version}, OS: {os_name}")
 
     st.set_page_config(
         page_title=config.APP_TITLE,
@@ -37,638 +324,634 @@ def main():
     st.title(config.APP_TITLE)
     st.markdown("Web上の公開情報からエンジニアおよび研究者の候補者を見つけ出すためのツールです")
 
-    # サービスオブジェクトを初期化
-    service = RecruitmentService()
-
-    # サイドバーで検索オプション設定
-    with st.sidebar:
-        st.header("ダッシュボード")
-
-        # データ概要セクション
-        st.subheader("データ概要")
-
-        # データベースからの統計情報取得
-        persons = service.get_all_persons()
-        total_count = len(persons)
-
-        # 研究者とエンジニアのカウント
-        researcher_count = sum(1 for p in persons if p.is_researcher)
-        engineer_count = sum(1 for p in persons if p.is_engineer)
-
-        # データソースごとの人数を集計（data_sourcesカラム使用）
-        github_count = sum(1 for p in persons if p.data_sources and "github" in p.data_sources)
-        qiita_count = sum(1 for p in persons if p.data_sources and "qiita" in p.data_sources)
-        openalex_count = sum(1 for p in persons if p.data_sources and "openalex" in p.data_sources)
-        kaken_count = sum(1 for p in persons if p.data_sources and "kaken" in p.data_sources)
+    # サービスオブジェクトを取得（キャッシュ済み）
+    service = get_service()
 
-        # 最新の更新日時
-        if persons:
-            latest_update = max((p.last_updated_at for p in persons if p.last_updated_at), default=None)
-            latest_update_str = latest_update.strftime("%Y-%m-%d %H:%M") if latest_update else "なし"
-        else:
-            latest_update_str = "なし"
-
-        # メトリクスを表示
-        col1, col2 = st.columns(2)
-        with col1:
-            st.metric("総候補者数", total_count)
-            st.metric("研究者", researcher_count)
-        with col2:
-            st.metric("エンジニア", engineer_count)
-
-        st.caption(f"最終更新: {latest_update_str}")
+    # 1回の再実行の中ではDBセッション（接続）を共有する
+    with service:
+        # 候補者データのバージョン（DBの件数と最終更新日時。変化するとキャッシュが無効になる）
+        st.session_state.persons_version = service.get_data_version()
 
-        # データソース内訳
-        st.caption("データソース内訳:")
-        st.write(f"GitHub: {github_count}人, Qiita: {qiita_count}人, OpenAlex: {openalex_count}人, KAKEN: {kaken_count}人")
+        # サイドバーで検索オプション設定
+        with st.sidebar:
+            st.header("ダッシュボード")
 
-        st.divider()
+            # データ概要セクション（サイドバー内の他の操作では再計算しない）
+            _sidebar_stats_panel()
 
-        # クイック検索セクション
-        st.subheader("クイック検索")
+            st.divider()
 
-        # よく使われるキーワードを設定（実際には利用頻度から動的に生成するとよい）
-        common_keywords = [
-            "Python", "機械学習", "データサイエンス", "深層学習",
-            "自然言語処理", "コンピュータビジョン", "TensorFlow", "PyTorch"
-        ]
-
-        # クイック検索ボタン
-        st.caption("キーワードでクイック検索:")
-
-        # 2列でボタンを配置
-        for i in range(0, len(common_keywords), 2):
-            cols = st.columns(2)
-            for j in range(2):
-                if i + j < len(common_keywords):
-                    keyword = common_keywords[i + j]
-                    if cols[j].button(keyword, key=f"quick_search_{keyword}"):
-                        # ボタンがクリックされたらキーワードを検索ボックスにセット
-                        st.session_state.search_keyword = keyword
-                        st.session_state.active_tab = 0  # 候補者一覧タブに切り替え
-
-        # カスタム検索
-        st.caption("カスタム検索:")
-        custom_search = st.text_input("キーワードを入力", key="sidebar_search_input")
-        if st.button("検索", key="sidebar_search_button"):
-            if custom_search:
-                st.session_state.search_keyword = custom_search
-                st.session_state.active_tab = 0  # 候補者一覧タブに切り替え
-                st.rerun()  # UIを更新
-
-        st.divider()
-
-        # お気に入り候補者（将来の機能のためのプレースホルダー）
-        st.subheader("最近閲覧した候補者")
-
-        # セッション状態に最近閲覧した候補者リストを初期化
-        if "recent_viewed_persons" not in st.session_state:
-            st.session_state.recent_viewed_persons = []
-
-        # 最近閲覧した候補者がいれば表示
-        if st.session_state.recent_viewed_persons:
-            for person_id in st.session_state.recent_viewed_persons[:5]:  # 最新5件まで表示
-                person = service.get_person_by_id(person_id)
-                if person:
-                    if st.button(f"{person.full_name}", key=f"recent_{person.id}"):
-                        # 候補者一覧タブに移動して該当候補者を選択
-                        st.session_state.selected_person_id = person.id
-                        st.session_state.active_tab = 0
-                        st.rerun()
-        else:
-            st.caption("まだ候補者が閲覧されていません")
+            # クイック検索セクション
+            st.subheader("クイック検索")
 
-    # メインコンテンツ
-    # タブ選択用のセッション状態を初期化
-    if "active_tab" not in st.session_state:
-        st.session_state.active_tab = 0  # デフォルトは候補者一覧タブ
+            # よく使われるキーワードを設定（実際には利用頻度から動的に生成するとよい）
+            common_keywords = [
+                "Python", "機械学習", "データサイエンス", "深層学習",
+                "自然言語処理", "コンピュータビジョン", "TensorFlow", "PyTorch"
+            ]
 
-    # データ収集完了時の処理
-    # タブの自動切り替えは行わず、フラグのみリセットする
-    # if st.session_state.get("collection_completed", False):
-        # 自動タブ切り替えは行わない
-        # st.session_state.collection_completed = False  # フラグをリセットしない（表示を維持するため）
+            # クイック検索（キーワード選択を1つのウィジェットにまとめる）
+            def quick_search_callback():
+                keyword = st.session_state.quick_search_keyword
+                if keyword:
+                    # 選択されたキーワードを検索ボックスにセット
+                    st.session_state.search_keyword = keyword
+                    st.session_state.active_tab = 0  # 候補者一覧タブに切り替え
 
-    # タブの定義
-    tab_names = ["候補者一覧", "人材要件入力", "データ収集", "アプローチ戦略"]
+            st.pills(
+                "キーワードでクイック検索:",
+                common_keywords,
+                selection_mode="single",
+                key="quick_search_keyword",
+                on_change=quick_search_callback
+            )
+
+            # カスタム検索（入力中は再実行せず、送信時にまとめて反映する）
+            # コールバックで検索ボックスに反映するため、反映のための再実行（st.rerun）は不要
+            def custom_search_callback():
+                custom_search = st.session_state.sidebar_search_input
+                if custom_search:
+                    st.session_state.search_keyword = custom_search
+                    st.session_state.active_tab = 0  # 候補者一覧タブに切り替え
 
-    # タブを作成し、アクティブなタブを選択
-    tabs = st.tabs(tab_names)
+            st.caption("カスタム検索:")
+            with st.form("sidebar_search_form", border=False):
+                st.text_input("キーワードを入力", key="sidebar_search_input")
+                st.form_submit_button("検索適用", on_click=custom_search_callback)
 
-    # セッション状態からアクティブなタブのインデックスを取得
-    current_tab_index = st.session_state.active_tab
+            st.divider()
 
-    # タブ選択用のセッション状態を初期化
-    if "active_tab" not in st.session_state:
-        st.session_state.active_tab = 0
+            # お気に入り候補者（将来の機能のためのプレースホルダー）
+            st.subheader("最近閲覧した候補者")
 
-    # タブを選択
-    if "active_tab" in st.session_state:
-        st.session_state.active_tab_obj = tabs[st.session_state.active_tab]
+            # セッション状態に最近閲覧した候補者リストを初期化
+            if "recent_viewed_persons" not in st.session_state:
+                st.session_state.recent_viewed_persons = deque(maxlen=5)  # 最新5件まで保持
 
-    # 候補者一覧タブ
-    with tabs[0]:
-        st.header("候補者一覧")
+            # 最近閲覧した候補者がいれば表示
+            def recent_person_callback(person_id: str):
+                # 候補者一覧タブに移動して該当候補者を選択
+                st.session_state.selected_person_id = person_id
+                st.session_state.active_tab = 0
 
-        col1, col2 = st.columns(2)
-        with col1:
-            st.subheader("検索オプション")
-            st.text_input("キーワードで候補者を検索", key="search_keyword")
-            st.checkbox("研究者", value=True, key="include_researchers")
-            st.checkbox("エンジニア", value=True, key="include_engineers")
-        with col2:
-            st.subheader("表示オプション")
-            st.checkbox("詳細情報を表示", value=False, key="show_details")
-
-            # 詳細表示が有効な場合、表示するフィールドを選択
-            if "show_details" in st.session_state and st.session_state.show_details:
-                st.multiselect(
-                    "表示するフィールド",
-                    options=["メール", "LinkedIn", "個人ブログ", "最終更新日"],
-                    default=["メール"],
-                    key="display_fields"
-                )
+            if st.session_state.recent_viewed_persons:
+                recent_ids = tuple(st.session_state.recent_viewed_persons)
+                for person in _load_recent_persons(recent_ids, st.session_state.persons_version):
+                    st.button(f"{person['full_name']}", key=f"recent_{person['id']}",
+                              on_click=recent_person_callback, args=(person["id"],))
             else:
-                # デフォルト値を設定
-                st.session_state.display_fields = []
-
-        st.divider()  # 区切り線を追加
-        # データ更新フラグがある場合はリフレッシュ
-        refresh_data = st.session_state.get("refresh_data", False)
-
-        # ダミーデータでテーブルを作成（実際にはDBから取得）
-        if "match_score" not in st.session_state:
-            st.session_state.match_score = {}
-
-        persons = service.get_all_persons()
-
-        if refresh_data:
-            st.session_state.refresh_data = False  # フラグをリセット
-
-        if persons:
-            # 検索キーワードでフィルタリング
-            if st.session_state.search_keyword:
-                persons = service.search_persons_by_keyword(
-                    persons, st.session_state.search_keyword
-                )
-
-            # チェックボックスでフィルタリング
-            filtered_persons = []
-            for p in persons:
-                if (p.is_researcher and st.session_state.include_researchers) or \
-                   (p.is_engineer and st.session_state.include_engineers):
-                    filtered_persons.append(p)
-
-            if filtered_persons:
-                # Pandas DataFrameに変換
-                rows = []
-                for p in filtered_persons:
-                    # 常に表示する基本フィールド
-                    row = {
-                        "ID": p.id,
-                        "氏名": p.full_name,
-                        "所属": p.current_affiliation or "",
-                        "適合度": st.session_state.match_score.get(p.id, 0.0),
-                        "研究者": "✓" if p.is_researcher else "",
-                        "エンジニア": "✓" if p.is_engineer else "",
-                        "データソース": ", ".join(p.data_sources) if p.data_sources else "",
-                        "GitHub": p.github_username or "",
-                        "Qiita": "https://qiita.com/" + p.qiita_id  if p.qiita_id else "",
-                        "ORCID": p.orcid_id or "",
-                        "経験サマリー": p.experience_summary or ""
-                    }
-
-                    # 詳細表示が有効な場合の追加フィールド
-                    if "show_details" in st.session_state and st.session_state.show_details:
-                        if "メール" in st.session_state.display_fields:
-                            row["メール"] = p.email or ""
-
-                        if "LinkedIn" in st.session_state.display_fields:
-                            row["LinkedIn"] = p.linkedin_url or ""
-
-                        if "個人ブログ" in st.session_state.display_fields:
-                            row["個人ブログ"] = p.personal_blog_url or ""
-
-                        if "最終更新日" in st.session_state.display_fields:
-                            row["最終更新日"] = p.last_updated_at.strftime("%Y-%m-%d %H:%M") if p.last_updated_at else ""
-
-                    rows.append(row)
-
-                # DataFrameの作成
-                df = pd.DataFrame(rows)
-
-                # 適合度でソート
-                df = df.sort_values("適合度", ascending=False)
-
-                # 基本カラム設定
-                column_config = {
-                    "ID": st.column_config.Column(width="small"),
-                    "氏名": st.column_config.Column(width="medium"),
-                    "所属": st.column_config.Column(width="small"),
-                    "適合度": st.column_config.NumberColumn(format="%.2f", width="small"),
-                    "研究者": st.column_config.Column(width="small"),
-                    "エンジニア": st.column_config.Column(width="small"),
-                    "データソース": st.column_config.Column(width="medium"),
-                    "GitHub": st.column_config.LinkColumn(width="small"),
-                    "Qiita": st.column_config.LinkColumn(width="small"),
-                    "ORCID": st.column_config.LinkColumn(width="small"),
-                    "経験サマリー": st.column_config.Column(width="large")
-                }
-
-                # 詳細表示が有効な場合の追加カラム設定
-                if "show_details" in st.session_state and st.session_state.show_details:
-                    if "メール" in st.session_state.display_fields:
-                        column_config["メール"] = st.column_config.Column(width="medium")
-
-                    if "LinkedIn" in st.session_state.display_fields:
-                        column_config["LinkedIn"] = st.column_config.LinkColumn(width="small")
-
-                    if "個人ブログ" in st.session_state.display_fields:
-                        column_config["個人ブログ"] = st.column_config.LinkColumn(width="small")
-
-                    if "最終更新日" in st.session_state.display_fields:
-                        column_config["最終更新日"] = st.column_config.DateColumn(width="medium", format="YYYY-MM-DD HH:mm")
-
-                # セッション状態に選択された候補者IDを保存するキーを追加
-                if "selected_person_id" not in st.session_state:
-                    st.session_state.selected_person_id = None
-
-                def handle_click():
-                    st.session_state.selected_person_row = st.session_state.person_selection.selection.rows[0]
-                    print(f"選択された候補者ID: {st.session_state.selected_person_row}")
-
-
-                # テーブル表示
-                st.dataframe(
-                    df,
-                    hide_index=True,
-                    column_config=column_config,
-                    use_container_width=True,
-                    key="person_selection",
-                    on_select=handle_click,  # 行クリック時のコールバックを設定
-                    selection_mode="single-row"
+                st.caption("まだ候補者が閲覧されていません")
+
+        # メインコンテンツ
+        # タブ選択用のセッション状態を初期化
+        if "active_tab" not in st.session_state:
+            st.session_state.active_tab = 0  # デフォルトは候補者一覧タブ
+
+        # データ収集完了時の処理
+        # タブの自動切り替えは行わず、フラグのみリセットする
+        # if st.session_state.get("collection_completed", False):
+            # 自動タブ切り替えは行わない
+            # st.session_state.collection_completed = False  # フラグをリセットしない（表示を維持するため）
+
+        # タブの定義
+        tab_names = ["候補者一覧", "人材要件入力", "データ収集", "アプローチ戦略"]
+
+        # タブを作成し、アクティブなタブを選択
+        tabs = st.tabs(tab_names)
+
+        # セッション状態からアクティブなタブのインデックスを取得
+        current_tab_index = st.session_state.active_tab
+
+        # タブ選択用のセッション状態を初期化
+        if "active_tab" not in st.session_state:
+            st.session_state.active_tab = 0
+
+        # タブを選択
+        if "active_tab" in st.session_state:
+            st.session_state.active_tab_obj = tabs[st.session_state.active_tab]
+
+        # 候補者一覧タブ
+        with tabs[0]:
+            _tab_candidates(service)
+
+        # 人材要件入力タブ
+        with tabs[1]:
+            _tab_requirements(service)
+
+        # データ収集タブ
+        with tabs[2]:
+            _tab_collection(service)
+
+        # アプローチ戦略タブ
+        with tabs[3]:
+            _tab_strategy(service)
+
+def _top_k_positions(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    スコア上位k件の位置をスコア降順で返す（同点は元の並び順を維持）
+    全件ソートせず、argpartitionと同じ選択アルゴリズムでk番目の値を求めてから上位だけを並べる
+
+    Args:
+        scores: スコアの配列
+        k: 取り出す件数
+
+    Returns:
+        上位k件の位置（スコア降順）の配列
+    """
+    n = len(scores)
+    if k >= n or n <= TOP_K_PARTIAL_MIN_ROWS:
+        return np.argsort(-scores, kind="stable")[:k]
+    kth_value = np.partition(scores, n - k)[n - k]
+    above = np.flatnonzero(scores > kth_value)
+    ties = np.flatnonzero(scores == kth_value)[:k - len(above)]
+    top = np.concatenate([above, ties])
+    return top[np.argsort(-scores[top], kind="stable")]
+
+def _parse_keywords(text: str) -> List[str]:
+    """
+    カンマ区切りのキーワード文字列をリストに分割する
+
+    Args:
+        text: 入力されたキーワード文字列
+
+    Returns:
+        空要素を除いたキーワードのリスト
+    """
+    return [k for k in KEYWORD_SEPARATOR.split(text.strip()) if k]
+
+def _apply_source_config(src: str):
+    """
+    ソース別設定フォームの送信時に、入力内容をソース設定へ反映する
+
+    Args:
+        src: データソース名
+    """
+    cfg = st.session_state.source_configs[src]
+    cfg["enabled"] = st.session_state[f"{src}_enabled"]
+    cfg["keywords"] = _parse_keywords(st.session_state[f"{src}_keywords"])
+    cfg["max_results"] = st.session_state[f"{src}_max_results"]
+
+def _render_person_detail(person: Dict[str, Any], key_prefix: str):
+    """
+    候補者の詳細（基本情報・リンク・経験サマリ）を描画する
+
+    Args:
+        person: 表示する候補者の辞書（Person.to_dict の形式）
+        key_prefix: ウィジェットキーの接頭辞（タブごとに一意にする）
+    """
+    col1, col2 = st.columns(2)
+
+    with col1:
+        # 基本情報は1つのMarkdownにまとめて描画する（要素ごとのメッセージ送信を減らす）
+        sources_str = "、".join(person["data_sources"]) if person["data_sources"] else "不明"
+        lines = [
+            f"**氏名:** {person['full_name']}",
+            f"**所属:** {person['current_affiliation'] or '不明'}",
+            f"**データソース:** {sources_str}",
+        ]
+        if person["email"]:
+            lines.append(f"**メール:** {person['email']}")
+        st.markdown("\n\n".join(lines))
+
+        if person["email"]:
+            st.button(f"{person['email']} をコピー", key=f"{key_prefix}_copy_email_{person['id']}")
+
+        links = ["**リンク:**"]
+        if person["github_username"]:
+            links.append(f"- [GitHub](https://github.com/{person['github_username']})")
+        if person["qiita_id"]:
+            links.append(f"- [Qiita]({QIITA_URL_PREFIX}{person['qiita_id']})")
+        if person["orcid_id"]:
+            links.append(f"- [ORCID](https://orcid.org/{person['orcid_id']})")
+        if person["linkedin_url"]:
+            links.append(f"- [LinkedIn]({person['linkedin_url']})")
+        if person["personal_blog_url"]:
+            links.append(f"- [個人ブログ]({person['personal_blog_url']})")
+        st.markdown("\n".join(links))
+    with col2:
+        st.markdown(f"**経験サマリ:**\n\n{person['experience_summary'] or '情報がありません'}")
+
+@st.fragment
+def _sidebar_stats_panel():
+    """サイドバーのデータ概要を描画する"""
+    st.subheader("データ概要")
+
+    # データベースからの統計情報取得
+    stats = _sidebar_stats(st.session_state.persons_version)
+    latest_update = stats["latest_update"]
+    latest_update_str = latest_update.strftime("%Y-%m-%d %H:%M") if latest_update else "なし"
+
+    # メトリクスを表示
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("総候補者数", stats["total"])
+        st.metric("研究者", stats["researcher"])
+    with col2:
+        st.metric("エンジニア", stats["engineer"])
+
+    st.caption(f"最終更新: {latest_update_str}")
+
+    # データソース内訳
+    st.caption("データソース内訳:")
+    st.write(f"GitHub: {stats['github']}人, Qiita: {stats['qiita']}人, OpenAlex: {stats['openalex']}人, KAKEN: {stats['kaken']}人")
+
+@st.fragment
+def _tab_candidates(service: RecruitmentService):
+    """候補者一覧タブを描画する"""
+    st.header("候補者一覧")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("検索オプション")
+        # 入力のたびに再実行されないよう、検索ボタンの押下時にのみキーワードを反映
+        with st.form("search_form", border=False):
+            st.text_input("キーワードで候補者を検索", key="search_keyword")
+            st.form_submit_button("検索")
+        st.checkbox("研究者", value=True, key="include_researchers")
+        st.checkbox("エンジニア", value=True, key="include_engineers")
+    with col2:
+        st.subheader("表示オプション")
+        st.checkbox("詳細情報を表示", value=False, key="show_details")
+
+        # 詳細表示が有効な場合、表示するフィールドを選択
+        if st.session_state.get("show_details"):
+            st.multiselect(
+                "表示するフィールド",
+                options=DETAIL_FIELDS,
+                default=["メール"],
+                key="display_fields"
+            )
+        else:
+            # デフォルト値を設定
+            st.session_state.display_fields = []
+
+    st.divider()  # 区切り線を追加
+
+    # 以降で何度も参照するセッション状態をローカル変数に束縛
+    ss = st.session_state
+    version = ss.persons_version
+    show_details = ss.get("show_details", False)
+    detail_fields = ss.get("display_fields", []) if show_details else []
+    # 前後の空白だけが違う送信は同じ検索条件として扱い、キャッシュ済みの結果を再利用する
+    keyword = ss.get("search_keyword", "").strip()
+    include_researchers = ss.include_researchers
+    include_engineers = ss.include_engineers
+
+    # データ更新フラグがある場合はリフレッシュ
+    if ss.get("refresh_data", False):
+        ss.refresh_data = False  # フラグをリセット
+
+    # ダミーデータでテーブルを作成（実際にはDBから取得）
+    if "match_score" not in ss:
+        ss.match_score = pd.Series(dtype="float32")
+
+    # 研究者・エンジニアのどちらも選択されていなければ、データを読み込まずに終了
+    if not include_researchers and not include_engineers:
+        st.info("条件に一致する候補者が見つかりませんでした")
+        return
+
+    # 候補者の有無はデータバージョンの件数で判定する（候補者オブジェクトは読み込まない）
+    if version[0] > 0:
+        if keyword or not ss.match_score.empty:
+            # 絞り込み済みのDataFrameはセッションに保持し、条件が同じ再実行ではキャッシュからの復元も省く
+            frame_key = (version, keyword, include_researchers, include_engineers, tuple(detail_fields))
+            if ss.get("candidate_frame_key") != frame_key:
+                ss.candidate_frame_key = frame_key
+                ss.candidate_frame = _candidate_frame(*frame_key)
+            # 保持しているDataFrameを書き換えないよう、浅いコピーに適合度を付与する
+            df = ss.candidate_frame.copy(deep=False)
+            df.insert(3, "適合度", df["ID"].map(ss.match_score).fillna(0.0).astype("float32"))
+            total_rows = len(df)
+        else:
+            # キーワードも適合度もなければ登録順のまま表示するため、全件は読み込まず
+            # 件数だけを数えて、表示するページ分をSQLのLIMIT/OFFSETで取得する
+            df = None
+            total_rows = _persons_count(version, include_researchers, include_engineers)
+
+        if total_rows:
+            # ページ送り（表示するページ分だけを適合度の上位から取り出してブラウザに送る）
+            page_col, size_col = st.columns([3, 1])
+            with size_col:
+                page_size = st.selectbox(
+                    "表示件数",
+                    config.CANDIDATES_PAGE_SIZE_OPTIONS,
+                    index=config.CANDIDATES_PAGE_SIZE_OPTIONS.index(config.CANDIDATES_PAGE_SIZE),
+                    key="candidate_page_size"
                 )
-
-                # 候補者詳細表示
-                st.subheader("候補者詳細")
-                # selected_id = st.selectbox("詳細を表示する候補者を選択", options=df["ID"].tolist(), format_func=lambda x: df[df["ID"]==x]["氏名"].iloc[0])
-                # セレクトボックスを使わず、クリックされた行のIDを使用
-                # selected_person_rowは行番号なので、これを使ってIDを取得
-                selected_id = df.iloc[st.session_state.person_selection.selection.rows[0]]["ID"] if st.session_state.person_selection.selection.rows else None
-
-                if selected_id:
-                    person = service.get_person_by_id(selected_id)
-                    if person:
-                        col1, col2 = st.columns(2)
-
-                        with col1:
-                            st.markdown(f"**氏名:** {person.full_name}")
-                            st.markdown(f"**所属:** {person.current_affiliation or '不明'}")
-
-                            # データソース情報を表示
-                            sources_str = "、".join(person.data_sources) if person.data_sources else "不明"
-                            st.markdown(f"**データソース:** {sources_str}")
-
-                            if person.email:
-                                st.markdown(f"**メール:** {person.email}")
-                                st.button(f"{person.email} をコピー", key=f"copy_email_{person.id}")
-
-                            st.markdown("**リンク:**")
-                            if person.github_username:
-                                st.markdown(f"- [GitHub](https://github.com/{person.github_username})")
-                            if person.qiita_id:
-                                st.markdown(f"- [Qiita](https://qiita.com/{person.qiita_id})")
-                            if person.orcid_id:
-                                st.markdown(f"- [ORCID](https://orcid.org/{person.orcid_id})")
-                            if person.linkedin_url:
-                                st.markdown(f"- [LinkedIn]({person.linkedin_url})")
-                            if person.personal_blog_url:
-                                st.markdown(f"- [個人ブログ]({person.personal_blog_url})")
-
-                        with col2:
-                            st.markdown("**経験サマリ:**")
-                            st.markdown(person.experience_summary or "情報がありません")
+            num_pages = (total_rows + page_size - 1) // page_size
+            with page_col:
+                page = st.number_input("ページ", min_value=1, max_value=num_pages, value=1, step=1, key="candidate_page") if num_pages > 1 else 1
+            start = (page - 1) * page_size
+            if df is None:
+                df = _persons_page(version, include_researchers, include_engineers, tuple(detail_fields), start, page_size)
+                df.insert(3, "適合度", np.zeros(len(df), dtype=np.float32))
             else:
-                st.info("条件に一致する候補者が見つかりませんでした")
+                df = df.iloc[_top_k_positions(df["適合度"].to_numpy(), start + page_size)[start:]]
+            st.caption(f"{total_rows}人中 {start + 1}〜{start + len(df)}人目を表示")
+
+            # カラム設定（基本カラム＋選択された詳細カラム）
+            column_config = {**BASE_COLUMN_CONFIG, **{f: DETAIL_COLUMN_CONFIG[f] for f in detail_fields}}
+
+            # セッション状態に選択された候補者IDを保存するキーを追加
+            if "selected_person_id" not in ss:
+                ss.selected_person_id = None
+
+            def handle_click():
+                st.session_state.selected_person_row = st.session_state.person_selection.selection.rows[0]
+                print(f"選択された候補者ID: {st.session_state.selected_person_row}")
+
+
+            # テーブル表示
+            st.dataframe(
+                df,
+                hide_index=True,
+                column_config=column_config,
+                use_container_width=True,
+                key="person_selection",
+                on_select=handle_click,  # 行クリック時のコールバックを設定
+                selection_mode="single-row"
+            )
+
+            # 候補者詳細表示
+            st.subheader("候補者詳細")
+            # クリックされた行の行番号から候補者IDを取得
+            selected_rows = ss.person_selection.selection.rows
+            selected_id = df["ID"].iat[selected_rows[0]] if selected_rows and selected_rows[0] < len(df) else None
+            # 選択が変わったときだけ候補者を引き当て、辞書のままアプローチ戦略タブと共有する
+            selection_key = (selected_id, version)
+            if ss.get("selected_person_key") != selection_key:
+                selection_changed = ss.selected_person_id != selected_id
+                ss.selected_person_key = selection_key
+                ss.selected_person_id = selected_id
+                ss.selected_person = _load_person(selected_id, version) if selected_id else None
+                # 最近閲覧した候補者の先頭に追加（上限を超えた古いものは自動的に押し出される）
+                if ss.selected_person:
+                    recent = ss.recent_viewed_persons
+                    if selected_id in recent:
+                        recent.remove(selected_id)
+                    recent.appendleft(selected_id)
+                # 行の選択ではこのフラグメントだけが再実行されるため、アプローチ戦略タブやサイドバーにも反映するようアプリ全体を再実行
+                if selection_changed:
+                    st.rerun(scope="app")
+
+            if selected_id and ss.selected_person:
+                _render_person_detail(ss.selected_person, "candidates")
         else:
-            st.info("候補者データがありません。「データ収集」タブからデータを収集してください")
-
-    # 人材要件入力タブ
-    with tabs[1]:
-        st.header("人材要件入力")
-
-        requirements = st.text_area(
-            "求める人材の要件を入力してください",
-            placeholder="例: 機械学習を使った5年以上の実務経験、自己教師あり学習の実装経験、Python、TensorFlow、PyTorchの習熟度、ICLRでの発表経験など",
-            height=200
-        )
-
-        if st.button("要件に基づいて候補者をマッチング"):
-            if requirements:
-                with st.spinner("マッチング処理中..."):
-                    # 全候補者を取得
-                    all_persons = service.get_all_persons()
-
-                    # マッチングスコア計算
-                    match_results = match_requirements(requirements, all_persons)
-
-                    # セッション状態に保存
-                    st.session_state.match_score = {
-                        person_id: score for person_id, score in match_results
-                    }
-
-                    st.success(f"{len(match_results)}人の候補者のマッチングスコアを計算しました")
-
-                    # 候補者一覧タブに自動切り替え
-                    st.session_state.active_tab = 0  # 候補者一覧タブに切り替え
-                    st.rerun()  # アプリを再実行して表示を更新
-            else:
-                st.error("人材要件を入力してください")
-
-    # データ収集タブ
-    with tabs[2]:
-        st.header("データ収集")
-
-        col1, col2 = st.columns(2)
-
-        with col1:
-            st.subheader("データソース設定")
-
-            # ソースごとに設定できる高度なモードを追加
-            advanced_mode = st.checkbox("ソースごとに詳細設定", value=False)
-
-            # 初期設定
-            if "source_configs" not in st.session_state:
-                st.session_state.source_configs = {
-                    "github": {"enabled": True, "keywords": [], "max_results": 30},
-                    "qiita": {"enabled": True, "keywords": [], "max_results": 30},
-                    "openalex": {"enabled": True, "keywords": [], "max_results": 30},
-                    "kaken": {"enabled": True, "keywords": [], "max_results": 30}
-                }
+            st.info("条件に一致する候補者が見つかりませんでした")
+    else:
+        st.info("候補者データがありません。「データ収集」タブからデータを収集してください")
+
+@st.fragment
+def _tab_requirements(service: RecruitmentService):
+    """人材要件入力タブを描画する"""
+    st.header("人材要件入力")
+
+    requirements = st.text_area(
+        "求める人材の要件を入力してください",
+        placeholder="例: 機械学習を使った5年以上の実務経験、自己教師あり学習の実装経験、Python、TensorFlow、PyTorchの習熟度、ICLRでの発表経験など",
+        height=200
+    )
 
-            if advanced_mode:
-                # ソースごとに異なる設定を可能にする
-                st.write("各データソースの設定")
+    if st.button("要件に基づいて候補者をマッチング"):
+        if requirements:
+            # マッチングスコア計算（要件テキストとデータバージョンでキャッシュ）
+            match_results = _match(requirements, st.session_state.persons_version)
 
-                # GitHub設定
-                with st.expander("GitHub", expanded=True):
-                    st.session_state.source_configs["github"]["enabled"] = st.checkbox(
-                        "GitHub を有効化",
-                        value=st.session_state.source_configs["github"]["enabled"]
-                    )
-                    github_keywords = st.text_input(
-                        "GitHub検索キーワード（カンマ区切りで複数指定可）",
-                        ", ".join(st.session_state.source_configs["github"].get("keywords", [])),
-                        key="github_keywords"
-                    )
-                    st.session_state.source_configs["github"]["keywords"] = [k.strip() for k in github_keywords.split(",") if k.strip()]
-                    st.session_state.source_configs["github"]["max_results"] = st.slider(
-                        "GitHubの最大取得件数",
-                        min_value=5, max_value=100,
-                        value=st.session_state.source_configs["github"].get("max_results", 30),
-                        step=5,
-                        key="github_max_results"
-                    )
+            # セッション状態に保存（候補者IDをインデックスとするfloat32配列）
+            ids, scores = zip(*match_results) if match_results else ((), ())
+            st.session_state.match_score = pd.Series(np.asarray(scores, dtype=np.float32), index=list(ids))
 
-                # Qiita設定
-                with st.expander("Qiita", expanded=True):
-                    st.session_state.source_configs["qiita"]["enabled"] = st.checkbox(
-                        "Qiita を有効化",
-                        value=st.session_state.source_configs["qiita"]["enabled"]
-                    )
-                    qiita_keywords = st.text_input(
-                        "Qiita検索キーワード（カンマ区切りで複数指定可）",
-                        ", ".join(st.session_state.source_configs["qiita"].get("keywords", [])),
-                        key="qiita_keywords"
-                    )
-                    st.session_state.source_configs["qiita"]["keywords"] = [k.strip() for k in qiita_keywords.split(",") if k.strip()]
-                    st.session_state.source_configs["qiita"]["max_results"] = st.slider(
-                        "Qiitaの最大取得件数",
-                        min_value=5, max_value=100,
-                        value=st.session_state.source_configs["qiita"].get("max_results", 30),
-                        step=5,
-                        key="qiita_max_results"
-                    )
+            st.success(f"{len(match_results)}人の候補者のマッチングスコアを計算しました")
 
-                # OpenAlex設定
-                with st.expander("OpenAlex", expanded=True):
-                    st.session_state.source_configs["openalex"]["enabled"] = st.checkbox(
-                        "OpenAlex を有効化",
-                        value=st.session_state.source_configs["openalex"]["enabled"]
-                    )
-                    openalex_keywords = st.text_input(
-                        "OpenAlex検索キーワード（カンマ区切りで複数指定可）",
-                        ", ".join(st.session_state.source_configs["openalex"].get("keywords", [])),
-                        key="openalex_keywords"
+            # 候補者一覧タブに自動切り替え
+            st.session_state.active_tab = 0  # 候補者一覧タブに切り替え
+            st.rerun()  # アプリを再実行して表示を更新
+        else:
+            st.error("人材要件を入力してください")
+
+@st.fragment
+def _tab_collection(service: RecruitmentService):
+    """データ収集タブを描画する"""
+    st.header("データ収集")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.subheader("データソース設定")
+
+        # ソースごとに設定できる高度なモードを追加
+        advanced_mode = st.checkbox("ソースごとに詳細設定", value=False)
+
+        # 初期設定
+        if "source_configs" not in st.session_state:
+            st.session_state.source_configs = {
+                src: {"enabled": True, "keywords": [], "max_results": 30} for src, _ in SOURCES
+            }
+
+        if advanced_mode:
+            # ソースごとに異なる設定を可能にする
+            st.write("各データソースの設定")
+
+            for src, label in SOURCES:
+                cfg = st.session_state.source_configs[src]
+                # ソースごとのフォームにまとめ、送信時だけ設定を反映する
+                with st.expander(label, expanded=True), st.form(f"{src}_form", border=False):
+                    st.checkbox(f"{label} を有効化", value=cfg["enabled"], key=f"{src}_enabled")
+                    st.text_input(
+                        f"{label}検索キーワード（カンマ区切りで複数指定可）",
+                        ", ".join(cfg.get("keywords", [])),
+                        key=f"{src}_keywords"
                     )
-                    st.session_state.source_configs["openalex"]["keywords"] = [k.strip() for k in openalex_keywords.split(",") if k.strip()]
-                    st.session_state.source_configs["openalex"]["max_results"] = st.slider(
-                        "OpenAlexの最大取得件数",
+                    st.slider(
+                        f"{label}の最大取得件数",
                         min_value=5, max_value=100,
-                        value=st.session_state.source_configs["openalex"].get("max_results", 30),
+                        value=cfg.get("max_results", 30),
                         step=5,
-                        key="openalex_max_results"
+                        key=f"{src}_max_results"
                     )
+                    st.form_submit_button("設定を適用", on_click=_apply_source_config, args=(src,))
 
-                # KAKEN設定
-                with st.expander("KAKEN", expanded=True):
-                    st.session_state.source_configs["kaken"]["enabled"] = st.checkbox(
-                        "KAKEN を有効化",
-                        value=st.session_state.source_configs["kaken"]["enabled"]
-                    )
-                    kaken_keywords = st.text_input(
-                        "KAKEN検索キーワード（カンマ区切りで複数指定可）",
-                        ", ".join(st.session_state.source_configs["kaken"].get("keywords", [])),
-                        key="kaken_keywords"
-                    )
-                    st.session_state.source_configs["kaken"]["keywords"] = [k.strip() for k in kaken_keywords.split(",") if k.strip()]
-                    st.session_state.source_configs["kaken"]["max_results"] = st.slider(
-                        "KAKENの最大取得件数",
-                        min_value=5, max_value=100,
-                        value=st.session_state.source_configs["kaken"].get("max_results", 30),
-                        step=5,
-                        key="kaken_max_results"
-                    )
-            else:
-                # 従来のシンプルなUI
+            # 実行ボタン
+            start_requested = st.button("データ収集開始")
+        else:
+            # 従来のシンプルなUI（フォームにまとめ、収集開始時にだけ設定を反映する）
+            with st.form("source_config_form", border=False):
                 sources = {
-                    "github": st.checkbox("GitHub", value=st.session_state.source_configs["github"]["enabled"]),
-                    "qiita": st.checkbox("Qiita", value=st.session_state.source_configs["qiita"]["enabled"]),
-                    "openalex": st.checkbox("OpenAlex", value=st.session_state.source_configs["openalex"]["enabled"]),
-                    "kaken": st.checkbox("KAKEN", value=st.session_state.source_configs["kaken"]["enabled"])
+                    src: st.checkbox(label, value=st.session_state.source_configs[src]["enabled"])
+                    for src, label in SOURCES
                 }
 
-                # ソースの有効/無効状態をセッション状態に保存
-                for src, enabled in sources.items():
-                    st.session_state.source_configs[src]["enabled"] = enabled
-
                 keywords = st.text_input("検索キーワード（カンマ区切りで複数指定可）", placeholder="python, 機械学習, データサイエンス")
                 max_results = st.slider("最大取得件数", min_value=10, max_value=100, value=30, step=10)
 
-                # すべてのソースに同じキーワードと最大件数を設定
-                if keywords:
-                    keywords_list = [k.strip() for k in keywords.split(",") if k.strip()]
-                    for src in st.session_state.source_configs:
-                        if st.session_state.source_configs[src]["enabled"]:
-                            st.session_state.source_configs[src]["keywords"] = keywords_list
-                            st.session_state.source_configs[src]["max_results"] = max_results
+                # 実行ボタン
+                start_requested = st.form_submit_button("データ収集開始")
+
+            # ソースの有効/無効状態をセッション状態に保存
+            for src, enabled in sources.items():
+                st.session_state.source_configs[src]["enabled"] = enabled
+
+            # すべてのソースに同じキーワードと最大件数を設定
+            if keywords:
+                keywords_list = _parse_keywords(keywords)
+                for src in st.session_state.source_configs:
+                    if st.session_state.source_configs[src]["enabled"]:
+                        st.session_state.source_configs[src]["keywords"] = keywords_list
+                        st.session_state.source_configs[src]["max_results"] = max_results
+
+        if start_requested:
+            # 有効かつキーワード指定済みのソース設定を1回の走査で作成（空なら設定不備）
+            active_configs = {
+                src: {"keywords": cfg["keywords"], "max_results": cfg["max_results"]}
+                for src, cfg in st.session_state.source_configs.items()
+                if cfg["enabled"] and cfg["keywords"]
+            }
+
+            if active_configs:
+                # データ収集が既に実行中でないことを確認
+                if not st.session_state.get("collecting", False):
+                    st.session_state.collecting = True
+                    st.session_state.active_source_configs = active_configs
+                    st.session_state.progress = 0
+                    st.session_state.collected_count = 0
+                    # 完了フラグをリセット
+                    st.session_state.collection_completed = False
+                    st.rerun()  # リロードして収集処理を開始
+                else:
+                    st.warning("データ収集はすでに実行中です。完了までお待ちください。")
+            else:
+                st.error("少なくとも1つのデータソースを有効にし、検索キーワードを指定してください")
+    # データベースリセット機能
+    st.divider()  # 区切り線を追加
+    st.subheader("データベース管理")
+    with st.expander("データベースリセット", expanded=False):
+        st.warning("この操作は取り消せません。データベース内のすべての候補者情報が削除されます。")
+        reset_confirmed = st.checkbox("データベースリセットを実行することを確認します")
+
+        if st.button("データベースをリセット", disabled=not reset_confirmed):
+            if reset_confirmed:
+                with st.spinner("データベースをリセット中..."):
+                    deleted_count = service.reset_database()
+                    _clear_data_caches()
+                    st.session_state.persons_version = service.get_data_version()
+                    st.session_state.reset_message = f"データベースをリセットしました。{deleted_count}件の候補者データを削除しました。"
+                    # セッション状態のマッチングスコアもリセット
+                    if "match_score" in st.session_state:
+                        st.session_state.match_score = pd.Series(dtype="float32")
+                # 候補者一覧やサイドバーの件数にも反映するようアプリ全体を再実行
+                st.rerun(scope="app")
+            else:
+                st.error("確認チェックボックスにチェックを入れてください")
+
+        # 再実行前に記録した結果メッセージを一度だけ表示
+        if "reset_message" in st.session_state:
+            st.success(st.session_state.pop("reset_message"))
+
+    with col2:
+        st.subheader("収集状況")
+
+        if "collecting" in st.session_state and st.session_state.collecting:
+            progress_bar = st.progress(st.session_state.progress)
+            status_text = st.empty()
+
+            # 無限ループを防ぐためにフラグを最初にリセット
+            collecting_flag = st.session_state.collecting
+            st.session_state.collecting = False
+
+            # データ収集フラグを明示的にチェック
+            if collecting_flag and not st.session_state.get("collection_completed", False):
+                try:
+                    # 収集開始時に作成したソース設定を使う
+                    source_configs = st.session_state.get("active_source_configs", {})
+
+                    # ソース設定の概要を表示
+                    if source_configs:
+                        status_text.info("以下の設定でデータ収集を開始します:")
+                        for src, cfg in source_configs.items():
+                            st.write(f"- {src}: {len(cfg['keywords'])}個のキーワード, 最大{cfg['max_results']}件")
+
+                    # データ収集実行（ソースごとに並行して取得し、キーワード単位で進捗を更新）
+                    # 進捗の描画は一定間隔に間引く
+                    last_ui_update = time.monotonic()
+
+                    def update_progress(done: int, total: int):
+                        nonlocal last_ui_update
+                        now = time.monotonic()
+                        if now - last_ui_update >= PROGRESS_UPDATE_INTERVAL:
+                            progress_bar.progress(done / total)
+                            status_text.info(f"収集中: {done}/{total} 件のキーワードを処理しました")
+                            last_ui_update = now
+
+                    total_collected = service.collect_data(
+                        source_configs=source_configs, progress_callback=update_progress
+                    )
+
+                    st.session_state.collected_count = total_collected
+                    _clear_data_caches()
+                    st.session_state.persons_version = service.get_data_version()
+                    st.session_state.progress = 1.0
+                    progress_bar.progress(1.0)
+                    st.session_state.collection_message = f"データ収集完了: {total_collected}件の候補者情報を収集しました"
 
-            # 実行ボタン
-            if st.button("データ収集開始"):
-                # 有効なソースとキーワードをチェック
-                valid_configs = any(
-                    cfg["enabled"] and len(cfg["keywords"]) > 0
-                    for cfg in st.session_state.source_configs.values()
-                )
+                    # データ収集完了フラグを設定
+                    st.session_state.collection_completed = True
 
-                if valid_configs:
-                    # データ収集が既に実行中でないことを確認
-                    if not st.session_state.get("collecting", False):
-                        st.session_state.collecting = True
-                        st.session_state.progress = 0
-                        st.session_state.collected_count = 0
-                        # 完了フラグをリセット
-                        st.session_state.collection_completed = False
-                        st.rerun()  # リロードして収集処理を開始
-                    else:
-                        st.warning("データ収集はすでに実行中です。完了までお待ちください。")
+                except Exception as e:
+                    st.error(f"データ収集中にエラーが発生しました: {e}")
+                    st.write(traceback.format_exc())
                 else:
-                    st.error("少なくとも1つのデータソースを有効にし、検索キーワードを指定してください")
-        # データベースリセット機能
-        st.divider()  # 区切り線を追加
-        st.subheader("データベース管理")
-        with st.expander("データベースリセット", expanded=False):
-            st.warning("この操作は取り消せません。データベース内のすべての候補者情報が削除されます。")
-            reset_confirmed = st.checkbox("データベースリセットを実行することを確認します")
-
-            if st.button("データベースをリセット", disabled=not reset_confirmed):
-                if reset_confirmed:
-                    with st.spinner("データベースをリセット中..."):
-                        deleted_count = service.reset_database()
-                        st.success(f"データベースをリセットしました。{deleted_count}件の候補者データを削除しました。")
-                        # セッション状態のマッチングスコアもリセット
-                        if "match_score" in st.session_state:
-                            st.session_state.match_score = {}
-                else:
-                    st.error("確認チェックボックスにチェックを入れてください")
-
-        with col2:
-            st.subheader("収集状況")
-
-            if "collecting" in st.session_state and st.session_state.collecting:
-                progress_bar = st.progress(st.session_state.progress)
-                status_text = st.empty()
-
-                # 無限ループを防ぐためにフラグを最初にリセット
-                collecting_flag = st.session_state.collecting
-                st.session_state.collecting = False
-
-                # データ収集フラグを明示的にチェック
-                if collecting_flag and not st.session_state.get("collection_completed", False):
-                    try:
-                        # ソース設定を準備
-                        source_configs = {}
-
-                        for src, cfg in st.session_state.source_configs.items():
-                            if cfg["enabled"] and cfg["keywords"]:
-                                source_configs[src] = {
-                                    "keywords": cfg["keywords"],
-                                    "max_results": cfg["max_results"]
-                                }
-
-                        # ソース設定の概要を表示
-                        if source_configs:
-                            status_text.info("以下の設定でデータ収集を開始します:")
-                            for src, cfg in source_configs.items():
-                                st.write(f"- {src}: {len(cfg['keywords'])}個のキーワード, 最大{cfg['max_results']}件")
-
-                        # データ収集実行
-                        total_collected = service.collect_data(source_configs=source_configs)
-
-                        st.session_state.collected_count = total_collected
-                        st.session_state.progress = 1.0
-                        progress_bar.progress(1.0)
-                        status_text.success(f"データ収集完了: {total_collected}件の候補者情報を収集しました")
-
-                        # データ収集完了フラグを設定
-                        st.session_state.collection_completed = True
-                        # 自動タブ切り替えと再実行は行わない（メッセージが表示されたままになる）
-
-                    except Exception as e:
-                        st.error(f"データ収集中にエラーが発生しました: {e}")
-                        import traceback
-                        st.write(traceback.format_exc())
-            else:
-                st.info("「データ収集開始」ボタンをクリックするとデータ収集が始まります")
-
-            if "collected_count" in st.session_state and st.session_state.collected_count > 0:
-                st.metric("収集済み候補者数", st.session_state.collected_count)
-
-    with tabs[3]:
-        # 候補者詳細表示
-        st.subheader("候補者詳細")
-        # selected_id = st.selectbox("詳細を表示する候補者を選択", options=df["ID"].tolist(), format_func=lambda x: df[df["ID"]==x]["氏名"].iloc[0])
-        # セレクトボックスを使わず、クリックされた行のIDを使用
-        # selected_person_rowは行番号なので、これを使ってIDを取得
-        if persons:
-            selected_id = df.iloc[st.session_state.person_selection.selection.rows[0]]["ID"] if st.session_state.person_selection.selection.rows else None
+                    # 候補者一覧やサイドバーの件数にも反映するようアプリ全体を再実行（完了メッセージは再実行後に表示）
+                    st.rerun(scope="app")
+        elif "collection_message" in st.session_state:
+            st.success(st.session_state.pop("collection_message"))
         else:
-            selected_id = None
-
-        if selected_id:
-            person = service.get_person_by_id(selected_id)
-            if person:
-                col1, col2 = st.columns(2)
-
-                with col1:
-                    st.markdown(f"**氏名:** {person.full_name}")
-                    st.markdown(f"**所属:** {person.current_affiliation or '不明'}")
-
-                    # データソース情報を表示
-                    sources_str = "、".join(person.data_sources) if person.data_sources else "不明"
-                    st.markdown(f"**データソース:** {sources_str}")
-
-                    if person.email:
-                        st.markdown(f"**メール:** {person.email}")
-                        st.button(f"{person.email} をコピー", key=f"copy_email_{person.id}")
-
-                    st.markdown("**リンク:**")
-                    if person.github_username:
-                        st.markdown(f"- [GitHub](https://github.com/{person.github_username})")
-                    if person.qiita_id:
-                        st.markdown(f"- [Qiita](https://qiita.com/{person.qiita_id})")
-                    if person.orcid_id:
-                        st.markdown(f"- [ORCID](https://orcid.org/{person.orcid_id})")
-                    if person.linkedin_url:
-                        st.markdown(f"- [LinkedIn]({person.linkedin_url})")
-                    if person.personal_blog_url:
-                        st.markdown(f"- [個人ブログ]({person.personal_blog_url})")
-                with col2:
-                    st.markdown("**経験サマリ:**")
-                    st.markdown(person.experience_summary or "情報がありません")
-
-        st.subheader("アプローチ戦略")
+            st.info("「データ収集開始」ボタンをクリックするとデータ収集が始まります")
+
+        if "collected_count" in st.session_state and st.session_state.collected_count > 0:
+            st.metric("収集済み候補者数", st.session_state.collected_count)
 
+@st.fragment
+def _tab_strategy(service: RecruitmentService):
+    """アプローチ戦略タブを描画する"""
+    # 候補者詳細表示
+    st.subheader("候補者詳細")
+    # 候補者一覧タブで選択時に保存した候補者の辞書を再利用（DBを再検索しない）
+    person = st.session_state.get("selected_person")
+
+    if person:
+        _render_person_detail(person, "strategy")
+
+    st.subheader("アプローチ戦略")
+
+@st.cache_resource(show_spinner=False)
 def log_system_info():
-    """システム情報をログに記録する"""
-    import platform
-    import sys
-    import psutil
+    """
+    システム情報をログに記録する
+    Streamlitは再実行のたびにスクリプト全体を実行し直すため、プロセスごとに1回だけ記録する
+    """
+    # psutilはここでだけ使うため、起動時ではなく初回の記録時に読み込む
+    try:
+        import psutil
+    except ImportError:
+        logger.warning("psutilがインストールされていないため、詳細なシステム情報を記録できません。")
+        logger.warning("pip install psutilを実行してインストールすることを推奨します。")
+        return
 
     try:
         mem = psutil.virtual_memory()
         disk = psutil.disk_usage('/')
 
         logger.info(f"システム情報:")
-        logger.info(f"  - OS: {platform.platform()}")
-        logger.info(f"  - Python: {sys.version}")
+        python_version, os_name = _PLATFORM_INFO
+        logger.info(f"  - OS: {os_name}")
+        logger.info(f"  - Python: {python_version}")
         logger.info(f"  - メモリ使用量: {mem.percent}% ({mem.used / (1024**3):.2f}GB/{mem.total / (1024**3):.2f}GB)")
         logger.info(f"  - ディスク使用量: {disk.percent}% ({disk.used / (1024**3):.2f}GB/{disk.total / (1024**3):.2f}GB)")
     except Exception as e:
         logger.warning(f"システム情報の取得に失敗しました: {e}")
 
 if __name__ == "__main__":
-    start_time = datetime.now()
+    start_ns = time.perf_counter_ns()
     try:
         # ログディレクトリの確認
         if not os.path.exists(config.LOG_DIR):
@@ -676,18 +959,13 @@ if __name__ == "__main__":
             logger.info(f"ログディレクトリを作成しました: {config.LOG_DIR}")
 
         # システム情報をログに記録
-        try:
-            log_system_info()
-        except ImportError:
-            logger.warning("psutilがインストールされていないため、詳細なシステム情報を記録できません。")
-            logger.warning("pip install psutilを実行してインストールすることを推奨します。")
+        log_system_info()
 
         logger.info("----------- アプリケーション起動 -----------")
         main()
     except Exception as e:
         logger.error(f"アプリケーションで予期せぬエラーが発生しました: {e}", exc_info=True)
         # エラー情報をユーザーに表示（Streamlitが起動している場合）
-        import traceback
         error_msg = f"エラーが発生しました: {str(e)}\n{traceback.format_exc()}"
         try:
             st.error(error_msg)
@@ -695,7 +973,6 @@ if __name__ == "__main__":
             pass  # Streamlitコンテキスト外の場合
         raise
     finally:
-        end_time = datetime.now()
-        duration = (end_time - start_time).total_seconds()
+        duration = (time.perf_counter_ns() - start_ns) / 1e9
         logger.info(f"アプリケーション終了 - 実行時間: {duration:.2f}秒")
         logger.info("----------------------------------------")
@@ -31,9 +31,57 @@ OPENALEX_EMAIL = os.getenv("OPENALEX_EMAIL")  # APIのポリシーに従って
 # KAKEN API設定
 KAKEN_API_BASE_URL = "https://nrid.nii.ac.jp/opensearch/"
 
+# データ収集の同時リクエスト数（ソースごと。各APIのレート制限を超えないよう小さく保つ）
+COLLECTOR_SOURCE_CONCURRENCY = {"github": 2, "qiita": 2, "openalex": 2, "kaken": 1}
+# 候補者ごとの詳細取得に使うスレッド数（全ソース・全キーワードで共有）
+# I/O待ちが主なため大きめにしてよい。各APIへの送信レートはAPI_RATE_LIMITSで抑えられるため、
+# 上限に達している間は増やしても待機するスレッドが増えるだけになる
+COLLECTOR_IO_CONCURRENCY = int(os.getenv("COLLECTOR_IO_CONCURRENCY", "16"))
+# 取得済みの結果をまとめて1トランザクションで保存する候補者数の目安
+COLLECTOR_SAVE_BATCH_SIZE = 64
+
+# APIクライアント共通のHTTPセッション設定（接続の再利用と一時的なエラーの再試行）
+HTTP_POOL_CONNECTIONS = 8  # 接続プールを保持するホスト数
+# ホストごとに保持する接続数。1つのホストへの同時リクエスト数（詳細取得のスレッドと検索のワーカー）以上にし、
+# 接続を使い終えるたびに破棄してTLSハンドシェイクからやり直さないようにする
+HTTP_POOL_MAXSIZE = COLLECTOR_IO_CONCURRENCY + max(COLLECTOR_SOURCE_CONCURRENCY.values())
+HTTP_MAX_RETRIES = 3
+HTTP_RETRY_BACKOFF = 0.3  # 再試行の待機時間の係数（秒）
+HTTP_RETRY_BACKOFF_MAX = 30  # 再試行の待機時間の上限（秒）
+HTTP_RETRY_JITTER = 0.5  # 再試行の待機時間に加える揺らぎの上限（秒）。並行リクエストが同時に再試行しないようにする
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# API応答（GET）のディスクキャッシュ。有効期間内は通信せず、期限切れ後はETag/Last-Modifiedで再検証する
+# 収集結果は COLLECTOR_CACHE で当日分を再利用するため、キャッシュが二重にならないよう既定では無効
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "false").lower() == "true"
+HTTP_CACHE_DIR = os.path.join(ROOT_DIR, "data", "cache", "http")
+HTTP_CACHE_TTL = 24 * 60 * 60  # 秒
+HTTP_CACHE_MAX_SIZE = 100 * 1024 * 1024  # 100MB（超えた場合は古いものから削除）
+
+# APIごとのリクエストレート上限（1秒あたりのリクエスト数, 連続して送れる数）
+# 並行して取得しても各APIの公開されている上限を超えないよう、送信前に待機する
+API_RATE_LIMITS = {
+    "github": (1.0, 4),  # 認証時 5,000回/時
+    "qiita": (0.25, 4),  # 認証時 1,000回/時
+    "openalex": (10.0, 10),  # 10回/秒
+    "kaken": (2.0, 1),
+}
+
+# データ収集結果のファイルキャッシュ（ソース・キーワード・件数ごとに当日分を再利用する）
+COLLECTOR_CACHE_ENABLED = os.getenv("COLLECTOR_CACHE_ENABLED", "true").lower() == "true"
+COLLECTOR_CACHE_DIR = os.path.join(ROOT_DIR, "data", "cache", "collector")
+
+# 同一人物の判定で、強い識別子（メール・ORCID・GitHub）が一致しない場合に氏名と所属の組み合わせでも照合するか
+PERSON_NAME_MATCH_ENABLED = os.getenv("PERSON_NAME_MATCH_ENABLED", "true").lower() == "true"
+
+# 学習済みTF-IDFインデックス（ベクトライザと候補者の文書行列）の保存先
+TFIDF_INDEX_DIR = os.path.join(ROOT_DIR, "data", "models")
+
 # アプリケーション設定
 APP_TITLE = "エンジニア・研究者ダイレクトリクルーティングMVP"
 APP_DESCRIPTION = "Web上の公開情報からエンジニアおよび研究者の候補者を見つけ出し、ダイレクトリクルーティングを行うためのMVP"
+CANDIDATES_PAGE_SIZE = 50  # 候補者一覧の1ページあたりの表示件数（既定値）
+CANDIDATES_PAGE_SIZE_OPTIONS = (20, 50, 100)  # 候補者一覧で選択できる表示件数
 
 # ロギング設定
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -2,17 +2,24 @@
 リクルートメントサービスのコアロジックを提供するモジュール
 データ収集、NLP処理、データベース操作を連携させ、採用活動の主要機能を実装
 """
-from typing import List, Dict, Any, Optional, Tuple
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Iterator, List, Dict, Any, Optional, Tuple
+import threading
+import pandas as pd
 from sqlalchemy.orm import Session
 
-from src.database.db_manager import get_db, init_db
+import config
+from src.database.db_manager import db_session, init_db
 from src.database.crud import (
-    get_all_persons, get_person_by_id, search_persons,
-    update_match_scores
+    get_all_persons, get_all_persons_df, count_persons, get_person_by_id, get_persons_by_ids, search_persons_df, search_persons_fts,
+    get_person_stats, get_data_version, update_match_scores, delete_all_persons
 )
 from src.database.models import Person
 from src.data_collection.collector import DataCollector
-from src.nlp_processing.matcher import match_requirements
+from src.nlp_processing.matcher import (
+    TfidfIndex, build_tfidf_index_from_texts, load_tfidf_index, save_tfidf_index, score_requirements
+)
 from src.utils.common import setup_logger
 
 # ロガーの設定
@@ -32,6 +39,43 @@ class RecruitmentService:
         # データコレクタの初期化
         self.collector = DataCollector()
 
+        # with文によるセッションスコープの入れ子の深さ（スレッドごと）
+        self._scope = threading.local()
+
+    def __enter__(self) -> "RecruitmentService":
+        """
+        セッションスコープを開始する
+        スコープ内のメソッド呼び出しは同じスレッドの同じDBセッション（接続）を共有します
+        """
+        self._scope.depth = getattr(self._scope, "depth", 0) + 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> bool:
+        """
+        セッションスコープを終了し、最も外側のスコープでセッションを閉じる
+        """
+        self._scope.depth -= 1
+        if self._scope.depth == 0:
+            if exc_type is not None:
+                db_session().rollback()
+            # スレッドのセッションを閉じて破棄する
+            db_session.remove()
+        return False
+
+    @contextmanager
+    def _session(self) -> Iterator[Session]:
+        """
+        メソッド1回分のDBセッションを提供する
+        セッションスコープ内ではセッションを閉じずに次の呼び出しへ引き継ぎます
+        """
+        # get_db() は返す前にセッションを閉じるため、スレッドのセッションを直接使う
+        db = db_session()
+        try:
+            yield db
+        finally:
+            if not getattr(self._scope, "depth", 0):
+                db.close()
+
     def get_all_persons(self, skip: int = 0, limit: int = 100) -> List[Person]:
         """
         すべての候補者を取得
@@ -43,11 +87,39 @@ class RecruitmentService:
         Returns:
             候補者オブジェクトのリスト
         """
-        db = get_db()
-        try:
+        with self._session() as db:
             return get_all_persons(db, skip, limit)
-        finally:
-            db.close()
+
+    def get_all_persons_df(self, skip: int = 0, limit: Optional[int] = None,
+                           include_researchers: bool = True, include_engineers: bool = True) -> pd.DataFrame:
+        """
+        候補者一覧をDataFrameとして取得（一覧表示用）
+
+        Args:
+            skip: スキップする件数
+            limit: 取得する最大件数（Noneの場合は全件）
+            include_researchers: 研究者を含めるか
+            include_engineers: エンジニアを含めるか
+
+        Returns:
+            1候補者1行のDataFrame
+        """
+        with self._session() as db:
+            return get_all_persons_df(db, skip, limit, include_researchers, include_engineers)
+
+    def count_persons(self, include_researchers: bool = True, include_engineers: bool = True) -> int:
+        """
+        候補者区分の条件に一致する候補者数を取得
+
+        Args:
+            include_researchers: 研究者を含めるか
+            include_engineers: エンジニアを含めるか
+
+        Returns:
+            候補者数
+        """
+        with self._session() as db:
+            return count_persons(db, include_researchers, include_engineers)
 
     def get_person_by_id(self, person_id: str) -> Optional[Person]:
         """
@@ -59,16 +131,47 @@ class RecruitmentService:
         Returns:
             候補者オブジェクトまたはNone（見つからない場合）
         """
-        db = get_db()
-        try:
+        with self._session() as db:
             return get_person_by_id(db, person_id)
-        finally:
-            db.close()
+
+    def get_persons_by_ids(self, person_ids: List[str]) -> List[Person]:
+        """
+        複数のIDで候補者をまとめて取得
+
+        Args:
+            person_ids: 候補者IDのリスト
+
+        Returns:
+            候補者オブジェクトのリスト（指定順）
+        """
+        with self._session() as db:
+            return get_persons_by_ids(db, person_ids)
+
+    def get_data_version(self) -> Tuple[int, Optional[datetime]]:
+        """
+        候補者データのバージョントークンを取得（キャッシュの無効化判定に使用）
+
+        Returns:
+            (候補者数, 最終更新日時)のタプル
+        """
+        with self._session() as db:
+            return get_data_version(db)
+
+    def get_dashboard_stats(self) -> Dict[str, Any]:
+        """
+        ダッシュボード表示用の集計値をデータベース側で計算して取得
+
+        Returns:
+            総数・研究者数・エンジニア数・データソース別人数・最終更新日時の辞書
+        """
+        with self._session() as db:
+            return get_person_stats(db)
 
     def search_persons_by_keyword(self, persons: List[Person], keyword: str) -> List[Person]:
         """
         キーワードで候補者をフィルタリング
-        既に取得済みの候補者リストから検索する場合に使用
+        既に取得済み（キャッシュ済み）の候補者リストから検索する場合に使用
+        データベース内の候補者を検索する場合は、全件を取得せず search_persons_in_db / search_persons_df を使う
 
         Args:
             persons: 検索対象の候補者リスト
@@ -83,36 +186,94 @@ class RecruitmentService:
         # 小文字化してマッチングの精度を上げる
         keyword = keyword.lower()
 
-        # 候補者のテキストデータを検索
-        filtered_persons = []
-        for person in persons:
-            # 検索対象のテキストフィールドを結合
-            search_text = " ".join(filter(None, [
-                person.full_name,
-                person.current_affiliation,
-                person.experience_summary
-            ])).lower()
-
-            if keyword in search_text:
-                filtered_persons.append(person)
-
-        return filtered_persons
+        # 候補者ごとの検索用テキストは初回に作成済みのものを使い回す
+        return [person for person in persons if keyword in person.search_text]
 
     def search_persons_in_db(self, keyword: str) -> List[Person]:
         """
         キーワードでデータベース内の候補者を検索
+        全文検索インデックスを使い、使えない場合はLIKE検索にフォールバックする
+
+        Args:
+            keyword: 検索キーワード
+
+        Returns:
+            キーワードにマッチする候補者のリスト（関連度順）
+        """
+        with self._session() as db:
+            return search_persons_fts(db, keyword)
+
+    def search_persons_fts(self, keyword: str, limit: Optional[int] = None) -> List[Person]:
+        """
+        全文検索インデックスを使ってデータベース内の候補者を検索（関連度順）
 
         Args:
             keyword: 検索キーワード
+            limit: 取得する最大件数（Noneの場合は全件）
 
         Returns:
             キーワードにマッチする候補者のリスト
         """
-        db = get_db()
-        try:
-            return search_persons(db, keyword)
-        finally:
-            db.close()
+        with self._session() as db:
+            return search_persons_fts(db, keyword, limit)
+
+    def search_persons_df(self, keyword: str, include_researchers: bool = True,
+                          include_engineers: bool = True, limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        キーワードと候補者区分でデータベース側で絞り込み、一覧表示用のDataFrameを取得
+
+        Args:
+            keyword: 検索キーワード
+            include_researchers: 研究者を含めるか
+            include_engineers: エンジニアを含めるか
+            limit: 取得する最大件数（Noneの場合は全件）
+
+        Returns:
+            条件にマッチする候補者のDataFrame
+        """
+        with self._session() as db:
+            return search_persons_df(db, keyword, include_researchers, include_engineers, limit)
+
+    def get_match_index(self, version: Optional[Tuple[int, Optional[datetime]]] = None) -> Optional[TfidfIndex]:
+        """
+        マッチング用のTF-IDFインデックスを取得
+        データバージョンが一致する保存済みインデックスがあればそれを読み込み、なければ作成して保存する
+
+        Args:
+            version: 候補者データのバージョントークン（省略時はデータベースから取得）
+
+        Returns:
+            TF-IDFインデックス（候補者がいない場合など、作成できない場合はNone）
+        """
+        with self._session() as db:
+            return self._get_match_index(db, version)
+
+    def _get_match_index(self, db: Session, version: Optional[Tuple[int, Optional[datetime]]] = None) -> Optional[TfidfIndex]:
+        """
+        呼び出し元のDBセッションを使ってマッチング用のTF-IDFインデックスを取得
+        （セッションを開いているメソッドから呼ぶと、内側でそのセッションを閉じてしまうため）
+
+        Args:
+            db: データベースセッション
+            version: 候補者データのバージョントークン（省略時はデータベースから取得）
+
+        Returns:
+            TF-IDFインデックス（候補者がいない場合など、作成できない場合はNone）
+        """
+        if version is None:
+            version = get_data_version(db)
+        index = load_tfidf_index(config.TFIDF_INDEX_DIR, version)
+        if index is not None:
+            return index
+
+        df = get_all_persons_df(db)
+        index = build_tfidf_index_from_texts(df["id"].tolist(), df["experience_summary"].fillna("").tolist())
+        if index is not None:
+            try:
+                save_tfidf_index(index, config.TFIDF_INDEX_DIR, version)
+            except OSError as e:
+                logger.warning("TF-IDFインデックスを保存できませんでした: %s", e)
+        return index
 
     def match_requirements_with_persons(self, requirements: str) -> List[Tuple[str, float]]:
         """
@@ -124,25 +285,27 @@ class RecruitmentService:
         Returns:
             (候補者ID, マッチングスコア)のタプルのリスト（スコア降順）
         """
-        db = get_db()
-        try:
-            # 全候補者の取得
-            all_persons = get_all_persons(db)
+        if not requirements:
+            logger.warning("マッチング対象の人材要件が空です")
+            return []
 
-            # マッチングの実行
-            match_results = match_requirements(requirements, all_persons)
+        with self._session() as db:
+            # 保存済みのインデックスを使い、要件のベクトル化と疎行列積だけで採点する
+            index = self._get_match_index(db)
+            if index is None:
+                return []
+            match_results = score_requirements(requirements, index)
 
             # マッチングスコアをデータベースに保存
             score_dict = {person_id: score for person_id, score in match_results}
             update_match_scores(db, score_dict)
 
             return match_results
-        finally:
-            db.close()
 
     def collect_data(self, source_configs: Optional[Dict[str, Dict[str, Any]]] = None,
                      keywords: Optional[List[str]] = None, sources: Optional[Dict[str, bool]] = None,
-                     max_results_per_source: int = 10) -> int:
+                     max_results_per_source: int = 10,
+                     progress_callback: Optional[Callable[[int, int], None]] = None) -> int:
         """
         指定されたキーワードと情報源からデータを収集
 
@@ -157,22 +320,24 @@ class RecruitmentService:
             keywords: 検索キーワードのリスト（後方互換性のため）
             sources: 使用するデータソースのフラグ辞書 {"github": True, "qiita": True, "openalex": True, "kaken": True}（後方互換性のため）
             max_results_per_source: 各ソース・各キーワードあたりの最大結果数（後方互換性のため）
+            progress_callback: キーワード1件の処理が終わるたびに (完了数, 総数) で呼ばれる関数
 
         Returns:
             収集された候補者の総数
         """
-        db = get_db()
-        try:
+        with self._session() as db:
             total_collected = self.collector.collect_data(
                 source_configs=source_configs,
                 keywords=keywords,
                 sources=sources,
                 max_results_per_source=max_results_per_source,
-                db_session=db
+                db_session=db,
+                progress_callback=progress_callback
             )
+            # 候補者が変わるのは収集時のみのため、ここでマッチング用インデックスを作り直しておく
+            if total_collected:
+                self._get_match_index(db)
             return total_collected
-        finally:
-            db.close()
 
     def collect_data_parallel(self, source_configs: Optional[Dict[str, Dict[str, Any]]] = None,
                             keywords: Optional[List[str]] = None, sources: Optional[Dict[str, bool]] = None,
@@ -195,8 +360,7 @@ class RecruitmentService:
         Returns:
             収集された候補者の総数
         """
-        db = get_db()
-        try:
+        with self._session() as db:
             total_collected = self.collector.collect_data_parallel(
                 source_configs=source_configs,
                 keywords=keywords,
@@ -205,8 +369,6 @@ class RecruitmentService:
                 db_session=db
             )
             return total_collected
-        finally:
-            db.close()
 
     def reset_database(self):
         """
@@ -215,10 +377,8 @@ class RecruitmentService:
         Returns:
             削除された候補者の数
         """
-        from src.database.crud import delete_all_persons
-        db = get_db()
-        try:
+        with self._session() as db:
             deleted_count = delete_all_persons(db)
+            # 削除した候補者を指すキャッシュが残らないようにする
+            self.collector.clear_caches()
             return deleted_count
-        finally:
-            db.close()
@@ -2,20 +2,66 @@
 データ収集を統合するモジュール
 複数のAPI（GitHub, Qiita, OpenAlex, KAKEN）からのデータ収集と同一人物特定を管理
 """
-from typing import Dict, List, Any, Optional, Set
+from typing import Callable, Dict, Iterator, List, Any, Optional, Set, Tuple
+from contextlib import nullcontext
+from datetime import date
+from itertools import islice
 import concurrent.futures
+import hashlib
+import json
+import os
+import queue
+import threading
 from sqlalchemy.orm import Session
 
+import config
 from src.data_collection.github_client import GitHubClient
 from src.data_collection.qiita_client import QiitaClient
 from src.data_collection.openalex_client import OpenAlexClient
 from src.data_collection.kaken_client import KakenClient
-from src.database.crud import create_person, find_person_by_identifiers, update_person
-from src.utils.common import setup_logger
+from src.database.crud import create_person, find_person_by_identifiers, find_persons_by_identifiers_bulk, update_person
+from src.database.models import Person, data_sources_to_mask
+from src.utils.common import setup_logger, create_http_session, clear_memoized_results
 
 # ロガーの設定
 logger = setup_logger(__name__)
 
+# 同一人物の特定に使う一意な識別子（find_person_by_identifiers と同じ優先順位）
+PERSON_CACHE_KEYS = ("email", "orcid_id", "github_username")
+
+# キーワード1件あたりの収集にかかる時間の目安（相対値）。時間のかかるタスクから開始して全体の完了を早める
+SOURCE_COLLECTION_COST = {"openalex": 5, "github": 3, "qiita": 2, "kaken": 1}
+
+def _merge_person_data(existing: Dict[str, Any], person_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    同一人物と判定された候補者データを既存のデータに統合し、上書きする項目を返す
+    DBへの保存時とバッチ内の重複の統合で同じ規則を使う（経歴の結合は呼び出し元で行う）
+
+    Args:
+        existing: 既存の候補者データ（is_engineer, is_researcher, data_sources を参照する）
+        person_data: 新しい候補者データ
+
+    Returns:
+        既存のデータに上書きする項目の辞書
+    """
+    # 生データは取得できたものだけ取り込み、Noneで既存の生データを上書きしない
+    update_data = {
+        key: value for key, value in person_data.items()
+        if key != "experience_summary" and (value is not None or not key.startswith("raw_"))
+    }
+
+    # 各フラグの統合（どちらかがTrueならTrue）
+    for key in ("is_engineer", "is_researcher"):
+        if key in person_data or existing.get(key):
+            update_data[key] = bool(existing.get(key)) or bool(person_data.get(key))
+
+    # データソースの統合（既存の順序を保ったまま、重複を避けて新しいソースを追加）
+    if "data_sources" in person_data:
+        update_data["data_sources"] = list(dict.fromkeys(
+            [*(existing.get("data_sources") or []), *(person_data["data_sources"] or [])]
+        ))
+    return update_data
+
 class DataCollector:
     """
     複数のデータソースからのデータ収集と統合を担うクラス
@@ -24,12 +70,140 @@ class DataCollector:
         """
         データコレクタを初期化し、各APIクライアントを準備
         """
-        self.github_client = GitHubClient()
-        self.qiita_client = QiitaClient()
-        self.openalex_client = OpenAlexClient()
-        self.kaken_client = KakenClient()
+        # 全クライアントで1つのHTTPセッションを共有し、ホストごとの接続を使い回す
+        self.http_session = create_http_session()
+        self.github_client = GitHubClient(session=self.http_session)
+        self.qiita_client = QiitaClient(session=self.http_session)
+        self.openalex_client = OpenAlexClient(session=self.http_session)
+        self.kaken_client = KakenClient(session=self.http_session)
+
+        # ソースごとの同時リクエスト数の上限（どの収集メソッドから呼ばれても守る）
+        self.source_semaphores = {
+            source: threading.BoundedSemaphore(limit)
+            for source, limit in config.COLLECTOR_SOURCE_CONCURRENCY.items()
+        }
+
+        # 識別子（種類, 値）から保存済みの候補者IDへの対応（同じ人物の識別子検索を繰り返さない）
+        self._person_cache: Dict[Tuple[str, str], str] = {}
+
+        # 候補者ごとの詳細取得に使うスレッドプール（キーワードごとに作り直さず共有する）
+        self._io_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=config.COLLECTOR_IO_CONCURRENCY, thread_name_prefix="collector-io"
+        )
+
+        # ソース名から収集メソッドへの対応
+        self._source_dispatch: Dict[str, Callable[..., Optional[List[Dict[str, Any]]]]] = {
+            "github": self.collect_from_github,
+            "qiita": self.collect_from_qiita,
+            "openalex": self.collect_from_openalex,
+            "kaken": self.collect_from_kaken,
+        }
+
+    def close(self):
+        """
+        共有しているHTTPセッションの接続と詳細取得用のスレッドプールを閉じる
+        """
+        self._io_executor.shutdown(wait=False)
+        self.http_session.close()
+
+    def clear_caches(self):
+        """
+        APIクライアントの取得結果と識別子の対応のキャッシュを破棄する
+        """
+        for client in (self.github_client, self.qiita_client, self.openalex_client, self.kaken_client):
+            clear_memoized_results(client)
+        self._person_cache.clear()
+
+    def _prefetch_persons(self, persons_data: List[Dict[str, Any]], db_session: Session) -> Dict[Tuple[str, Any], Person]:
+        """
+        一括保存する候補者の識別子に一致する既存の候補者を1回のクエリで取得し、識別子から引ける辞書にする
+
+        Args:
+            persons_data: 候補者データのリスト
+            db_session: SQLAlchemyデータベースセッション
+
+        Returns:
+            (識別子の種類, 値)から候補者への辞書（氏名と所属の組み合わせは ("name", (氏名, 所属)) で引く）
+        """
+        def values_of(key: str) -> List[Any]:
+            return list({person_data[key] for person_data in persons_data if person_data.get(key)})
+
+        # 氏名と所属での照合を行わない場合は氏名での取得も不要
+        name_affiliations = list({
+            (person_data["full_name"], person_data["current_affiliation"])
+            for person_data in persons_data
+            if person_data.get("full_name") and person_data.get("current_affiliation")
+        }) if config.PERSON_NAME_MATCH_ENABLED else []
+        persons = find_persons_by_identifiers_bulk(
+            db_session, values_of("email"), values_of("orcid_id"), values_of("github_username"), name_affiliations
+        )
+        index: Dict[Tuple[str, Any], Person] = {}
+        for person in persons:
+            # 同じ識別子を持つ候補者が複数いる場合は、個別検索と同じく先に登録された方を使う
+            for key in PERSON_CACHE_KEYS:
+                value = getattr(person, key)
+                if value:
+                    index.setdefault((key, value), person)
+            if person.full_name and person.current_affiliation:
+                index.setdefault(("name", (person.full_name, person.current_affiliation)), person)
+        return index
+
+    def _find_existing_person(self, identifiers: Dict[str, Any], db_session: Session,
+                              index: Optional[Dict[Tuple[str, Any], Person]] = None) -> Optional[Person]:
+        """
+        同一人物を検索する
+        一括保存時は事前に取得した辞書だけで判定し、それ以外では一度保存した識別子を主キーで取得して
+        識別子による検索クエリを省略する
 
-    def collect_from_github(self, keyword: str, max_results: int = 10, db_session: Optional[Session] = None) -> List[Dict[str, Any]]:
+        Args:
+            identifiers: 同一人物特定のための識別子の辞書
+            db_session: SQLAlchemyデータベースセッション
+            index: _prefetch_persons で作成した辞書（一括保存時のみ）
+
+        Returns:
+            一致する候補者。見つからない場合はNone
+        """
+        if index is not None:
+            # find_person_by_identifiers と同じ優先順位で照合する
+            for key in PERSON_CACHE_KEYS:
+                value = identifiers.get(key)
+                if value and (key, value) in index:
+                    return index[(key, value)]
+            if (config.PERSON_NAME_MATCH_ENABLED
+                    and identifiers.get("full_name") and identifiers.get("current_affiliation")):
+                return index.get(("name", (identifiers["full_name"], identifiers["current_affiliation"])))
+            return None
+
+        for key in PERSON_CACHE_KEYS:
+            person_id = self._person_cache.get((key, identifiers.get(key)))
+            if person_id:
+                person = db_session.get(Person, person_id)
+                if person is not None:
+                    return person
+        return find_person_by_identifiers(db_session, identifiers, match_name=config.PERSON_NAME_MATCH_ENABLED)
+
+    def _remember_person(self, person_data: Dict[str, Any], person: Optional[Person],
+                         index: Optional[Dict[Tuple[str, Any], Person]] = None) -> None:
+        """
+        保存した候補者の識別子とIDの対応を記録する
+
+        Args:
+            person_data: 保存した候補者データ
+            person: 保存された候補者
+            index: _prefetch_persons で作成した辞書（一括保存時は同じバッチの後続の照合に使うため追加する）
+        """
+        if person is None:
+            return
+        for key in PERSON_CACHE_KEYS:
+            value = person_data.get(key)
+            if value:
+                self._person_cache[(key, value)] = person.id
+                if index is not None:
+                    index.setdefault((key, value), person)
+        if index is not None and person_data.get("full_name") and person_data.get("current_affiliation"):
+            index.setdefault(("name", (person_data["full_name"], person_data["current_affiliation"])), person)
+
+    def collect_from_github(self, keyword: str, max_results: int = 10, db_session: Optional[Session] = None) -> Optional[List[Dict[str, Any]]]:
         """
         GitHubからデータを収集し、データベースに保存
 
@@ -39,27 +213,29 @@ class DataCollector:
             db_session: データベースセッション (オプション)
 
         Returns:
-            収集された候補者データのリスト
+            収集された候補者データのリスト（取得に失敗した場合はNone）
         """
-        logger.info(f"GitHubから '{keyword}' で候補者データ収集開始")
+        logger.info("GitHubから '%s' で候補者データ収集開始", keyword)
         collected_data = []
 
         try:
             # ユーザー検索
-            users = self.github_client.search_users(keyword, max_results)
-
-            for user in users:
-                username = user.get("login")
-                if not username:
-                    continue
+            users = self.github_client.search_users(keyword, max_results, raise_on_error=True)
+            usernames = [user.get("login") for user in users if user.get("login")]
 
-                # ユーザー詳細取得
+            def fetch_user(username: str):
+                # ユーザー詳細取得（取得できなければリポジトリも取得しない）
                 user_details = self.github_client.get_user_details(username)
                 if not user_details:
-                    continue
-
+                    return None
                 # リポジトリ情報取得
-                repos = self.github_client.get_user_repositories(username)
+                return user_details, self.github_client.get_user_repositories(username)
+
+            # ユーザーごとの詳細取得は並行して行い、変換と保存は検索結果の順に行う
+            for fetched in self._map_concurrently(fetch_user, usernames):
+                if not fetched:
+                    continue
+                user_details, repos = fetched
 
                 # 候補者データに変換
                 person_data = self.github_client.extract_person_data(user_details, repos)
@@ -67,18 +243,20 @@ class DataCollector:
                 person_data["data_sources"] = ["github"]
                 collected_data.append(person_data)
 
-                # データベースに保存（セッションが提供されている場合）
-                if db_session:
-                    self._save_person_to_db(person_data, db_session)
-
-            logger.info(f"GitHubから{len(collected_data)}人の候補者データを収集しました")
-            return collected_data
+            logger.info("GitHubから%s人の候補者データを収集しました", len(collected_data))
 
         except Exception as e:
-            logger.error(f"GitHubからのデータ収集中にエラーが発生: {e}", exc_info=True)
-            return collected_data
+            logger.error("GitHubからのデータ収集中にエラーが発生: %s", e, exc_info=True)
+            # 1件も取得できないまま失敗した場合は、検索結果が0件の場合と区別できるようNoneを返す
+            if not collected_data:
+                return None
+
+        # 取得できた分をデータベースにまとめて保存（セッションが提供されている場合）
+        if db_session:
+            self._save_persons_bulk(collected_data, db_session)
+        return collected_data
 
-    def collect_from_qiita(self, keyword: str, max_results: int = 10, db_session: Optional[Session] = None) -> List[Dict[str, Any]]:
+    def collect_from_qiita(self, keyword: str, max_results: int = 10, db_session: Optional[Session] = None) -> Optional[List[Dict[str, Any]]]:
         """
         Qiitaからデータを収集し、データベースに保存
 
@@ -88,32 +266,33 @@ class DataCollector:
             db_session: データベースセッション (オプション)
 
         Returns:
-            収集された候補者データのリスト
+            収集された候補者データのリスト（取得に失敗した場合はNone）
         """
-        logger.info(f"Qiitaから '{keyword}' で候補者データ収集開始")
+        logger.info("Qiitaから '%s' で候補者データ収集開始", keyword)
         collected_data = []
 
         try:
             # 記事検索
-            items = self.qiita_client.search_items(keyword, max_results)
-
-            # 重複を避けるため、ユーザーIDの集合を作成
-            user_ids = set()
-            for item in items:
-                user = item.get("user", {})
-                user_id = user.get("id")
-                if user_id and user_id not in user_ids:
-                    user_ids.add(user_id)
-
-            # 各ユーザーの詳細情報を取得
-            for user_id in list(user_ids)[:max_results]:
-                # ユーザー詳細取得
+            items = self.qiita_client.search_items(keyword, max_results, raise_on_error=True)
+
+            # 重複を避けるため、記事の検索順を保ったままユーザーIDをまとめる
+            user_ids = dict.fromkeys(
+                item["user"]["id"] for item in items if (item.get("user") or {}).get("id")
+            )
+
+            def fetch_user(user_id: str):
+                # ユーザー詳細取得（取得できなければ記事も取得しない）
                 user_details = self.qiita_client.get_user_details(user_id)
                 if not user_details:
-                    continue
-
+                    return None
                 # ユーザーの記事取得
-                user_items = self.qiita_client.get_user_items(user_id)
+                return user_details, self.qiita_client.get_user_items(user_id)
+
+            # 各ユーザーの詳細情報を並行して取得
+            for fetched in self._map_concurrently(fetch_user, list(islice(user_ids, max_results))):
+                if not fetched:
+                    continue
+                user_details, user_items = fetched
 
                 # 候補者データに変換
                 person_data = self.qiita_client.extract_person_data(user_details, user_items)
@@ -121,18 +300,20 @@ class DataCollector:
                 person_data["data_sources"] = ["qiita"]
                 collected_data.append(person_data)
 
-                # データベースに保存（セッションが提供されている場合）
-                if db_session:
-                    self._save_person_to_db(person_data, db_session)
-
-            logger.info(f"Qiitaから{len(collected_data)}人の候補者データを収集しました")
-            return collected_data
+            logger.info("Qiitaから%s人の候補者データを収集しました", len(collected_data))
 
         except Exception as e:
-            logger.error(f"Qiitaからのデータ収集中にエラーが発生: {e}", exc_info=True)
-            return collected_data
+            logger.error("Qiitaからのデータ収集中にエラーが発生: %s", e, exc_info=True)
+            # 1件も取得できないまま失敗した場合は、検索結果が0件の場合と区別できるようNoneを返す
+            if not collected_data:
+                return None
+
+        # 取得できた分をデータベースにまとめて保存（セッションが提供されている場合）
+        if db_session:
+            self._save_persons_bulk(collected_data, db_session)
+        return collected_data
 
-    def collect_from_openalex(self, keyword: str, max_results: int = 10, db_session: Optional[Session] = None) -> List[Dict[str, Any]]:
+    def collect_from_openalex(self, keyword: str, max_results: int = 10, db_session: Optional[Session] = None) -> Optional[List[Dict[str, Any]]]:
         """
         OpenAlexからデータを収集し、データベースに保存
 
@@ -142,44 +323,44 @@ class DataCollector:
             db_session: データベースセッション (オプション)
 
         Returns:
-            収集された候補者データのリスト
+            収集された候補者データのリスト（取得に失敗した場合はNone）
         """
-        logger.info(f"OpenAlexから '{keyword}' で候補者データ収集開始")
+        logger.info("OpenAlexから '%s' で候補者データ収集開始", keyword)
         collected_data = []
 
         try:
             # 著者検索
-            authors = self.openalex_client.search_authors(keyword, max_results)
+            authors = [author for author in self.openalex_client.search_authors(keyword, max_results, raise_on_error=True) if author.get("id")]
 
-            for author in authors:
-                author_id = author.get("id")
-                if not author_id:
-                    continue
+            # 論文情報は著者ごとに並行して取得
+            works_iter = self._map_concurrently(
+                lambda author: self.openalex_client.get_author_works(author["id"]), authors
+            )
 
+            for author, works in zip(authors, works_iter):
                 # 著者詳細取得（基本的に検索結果に詳細が含まれているため再取得は不要な場合もある）
                 author_details = author
 
-                # 論文情報取得
-                works = self.openalex_client.get_author_works(author_id)
-
                 # 候補者データに変換
                 person_data = self.openalex_client.extract_person_data(author_details, works)
                 # データソースを明示的に設定
                 person_data["data_sources"] = ["openalex"]
                 collected_data.append(person_data)
 
-                # データベースに保存（セッションが提供されている場合）
-                if db_session:
-                    self._save_person_to_db(person_data, db_session)
-
-            logger.info(f"OpenAlexから{len(collected_data)}人の候補者データを収集しました")
-            return collected_data
+            logger.info("OpenAlexから%s人の候補者データを収集しました", len(collected_data))
 
         except Exception as e:
-            logger.error(f"OpenAlexからのデータ収集中にエラーが発生: {e}", exc_info=True)
-            return collected_data
+            logger.error("OpenAlexからのデータ収集中にエラーが発生: %s", e, exc_info=True)
+            # 1件も取得できないまま失敗した場合は、検索結果が0件の場合と区別できるようNoneを返す
+            if not collected_data:
+                return None
+
+        # 取得できた分をデータベースにまとめて保存（セッションが提供されている場合）
+        if db_session:
+            self._save_persons_bulk(collected_data, db_session)
+        return collected_data
 
-    def collect_from_kaken(self, keyword: str, max_results: int = 10, db_session: Optional[Session] = None) -> List[Dict[str, Any]]:
+    def collect_from_kaken(self, keyword: str, max_results: int = 10, db_session: Optional[Session] = None) -> Optional[List[Dict[str, Any]]]:
         """
         KAKENからデータを収集し、データベースに保存
 
@@ -189,14 +370,14 @@ class DataCollector:
             db_session: データベースセッション (オプション)
 
         Returns:
-            収集された候補者データのリスト
+            収集された候補者データのリスト（取得に失敗した場合はNone）
         """
-        logger.info(f"KAKENから '{keyword}' で候補者データ収集開始")
+        logger.info("KAKENから '%s' で候補者データ収集開始", keyword)
         collected_data = []
 
         try:
             # 研究者検索
-            researchers = self.kaken_client.search_researchers(keyword, max_results)
+            researchers = self.kaken_client.search_researchers(keyword, max_results, raise_on_error=True)
 
             for researcher in researchers:
                 researcher_id = researcher.get("researcher_id")
@@ -217,18 +398,120 @@ class DataCollector:
                     person_data["data_sources"] = ["kaken"]
                     collected_data.append(person_data)
 
-                    # データベースに保存（セッションが提供されている場合）
-                    if db_session:
-                        self._save_person_to_db(person_data, db_session)
+            logger.info("KAKENから%s人の候補者データを収集しました", len(collected_data))
+
+        except Exception as e:
+            logger.error("KAKENからのデータ収集中にエラーが発生: %s", e, exc_info=True)
+            # 1件も取得できないまま失敗した場合は、検索結果が0件の場合と区別できるようNoneを返す
+            if not collected_data:
+                return None
+
+        # 取得できた分をデータベースにまとめて保存（セッションが提供されている場合）
+        if db_session:
+            self._save_persons_bulk(collected_data, db_session)
+        return collected_data
+
+    def _map_concurrently(self, func: Callable[[Any], Any], items: List[Any]) -> Iterator[Any]:
+        """
+        候補者ごとの詳細取得を共有のスレッドプールで並行して行い、結果を入力と同じ順序で返す
+        結果は取得でき次第1件ずつ返すため、呼び出し元は残りの取得を待たずに変換を進められ、
+        変換済みの生データを全件分保持し続けることもない
+
+        Args:
+            func: 1件分の取得を行う関数
+            items: 取得対象のリスト
+
+        Returns:
+            各要素に対するfuncの戻り値を順に返すイテレータ
+        """
+        if len(items) <= 1:
+            return (func(item) for item in items)
+        return self._io_executor.map(func, items)
+
+    def _save_persons_bulk(self, persons_data: List[Dict[str, Any]], db_session: Session) -> List[Optional[str]]:
+        """
+        複数の候補者データを1つのトランザクションでまとめて保存
+        候補者ごとのコミットをやめ、最後に1回だけコミットする
+        途中で失敗した場合はロールバックし、1件ずつコミットする従来の方法で保存し直す
 
-            logger.info(f"KAKENから{len(collected_data)}人の候補者データを収集しました")
-            return collected_data
+        Args:
+            persons_data: 候補者データのリスト
+            db_session: SQLAlchemyデータベースセッション
+
+        Returns:
+            保存された候補者のIDのリスト（エラーになった候補者はNone）
+        """
+        if not persons_data:
+            return []
 
+        # 同じバッチに複数回現れる候補者は先にまとめ、DBへの照合と更新を1回にする
+        merged_data, positions = self._merge_duplicate_persons(persons_data)
+
+        try:
+            # 既存の候補者は1回のクエリでまとめて取得し、以降の照合は辞書で行う
+            index = self._prefetch_persons(merged_data, db_session)
+            summaries: Dict[str, List[str]] = {}
+            # 保存処理は候補者データを書き換えるため、やり直しに備えてコピーを渡す
+            person_ids = [
+                self._save_person_to_db(dict(person_data), db_session, commit=False, index=index, summaries=summaries)
+                for person_data in merged_data
+            ]
+            # 同一人物の経歴は断片を集めておき、候補者ごとに1回だけ結合する
+            for person_id, fragments in summaries.items():
+                db_session.get(Person, person_id).experience_summary = "\n\n".join(fragments) or None
+            db_session.commit()
         except Exception as e:
-            logger.error(f"KAKENからのデータ収集中にエラーが発生: {e}", exc_info=True)
-            return collected_data
+            logger.warning("候補者データの一括保存に失敗したため、1件ずつ保存し直します: %s", e)
+            db_session.rollback()
+            # ロールバックで取り消された候補者のIDを参照しないよう、識別子の対応を破棄する
+            self._person_cache.clear()
+            person_ids = [self._save_person_to_db(person_data, db_session) for person_data in merged_data]
+        return [person_ids[position] for position in positions]
+
+    def _merge_duplicate_persons(self, persons_data: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[int]]:
+        """
+        同じバッチ内で同一人物と判定される候補者データを1件にまとめる
+        照合は _find_existing_person と同じ識別子・優先順位で、統合は _save_person_to_db と同じ _merge_person_data で行う
 
-    def _save_person_to_db(self, person_data: Dict[str, Any], db_session: Session) -> Optional[str]:
+        Args:
+            persons_data: 候補者データのリスト
+
+        Returns:
+            (まとめた候補者データのリスト, 入力の各候補者データがまとめられた先の位置のリスト)
+        """
+        merged_data: List[Dict[str, Any]] = []
+        fragments_by_position: List[List[str]] = []
+        position_by_key: Dict[Tuple[str, Any], int] = {}
+        positions: List[int] = []
+
+        for person_data in persons_data:
+            keys = [(key, person_data[key]) for key in PERSON_CACHE_KEYS if person_data.get(key)]
+            if config.PERSON_NAME_MATCH_ENABLED and person_data.get("full_name") and person_data.get("current_affiliation"):
+                keys.append(("name", (person_data["full_name"], person_data["current_affiliation"])))
+
+            position = next((position_by_key[key] for key in keys if key in position_by_key), None)
+            if position is None:
+                position = len(merged_data)
+                merged_data.append(dict(person_data))
+                fragments_by_position.append([])
+            else:
+                merged = merged_data[position]
+                merged.update(_merge_person_data(merged, person_data))
+
+            if person_data.get("experience_summary"):
+                fragments_by_position[position].append(person_data["experience_summary"])
+            for key in keys:
+                position_by_key.setdefault(key, position)
+            positions.append(position)
+
+        for merged, fragments in zip(merged_data, fragments_by_position):
+            if fragments:
+                merged["experience_summary"] = "\n\n".join(fragments)
+        return merged_data, positions
+
+    def _save_person_to_db(self, person_data: Dict[str, Any], db_session: Session, commit: bool = True,
+                           index: Optional[Dict[Tuple[str, Any], Person]] = None,
+                           summaries: Optional[Dict[str, List[str]]] = None) -> Optional[str]:
         """
         候補者データをデータベースに保存
         R006に従って同一人物の特定と情報統合を行う
@@ -236,6 +519,9 @@ class DataCollector:
         Args:
             person_data: 候補者データ
             db_session: SQLAlchemyデータベースセッション
+            commit: Falseの場合はコミットせず、エラーも呼び出し元に送出する（一括保存用）
+            index: _prefetch_persons で作成した辞書（一括保存時のみ）
+            summaries: 候補者IDから結合する経歴の断片への辞書（一括保存時のみ。結合は呼び出し元で行う）
 
         Returns:
             保存された候補者のID（同一人物が特定された場合は既存のID）またはNone（エラー時）
@@ -251,64 +537,115 @@ class DataCollector:
             }
 
             # 同一人物を検索
-            existing_person = find_person_by_identifiers(db_session, identifiers)
+            existing_person = self._find_existing_person(identifiers, db_session, index)
 
             if existing_person:
                 # 既存の候補者情報を更新
                 person_id = str(existing_person.id)  # 確実に文字列型に変換
-                logger.info(f"同一人物が特定されました: {person_id} ({existing_person.full_name})")
+                logger.info("同一人物が特定されました: %s (%s)", person_id, existing_person.full_name)
 
                 # experience_summaryを結合
                 existing_summary = existing_person.experience_summary
-                if person_data.get("experience_summary") and existing_summary:
-                    person_data["experience_summary"] = str(existing_summary) + "\n\n" + person_data["experience_summary"]
-
-                # 各フラグの統合（どちらかがTrueならTrue）
-                if bool(existing_person.is_engineer):  # 明示的にbool()に変換
-                    person_data["is_engineer"] = True
-                if bool(existing_person.is_researcher):  # 明示的にbool()に変換
-                    person_data["is_researcher"] = True
-
-                # 生データの取り込み
-                for key, value in person_data.items():
-                    if key.startswith("raw_") and value is not None:
-                        setattr(existing_person, key, value)
-
-                # データソースの統合
-                new_sources = person_data.get("data_sources", [])
-                if new_sources:
-                    existing_sources = existing_person.data_sources or []
-                    # 重複を避けて新しいソースを追加
-                    for source in new_sources:
-                        if source not in existing_sources:
-                            existing_sources.append(source)
-                    person_data["data_sources"] = existing_sources
+                new_summary = person_data.pop("experience_summary", None)
+                if summaries is not None:
+                    # 一括保存中は2回目以降の結合を保存の最後にまとめ、同じ候補者の経歴を何度も連結し直さない
+                    fragments = summaries.get(person_id)
+                    if fragments is None:
+                        fragments = summaries[person_id] = [str(existing_summary)] if existing_summary else []
+                        if new_summary:
+                            fragments.append(new_summary)
+                        person_data["experience_summary"] = "\n\n".join(fragments) or None
+                    elif new_summary:
+                        fragments.append(new_summary)
+                else:
+                    fragments = [str(existing_summary) if existing_summary else None, new_summary]
+                    person_data["experience_summary"] = "\n\n".join(f for f in fragments if f) or None
+
+                # フラグ・データソース・その他の項目を統合
+                existing_data = {
+                    "is_engineer": existing_person.is_engineer,
+                    "is_researcher": existing_person.is_researcher,
+                    "data_sources": existing_person.data_sources,
+                }
+                update_data = _merge_person_data(existing_data, person_data)
+                if "experience_summary" in person_data:
+                    update_data["experience_summary"] = person_data["experience_summary"]
+                update_data["data_sources_mask"] = (
+                    data_sources_to_mask(existing_person.data_sources) | data_sources_to_mask(person_data.get("data_sources"))
+                )
 
                 # 更新
-                updated_person = update_person(db_session, person_id, person_data)
+                updated_person = update_person(db_session, person_id, update_data, commit=commit)
+                self._remember_person(person_data, updated_person, index)
                 return updated_person.id if updated_person else None
             else:
                 # 新規の候補者として登録
                 # データソースの追跡情報が設定されていない場合は空リストを初期化
                 if "data_sources" not in person_data:
                     person_data["data_sources"] = []
+                person_data["data_sources_mask"] = data_sources_to_mask(person_data["data_sources"])
 
-                new_person = create_person(db_session, person_data)
-                logger.info(f"新規候補者を登録しました: {new_person.id} ({new_person.full_name})")
+                new_person = create_person(db_session, person_data, commit=commit)
+                logger.info("新規候補者を登録しました: %s (%s)", new_person.id, new_person.full_name)
+                self._remember_person(person_data, new_person, index)
                 return new_person.id if new_person else None
 
         except Exception as e:
-            logger.error(f"候補者データ保存中にエラーが発生: {e}", exc_info=True)
+            if not commit:
+                raise
+            logger.error("候補者データ保存中にエラーが発生: %s", e, exc_info=True)
             db_session.rollback()
             return None
 
 
 
+    def _build_collection_tasks(self, source_configs: Optional[Dict[str, Dict[str, Any]]],
+                                keywords: Optional[List[str]], sources: Optional[Dict[str, bool]],
+                                max_results_per_source: int) -> Dict[str, List[Tuple[str, int]]]:
+        """
+        収集設定をソースごとのタスク（キーワード, 最大件数）のリストにまとめる
+        空のキーワードと重複したキーワードはAPIを呼んでも結果が増えないため、タスクにしない
+        時間のかかるソース・件数の多いキーワードから順に並べ、最後に長いタスクが残らないようにする
+
+        Args:
+            source_configs: ソースごとの設定辞書（Noneの場合は従来のパラメータから作成する）
+            keywords: 検索キーワードのリスト（後方互換性のため）
+            sources: 使用するデータソースのフラグ辞書（後方互換性のため）
+            max_results_per_source: 各ソース・各キーワードあたりの最大結果数（後方互換性のため）
+
+        Returns:
+            ソース名からタスクのリストへの辞書（タスクのないソースは含まない）
+        """
+        # 後方互換性のために従来のパラメータ形式をサポート
+        if source_configs is None:
+            source_configs = {}
+            if sources and keywords:
+                for source_name, enabled in sources.items():
+                    if enabled:
+                        source_configs[source_name] = {
+                            "keywords": keywords,
+                            "max_results": max_results_per_source
+                        }
+
+        tasks_by_source = {}
+        for source_name in sorted(source_configs, key=lambda name: -SOURCE_COLLECTION_COST.get(name, 1)):
+            cfg = source_configs[source_name]
+            keywords_to_search = dict.fromkeys(
+                keyword.strip() for keyword in cfg.get("keywords", []) if keyword and keyword.strip()
+            )
+            tasks = [(keyword, cfg.get("max_results", 10)) for keyword in keywords_to_search]
+            if tasks:
+                tasks_by_source[source_name] = sorted(tasks, key=lambda task: -task[1])
+        return tasks_by_source
+
     def collect_data(self, source_configs: Dict[str, Dict[str, Any]] = None,
                      keywords: List[str] = None, sources: Dict[str, bool] = None,
-                     max_results_per_source: int = 10, db_session: Optional[Session] = None) -> int:
+                     max_results_per_source: int = 10, db_session: Optional[Session] = None,
+                     progress_callback: Optional[Callable[[int, int], None]] = None) -> int:
         """
         複数のデータソースから複数のキーワードでデータを収集
+        ソースごとに同時リクエスト数の上限までスレッドを割り当ててAPIを並行して呼び出し、
+        DBへの保存は呼び出し元のスレッドで、取得済みの結果を1トランザクションにまとめて行う
 
         Args:
             source_configs: ソースごとの設定辞書
@@ -322,48 +659,74 @@ class DataCollector:
             sources: 使用するデータソースのフラグ辞書 {"github": True, "qiita": True, "openalex": True, "kaken": True}（後方互換性のため）
             max_results_per_source: 各ソース・各キーワードあたりの最大結果数（後方互換性のため）
             db_session: データベースセッション (オプション)
+            progress_callback: キーワード1件の収集・保存が終わるたびに (完了数, 総数) で呼ばれる関数 (オプション)
 
         Returns:
             収集された候補者の総数
         """
         total_collected = 0
 
-        # 後方互換性のために従来のパラメータ形式をサポート
-        if source_configs is None:
-            source_configs = {}
-            if sources and keywords:
-                for source_name, enabled in sources.items():
-                    if enabled:
-                        source_configs[source_name] = {
-                            "keywords": keywords,
-                            "max_results": max_results_per_source
-                        }        # GitHub
-        if "github" in source_configs:
-            cfg = source_configs["github"]
-            for keyword in cfg.get("keywords", []):
-                github_data = self.collect_from_github(keyword, cfg.get("max_results", 10), db_session)
-                total_collected += len(github_data)
-
-        # Qiita
-        if "qiita" in source_configs:
-            cfg = source_configs["qiita"]
-            for keyword in cfg.get("keywords", []):
-                qiita_data = self.collect_from_qiita(keyword, cfg.get("max_results", 10), db_session)
-                total_collected += len(qiita_data)
-
-        # OpenAlex
-        if "openalex" in source_configs:
-            cfg = source_configs["openalex"]
-            for keyword in cfg.get("keywords", []):
-                openalex_data = self.collect_from_openalex(keyword, cfg.get("max_results", 10), db_session)
-                total_collected += len(openalex_data)
-
-        # KAKEN
-        if "kaken" in source_configs:
-            cfg = source_configs["kaken"]
-            for keyword in cfg.get("keywords", []):
-                kaken_data = self.collect_from_kaken(keyword, cfg.get("max_results", 10), db_session)
-                total_collected += len(kaken_data)
+        tasks_by_source = self._build_collection_tasks(source_configs, keywords, sources, max_results_per_source)
+        total_tasks = sum(len(tasks) for tasks in tasks_by_source.values())
+        if total_tasks == 0:
+            return 0
+
+        # ワーカースレッドはAPIからの取得のみを行い、結果をキューに積む
+        results = queue.Queue()
+
+        def run_source(source_name: str, pending: queue.SimpleQueue):
+            # 同じソースのワーカー間で未処理のキーワードを取り合う
+            while True:
+                try:
+                    keyword, max_results = pending.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    data = self._collect_data_from_source(source_name, keyword, max_results)
+                except Exception as e:
+                    logger.error("%sからのデータ収集中にエラーが発生: %s", source_name, e, exc_info=True)
+                    data = []
+                results.put((source_name, keyword, data))
+
+        # ソースごとのワーカー数（同時リクエスト数の上限とキーワード数の小さい方）
+        workers_by_source = {
+            source_name: min(config.COLLECTOR_SOURCE_CONCURRENCY.get(source_name, 1), len(tasks))
+            for source_name, tasks in tasks_by_source.items()
+        }
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=sum(workers_by_source.values())) as executor:
+            for source_name, tasks in tasks_by_source.items():
+                pending = queue.SimpleQueue()
+                for task in tasks:
+                    pending.put(task)
+                for _ in range(workers_by_source[source_name]):
+                    executor.submit(run_source, source_name, pending)
+
+            # 取得できた順にこのスレッドでDBへ保存する（セッションをスレッド間で共有しない）
+            # 保存中に完了していた結果は、件数の上限までまとめて1トランザクションで保存する
+            done = 0
+            while done < total_tasks:
+                batch = [results.get()]
+                batch_size = len(batch[0][2])
+                while done + len(batch) < total_tasks and batch_size < config.COLLECTOR_SAVE_BATCH_SIZE:
+                    try:
+                        batch.append(results.get_nowait())
+                    except queue.Empty:
+                        break
+                    batch_size += len(batch[-1][2])
+
+                persons_data = []
+                for source_name, keyword, data in batch:
+                    logger.info("%sから '%s' の検索で%s件のデータを収集しました", source_name, keyword, len(data))
+                    persons_data.extend(data)
+                if db_session:
+                    self._save_persons_bulk(persons_data, db_session)
+                total_collected += len(persons_data)
+
+                for _ in batch:
+                    done += 1
+                    if progress_callback:
+                        progress_callback(done, total_tasks)
 
         return total_collected
 
@@ -371,8 +734,9 @@ class DataCollector:
                               keywords: Optional[List[str]] = None, sources: Optional[Dict[str, bool]] = None,
                               max_results_per_source: int = 10, db_session: Optional[Session] = None) -> int:
         """
-        複数のデータソースから並行してデータを収集（実験的実装）
-        注意: データベースへの書き込みが競合する可能性があるため、DBセッションの扱いに注意が必要
+        複数のデータソースから並行してデータを収集
+        collect_data と同じく、全ソースを同時に、ソース内は同時リクエスト数の上限まで並行して取得し、
+        取得できた順に呼び出し元のスレッドでDBへ保存する（後方互換性のために残している）
 
         Args:
             source_configs: ソースごとの設定辞書
@@ -390,60 +754,58 @@ class DataCollector:
         Returns:
             収集された候補者の総数
         """
-        total_collected = 0
-        tasks = []
+        return self.collect_data(
+            source_configs=source_configs,
+            keywords=keywords,
+            sources=sources,
+            max_results_per_source=max_results_per_source,
+            db_session=db_session
+        )
 
-        # 後方互換性のために従来のパラメータ形式をサポート
-        if source_configs is None:
-            source_configs = {}
-            if sources and keywords:
-                for source_name, enabled in sources.items():
-                    if enabled:
-                        source_configs[source_name] = {
-                            "keywords": keywords,
-                            "max_results": max_results_per_source
-                        }
-
-        # 収集タスクを準備
-        for source_name, cfg in source_configs.items():
-            for keyword in cfg.get("keywords", []):
-                max_results = cfg.get("max_results", 10)
-                tasks.append((source_name, keyword, max_results))
-
-        # 並列実行（収集タスクが4つ以上ある場合のみ）
-        if len(tasks) >= 4:
-            collected_data = []
-            with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
-                future_to_task = {
-                    executor.submit(self._collect_data_from_source, source, keyword, max_results): (source, keyword)
-                    for source, keyword, max_results in tasks
-                }
-
-                for future in concurrent.futures.as_completed(future_to_task):
-                    source, keyword = future_to_task[future]
-                    try:
-                        data = future.result()
-                        collected_data.extend(data)
-                        logger.info(f"{source}から '{keyword}' の検索で{len(data)}件のデータを収集しました")
-                    except Exception as e:
-                        logger.error(f"{source}からのデータ収集中にエラーが発生: {e}", exc_info=True)
+    def _collect_data_from_source(self, source: str, keyword: str, max_results: int) -> List[Dict[str, Any]]:
+        """
+        指定されたソースから指定されたキーワードでデータを収集
+        当日分のキャッシュがあればAPIを呼ばずにそれを返す
 
-            # データをデータベースに保存
-            if db_session:
-                for person_data in collected_data:
-                    self._save_person_to_db(person_data, db_session)
+        Args:
+            source: データソース名
+            keyword: 検索キーワード
+            max_results: 最大結果数
 
-            total_collected = len(collected_data)
+        Returns:
+            収集されたデータリスト
+        """
+        collect = self._source_dispatch.get(source)
+        if collect is None:
+            return []
 
-        else:
-            # 少ない場合は順次実行
-            total_collected = self.collect_data(source_configs=source_configs, db_session=db_session)
+        cache_dir = self._cache_dir(source, keyword, max_results)
+        today = date.today().isoformat()
+        if cache_dir:
+            cached = self._load_cached_results(cache_dir, today)
+            if cached is not None:
+                logger.info("%sの '%s' の収集結果をキャッシュから読み込みました", source, keyword)
+                return cached
+
+        # ソースごとの同時リクエスト数の上限を超えないよう待機する
+        with self.source_semaphores.get(source, nullcontext()):
+            data = collect(keyword, max_results)
+
+        if data is None:
+            # レート制限などで取得できなかった場合は過去日のキャッシュで代用する（検索結果が0件の場合は代用しない）
+            stale = self._load_cached_results(cache_dir) if cache_dir else None
+            if stale:
+                logger.warning("%sの '%s' を取得できなかったため、過去のキャッシュを使用します", source, keyword)
+                return stale
+            return []
 
-        return total_collected
+        if cache_dir:
+            self._store_cached_results(cache_dir, today, data)
+        return data
 
-    def _collect_data_from_source(self, source: str, keyword: str, max_results: int) -> List[Dict[str, Any]]:
+    def _cache_dir(self, source: str, keyword: str, max_results: int) -> Optional[str]:
         """
-        指定されたソースから指定されたキーワードでデータを収集
+        収集結果キャッシュの保存先ディレクトリを返す
 
         Args:
             source: データソース名
@@ -451,15 +813,60 @@ class DataCollector:
             max_results: 最大結果数
 
         Returns:
-            収集されたデータリスト
+            キャッシュディレクトリのパス（キャッシュ無効時はNone）
         """
-        if source == "github":
-            return self.collect_from_github(keyword, max_results)
-        elif source == "qiita":
-            return self.collect_from_qiita(keyword, max_results)
-        elif source == "openalex":
-            return self.collect_from_openalex(keyword, max_results)
-        elif source == "kaken":
-            return self.collect_from_kaken(keyword, max_results)
-        else:
-            return []
+        if not config.COLLECTOR_CACHE_ENABLED:
+            return None
+        key = json.dumps([source, keyword, max_results], ensure_ascii=False)
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(config.COLLECTOR_CACHE_DIR, source, digest)
+
+    def _load_cached_results(self, cache_dir: str, day: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        キャッシュ済みの収集結果を読み込む
+
+        Args:
+            cache_dir: キャッシュディレクトリのパス
+            day: 読み込む日付（YYYY-MM-DD、省略時は最新の日付）
+
+        Returns:
+            収集されたデータリスト（キャッシュがない場合はNone）
+        """
+        try:
+            if day is None:
+                files = sorted(name for name in os.listdir(cache_dir) if name.endswith(".json"))
+                if not files:
+                    return None
+                path = os.path.join(cache_dir, files[-1])
+            else:
+                path = os.path.join(cache_dir, f"{day}.json")
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("収集結果キャッシュの読み込みに失敗しました: %s", e)
+            return None
+
+    def _store_cached_results(self, cache_dir: str, day: str, data: List[Dict[str, Any]]) -> None:
+        """
+        収集結果をキャッシュに保存し、古い日付のキャッシュを削除する
+
+        Args:
+            cache_dir: キャッシュディレクトリのパス
+            day: 保存する日付（YYYY-MM-DD）
+            data: 収集されたデータリスト
+        """
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            path = os.path.join(cache_dir, f"{day}.json")
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+
+            for name in os.listdir(cache_dir):
+                if name.endswith(".json") and name != f"{day}.json":
+                    os.remove(os.path.join(cache_dir, name))
+        except OSError as e:
+            logger.warning("収集結果キャッシュの保存に失敗しました: %s", e)
@@ -2,26 +2,32 @@
 GitHub APIクライアントモジュール
 GitHub APIを使用してユーザー情報やリポジトリ情報を収集します
 """
+import base64
 import time
 import requests
 from typing import Dict, List, Any, Optional
 
 import config
-from src.utils.common import setup_logger, safe_api_call
+from src.utils.common import setup_logger, safe_api_call, create_http_session, has_fresh_cache, RateLimiter, memoize_results, parse_json_response
 
 # ロガーの設定
 logger = setup_logger(__name__)
 
+# 生データとして保存しないユーザー情報の項目（APIの内部IDや画像の識別子など、候補者の情報ではないもの）
+# このほか、プロフィールページ（html_url）以外のAPIのリンクURL（*_url）も保存しない
+RAW_USER_EXCLUDED_KEYS = frozenset({"node_id", "gravatar_id", "url"})
+
 class GitHubClient:
     """
     GitHub APIとの通信を担当するクライアントクラス
     """
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, session: Optional[requests.Session] = None):
         """
         GitHubクライアントを初期化します
 
         Args:
             api_key: GitHub APIのアクセストークン（省略時はconfigから取得）
+            session: 共有するHTTPセッション（省略時は新しく作成）
         """
         self.api_key = api_key or config.GITHUB_API_KEY
         self.base_url = config.GITHUB_API_BASE_URL
@@ -33,9 +39,17 @@ class GitHubClient:
         if self.api_key:
             self.headers["Authorization"] = f"token {self.api_key}"
 
-        # レートリミット関連
+        # レートリミット関連（検索APIはそれ以外のAPIと上限が別のため分けて管理する）
         self.rate_limit_remaining = 5000  # デフォルト値
         self.rate_limit_reset = 0
+        self.search_rate_limit_remaining = 30  # 認証時 30回/分
+        self.search_rate_limit_reset = 0
+
+        # 接続を再利用するためのHTTPセッション
+        self.session = session or create_http_session()
+
+        # 並行リクエスト全体の送信レートを抑えるリミッタ
+        self.rate_limiter = RateLimiter(*config.API_RATE_LIMITS["github"])
 
     def _make_request(self, endpoint: str, params: Dict = None) -> Optional[Dict[str, Any]]:
         """
@@ -49,24 +63,40 @@ class GitHubClient:
         Returns:
             API応答の辞書またはNone（エラー時）
         """
-        # レートリミットがほぼ消費されている場合は待機
-        if self.rate_limit_remaining < 5:
-            current_time = time.time()
-            wait_time = max(0, self.rate_limit_reset - current_time + 1)
-            if wait_time > 0:
-                logger.info(f"GitHub APIのレートリミットに達しました。{wait_time:.1f}秒待機します")
-                time.sleep(wait_time)
-
         url = f"{self.base_url}{endpoint}"
+        is_search = endpoint.startswith("/search/")
+
+        # キャッシュから応答できる場合はAPIに送信しないため待機しない
+        if not has_fresh_cache(self.session, url, params):
+            # 同じ種類のAPIのレートリミットがほぼ消費されている場合だけ待機する
+            # （検索の上限に達していても、ユーザー詳細などの取得は止めない）
+            if is_search:
+                remaining, reset = self.search_rate_limit_remaining, self.search_rate_limit_reset
+            else:
+                remaining, reset = self.rate_limit_remaining, self.rate_limit_reset
+            if remaining < 5:
+                current_time = time.time()
+                wait_time = max(0, reset - current_time + 1)
+                if wait_time > 0:
+                    logger.info("GitHub APIのレートリミットに達しました。%.1f秒待機します", wait_time)
+                    time.sleep(wait_time)
+            self.rate_limiter.acquire()
+
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self.session.get(url, headers=self.headers, params=params)
 
             # レートリミット情報を更新
-            self.rate_limit_remaining = int(response.headers.get("X-RateLimit-Remaining", 5000))
-            self.rate_limit_reset = int(response.headers.get("X-RateLimit-Reset", 0))
+            # （キャッシュから返した応答のヘッダーは保存時点の値のため使わない）
+            if not getattr(response, "from_cache", False):
+                if is_search:
+                    self.search_rate_limit_remaining = int(response.headers.get("X-RateLimit-Remaining", 30))
+                    self.search_rate_limit_reset = int(response.headers.get("X-RateLimit-Reset", 0))
+                else:
+                    self.rate_limit_remaining = int(response.headers.get("X-RateLimit-Remaining", 5000))
+                    self.rate_limit_reset = int(response.headers.get("X-RateLimit-Reset", 0))
 
             if response.status_code == 200:
-                return response.json()
+                return parse_json_response(response)
             else:
                 logger.error(f"GitHub API エラー: {response.status_code} - {response.text}")
                 return None
@@ -75,13 +105,14 @@ class GitHubClient:
             logger.error(f"GitHub APIリクエスト中にエラーが発生: {e}", exc_info=True)
             return None
 
-    def search_users(self, keyword: str, max_results: int = 10) -> List[Dict[str, Any]]:
+    def search_users(self, keyword: str, max_results: int = 10, raise_on_error: bool = False) -> List[Dict[str, Any]]:
         """
         キーワードでユーザーを検索します
 
         Args:
             keyword: 検索キーワード
             max_results: 取得する最大結果数
+            raise_on_error: Trueの場合、検索に失敗したときに空のリストを返さず例外を送出する
 
         Returns:
             ユーザー情報の辞書のリスト
@@ -101,8 +132,11 @@ class GitHubClient:
             return users
 
         logger.warning(f"GitHub: '{keyword}'でのユーザー検索に失敗しました")
+        if raise_on_error:
+            raise RuntimeError(f"GitHub: '{keyword}'でのユーザー検索に失敗しました")
         return []
 
+    @memoize_results()
     def get_user_details(self, username: str) -> Optional[Dict[str, Any]]:
         """
         指定されたユーザーの詳細情報を取得します
@@ -116,6 +150,7 @@ class GitHubClient:
         endpoint = f"/users/{username}"
         return self._make_request(endpoint)
 
+    @memoize_results()
     def get_user_repositories(self, username: str, max_repos: int = 5) -> List[Dict[str, Any]]:
         """
         指定されたユーザーのリポジトリ一覧を取得します
@@ -154,7 +189,6 @@ class GitHubClient:
         response = self._make_request(endpoint)
 
         if response and "content" in response:
-            import base64
             try:
                 # Base64デコード
                 content = base64.b64decode(response["content"]).decode("utf-8")
@@ -207,7 +241,10 @@ class GitHubClient:
             "is_engineer": True,  # GitHub利用者はエンジニアと仮定
             "is_researcher": False,  # デフォルトはFalse（後で他のデータソースから判断）
             "experience_summary": experience_summary,
-            "raw_github_data": user_data  # 生データも保存
+            "raw_github_data": {  # 生データも保存（候補者の情報でない項目は除く）
+                key: value for key, value in user_data.items()
+                if key not in RAW_USER_EXCLUDED_KEYS and (key == "html_url" or not key.endswith("_url"))
+            }
         }
 
         return person_data
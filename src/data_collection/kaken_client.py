@@ -2,14 +2,13 @@
 KAKEN APIクライアントモジュール
 KAKEN APIを使用して研究者情報や研究課題情報を収集します
 """
-import time
 import requests
 import re
 from bs4 import BeautifulSoup
 from typing import Dict, List, Any, Optional
 
 import config
-from src.utils.common import setup_logger, safe_api_call
+from src.utils.common import setup_logger, safe_api_call, create_http_session, has_fresh_cache, RateLimiter, memoize_results
 
 # ロガーの設定
 logger = setup_logger(__name__)
@@ -19,14 +18,20 @@ class KakenClient:
     KAKEN APIとの通信を担当するクライアントクラス
     研究者情報の検索のみに対応しています
     """
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None):
         """
         KAKENクライアントを初期化します
+
+        Args:
+            session: 共有するHTTPセッション（省略時は新しく作成）
         """
         self.base_url = config.KAKEN_API_BASE_URL
 
-        # 適切なAPI使用のための制御
-        self.request_delay = 0.5  # 500msの遅延
+        # 接続を再利用するためのHTTPセッション
+        self.session = session or create_http_session()
+
+        # 並行リクエスト全体の送信レートを抑えるリミッタ
+        self.rate_limiter = RateLimiter(*config.API_RATE_LIMITS["kaken"])
 
     def _extract_researchers_from_html(self, soup: BeautifulSoup, max_results: int = 10) -> List[Dict[str, Any]]:
         """
@@ -120,9 +125,6 @@ class KakenClient:
         Returns:
             BeautifulSoupオブジェクトまたはNone（エラー時）
         """
-        # 適切な間隔を空けるための遅延
-        time.sleep(self.request_delay)
-
         # 基本パラメータを設定（appidを含める）
         base_params = {
             "appid": "gu782hFEjCChFcYxyeb9",  # APIキー
@@ -132,8 +134,13 @@ class KakenClient:
         # パラメータをマージ
         all_params = {**base_params, **params}
 
+        # キャッシュから応答できる場合はAPIに送信しないため待機しない
+        # 送信間隔はrate_limiterが全スレッドで共有して守るため、スレッドごとに固定の遅延は入れない
+        if not has_fresh_cache(self.session, self.base_url, all_params):
+            self.rate_limiter.acquire()
+
         try:
-            response = requests.get(self.base_url, params=all_params)
+            response = self.session.get(self.base_url, params=all_params)
 
             if response.status_code == 200:
                 # HTMLとしてパース
@@ -147,13 +154,14 @@ class KakenClient:
             logger.error(f"KAKEN APIリクエスト中にエラーが発生: {e}", exc_info=True)
             return None
 
-    def search_researchers(self, keyword: str, max_results: int = 100) -> List[Dict[str, Any]]:
+    def search_researchers(self, keyword: str, max_results: int = 100, raise_on_error: bool = False) -> List[Dict[str, Any]]:
         """
         キーワードで研究者を検索します
 
         Args:
             keyword: 検索キーワード
             max_results: 取得する最大結果数
+            raise_on_error: Trueの場合、検索に失敗したときに空のリストを返さず例外を送出する
 
         Returns:
             研究者情報の辞書のリスト
@@ -168,6 +176,8 @@ class KakenClient:
         soup = self._make_request(params)
         if not soup:
             logger.warning(f"KAKEN: '{keyword}'での研究者検索に失敗しました")
+            if raise_on_error:
+                raise RuntimeError(f"KAKEN: '{keyword}'での研究者検索に失敗しました")
             return []
 
         # 検索結果を抽出
@@ -175,6 +185,7 @@ class KakenClient:
         logger.info(f"KAKEN: '{keyword}'で{len(results)}人の研究者を検索しました")
         return results
 
+    @memoize_results()
     def get_researcher_details(self, researcher_id: str) -> Optional[Dict[str, Any]]:
         """
         研究者IDの詳細情報を取得します
@@ -2,12 +2,11 @@
 OpenAlex APIクライアントモジュール
 OpenAlex APIを使用して研究者情報や論文情報を収集します
 """
-import time
 import requests
 from typing import Dict, List, Any, Optional
 
 import config
-from src.utils.common import setup_logger, safe_api_call
+from src.utils.common import setup_logger, safe_api_call, create_http_session, has_fresh_cache, RateLimiter, memoize_results, parse_json_response
 
 # ロガーの設定
 logger = setup_logger(__name__)
@@ -16,12 +15,13 @@ class OpenAlexClient:
     """
     OpenAlex APIとの通信を担当するクライアントクラス
     """
-    def __init__(self, email: Optional[str] = None):
+    def __init__(self, email: Optional[str] = None, session: Optional[requests.Session] = None):
         """
         OpenAlexクライアントを初期化します
 
         Args:
             email: 利用者のメールアドレス（APIポリシーに従い提供、省略時はconfigから取得）
+            session: 共有するHTTPセッション（省略時は新しく作成）
         """
         self.email = email or config.OPENALEX_EMAIL
         self.base_url = config.OPENALEX_API_BASE_URL
@@ -32,8 +32,11 @@ class OpenAlexClient:
             "User-Agent": self.user_agent
         }
 
-        # 適切なAPI使用のための制御
-        self.request_delay = 0.1  # 100msの遅延
+        # 接続を再利用するためのHTTPセッション
+        self.session = session or create_http_session()
+
+        # 並行リクエスト全体の送信レートを抑えるリミッタ
+        self.rate_limiter = RateLimiter(*config.API_RATE_LIMITS["openalex"])
 
     def _make_request(self, endpoint: str, params: Dict = None) -> Optional[Dict[str, Any]]:
         """
@@ -47,15 +50,18 @@ class OpenAlexClient:
         Returns:
             API応答の辞書またはNone（エラー時）
         """
-        # 適切な間隔を空けるための遅延
-        time.sleep(self.request_delay)
-
         url = f"{self.base_url}{endpoint}"
+
+        # キャッシュから応答できる場合はAPIに送信しないため待機しない
+        # 送信間隔はrate_limiterが全スレッドで共有して守るため、スレッドごとに固定の遅延は入れない
+        if not has_fresh_cache(self.session, url, params):
+            self.rate_limiter.acquire()
+
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self.session.get(url, headers=self.headers, params=params)
 
             if response.status_code == 200:
-                return response.json()
+                return parse_json_response(response)
             else:
                 logger.error(f"OpenAlex API エラー: {response.status_code} - {response.text}")
                 return None
@@ -64,13 +70,14 @@ class OpenAlexClient:
             logger.error(f"OpenAlex APIリクエスト中にエラーが発生: {e}", exc_info=True)
             return None
 
-    def search_authors(self, keyword: str, max_results: int = 10) -> List[Dict[str, Any]]:
+    def search_authors(self, keyword: str, max_results: int = 10, raise_on_error: bool = False) -> List[Dict[str, Any]]:
         """
         キーワードで著者を検索します
 
         Args:
             keyword: 検索キーワード
             max_results: 取得する最大結果数
+            raise_on_error: Trueの場合、検索に失敗したときに空のリストを返さず例外を送出する
 
         Returns:
             著者情報の辞書のリスト
@@ -88,6 +95,8 @@ class OpenAlexClient:
             return authors
 
         logger.warning(f"OpenAlex: '{keyword}'での著者検索に失敗しました")
+        if raise_on_error:
+            raise RuntimeError(f"OpenAlex: '{keyword}'での著者検索に失敗しました")
         return []
 
     def get_author_details(self, author_id: str) -> Optional[Dict[str, Any]]:
@@ -103,6 +112,7 @@ class OpenAlexClient:
         endpoint = f"/authors/{author_id}"
         return self._make_request(endpoint)
 
+    @memoize_results()
     def get_author_works(self, author_id: str, max_works: int = 5) -> List[Dict[str, Any]]:
         """
         指定された著者の論文一覧を取得します
@@ -139,6 +149,25 @@ class OpenAlexClient:
         endpoint = f"/works/{work_id}"
         return self._make_request(endpoint)
 
+    @staticmethod
+    def _reconstruct_abstract(inverted_index: Dict[str, List[int]]) -> str:
+        """
+        インバーテッドインデックス（単語 -> 出現位置のリスト）から論文概要の本文を再構築します
+        出現位置に単語を直接配置するため、全位置のソートは行いません
+
+        Args:
+            inverted_index: OpenAlexのabstract_inverted_index
+
+        Returns:
+            再構築した概要テキスト
+        """
+        length = max((max(positions) for positions in inverted_index.values() if positions), default=-1) + 1
+        words = [""] * length
+        for word, positions in inverted_index.items():
+            for pos in positions:
+                words[pos] = word
+        return " ".join(word for word in words if word)
+
     def extract_person_data(self, author_data: Dict[str, Any], works_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         OpenAlexからの生データを候補者データモデルに変換します
@@ -175,10 +204,7 @@ class OpenAlexClient:
             # 論文の概要
             if work.get("abstract_inverted_index"):
                 try:
-                    # インバーテッドインデックスから抽象を再構築
-                    idx = work["abstract_inverted_index"]
-                    words = list(idx.keys())
-                    abstract = " ".join([words[pos] for pos in sorted([pos for positions in idx.values() for pos in positions])])
+                    abstract = self._reconstruct_abstract(work["abstract_inverted_index"])
                     experience_texts.append(f"概要: {abstract}")
                 except Exception as e:
                     logger.warning(f"論文概要の再構築に失敗: {e}")
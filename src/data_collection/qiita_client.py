@@ -7,7 +7,7 @@ import requests
 from typing import Dict, List, Any, Optional
 
 import config
-from src.utils.common import setup_logger, safe_api_call
+from src.utils.common import setup_logger, safe_api_call, create_http_session, has_fresh_cache, RateLimiter, memoize_results, parse_json_response
 
 # ロガーの設定
 logger = setup_logger(__name__)
@@ -16,12 +16,13 @@ class QiitaClient:
     """
     Qiita APIとの通信を担当するクライアントクラス
     """
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, session: Optional[requests.Session] = None):
         """
         Qiitaクライアントを初期化します
 
         Args:
             api_key: Qiita APIのアクセストークン（省略時はconfigから取得）
+            session: 共有するHTTPセッション（省略時は新しく作成）
         """
         self.api_key = api_key or config.QIITA_API_KEY
         self.base_url = config.QIITA_API_BASE_URL
@@ -37,6 +38,12 @@ class QiitaClient:
         self.rate_limit_remaining = 60  # デフォルト値
         self.rate_limit_reset = 0
 
+        # 接続を再利用するためのHTTPセッション
+        self.session = session or create_http_session()
+
+        # 並行リクエスト全体の送信レートを抑えるリミッタ
+        self.rate_limiter = RateLimiter(*config.API_RATE_LIMITS["qiita"])
+
     def _make_request(self, endpoint: str, params: Dict = None) -> Optional[Any]:
         """
         Qiita APIへのリクエストを実行します
@@ -49,24 +56,30 @@ class QiitaClient:
         Returns:
             API応答の辞書/リストまたはNone（エラー時）
         """
-        # レートリミットがほぼ消費されている場合は待機
-        if self.rate_limit_remaining < 5:
-            current_time = time.time()
-            wait_time = max(0, self.rate_limit_reset - current_time + 1)
-            if wait_time > 0:
-                logger.info(f"Qiita APIのレートリミットに達しました。{wait_time:.1f}秒待機します")
-                time.sleep(wait_time)
-
         url = f"{self.base_url}{endpoint}"
+
+        # キャッシュから応答できる場合はAPIに送信しないため待機しない
+        if not has_fresh_cache(self.session, url, params):
+            # レートリミットがほぼ消費されている場合は待機
+            if self.rate_limit_remaining < 5:
+                current_time = time.time()
+                wait_time = max(0, self.rate_limit_reset - current_time + 1)
+                if wait_time > 0:
+                    logger.info("Qiita APIのレートリミットに達しました。%.1f秒待機します", wait_time)
+                    time.sleep(wait_time)
+            self.rate_limiter.acquire()
+
         try:
-            response = requests.get(url, headers=self.headers, params=params)
+            response = self.session.get(url, headers=self.headers, params=params)
 
             # レートリミット情報を更新
-            self.rate_limit_remaining = int(response.headers.get("Rate-Remaining", 60))
-            self.rate_limit_reset = int(response.headers.get("Rate-Reset", 0))
+            # （キャッシュから返した応答のヘッダーは保存時点の値のため使わない）
+            if not getattr(response, "from_cache", False):
+                self.rate_limit_remaining = int(response.headers.get("Rate-Remaining", 60))
+                self.rate_limit_reset = int(response.headers.get("Rate-Reset", 0))
 
             if response.status_code == 200:
-                return response.json()
+                return parse_json_response(response)
             else:
                 logger.error(f"Qiita API エラー: {response.status_code} - {response.text}")
                 return None
@@ -75,13 +88,14 @@ class QiitaClient:
             logger.error(f"Qiita APIリクエスト中にエラーが発生: {e}", exc_info=True)
             return None
 
-    def search_items(self, keyword: str, max_results: int = 100) -> List[Dict[str, Any]]:
+    def search_items(self, keyword: str, max_results: int = 100, raise_on_error: bool = False) -> List[Dict[str, Any]]:
         """
         キーワードで記事を検索します
 
         Args:
             keyword: 検索キーワード
             max_results: 取得する最大結果数
+            raise_on_error: Trueの場合、検索に失敗したときに空のリストを返さず例外を送出する
 
         Returns:
             記事情報の辞書のリスト
@@ -93,14 +107,18 @@ class QiitaClient:
         }
 
         response = self._make_request(endpoint, params)
-        if response:
+        # 検索結果が0件の場合は空のリストが返る（失敗時のNoneと区別する）
+        if response is not None:
             items = response[:max_results]
             logger.info(f"Qiita: '{keyword}'で{len(items)}件の記事を検索しました")
             return items
 
         logger.warning(f"Qiita: '{keyword}'での記事検索に失敗しました")
+        if raise_on_error:
+            raise RuntimeError(f"Qiita: '{keyword}'での記事検索に失敗しました")
         return []
 
+    @memoize_results()
     def get_user_details(self, user_id: str) -> Optional[Dict[str, Any]]:
         """
         指定されたユーザーの詳細情報を取得します
@@ -114,6 +132,7 @@ class QiitaClient:
         endpoint = f"/users/{user_id}"
         return self._make_request(endpoint)
 
+    @memoize_results()
     def get_user_items(self, user_id: str, max_items: int = 5) -> List[Dict[str, Any]]:
         """
         指定されたユーザーの投稿記事一覧を取得します
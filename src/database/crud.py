@@ -1,11 +1,14 @@
 """
 データベース操作（CRUD: Create, Read, Update, Delete）を提供するモジュール
 """
-from typing import List, Dict, Any, Optional, Union
-from sqlalchemy.orm import Session
-from sqlalchemy import or_
-
-from src.database.models import Person
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple, Union
+import pandas as pd
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import and_, or_, false, func, case, select, update, bindparam, text, table, column, literal, literal_column, union_all, tuple_
+from sqlalchemy.exc import OperationalError
+
+from src.database.models import Person, DATA_SOURCE_BITS
 from src.utils.common import setup_logger
 
 # ロガーの設定
@@ -13,13 +16,14 @@ logger = setup_logger(__name__)
 
 # 候補者（Person）のCRUD操作
 
-def create_person(db: Session, person_data: Dict[str, Any]) -> Person:
+def create_person(db: Session, person_data: Dict[str, Any], commit: bool = True) -> Person:
     """
     新しい候補者をデータベースに作成します。
 
     Args:
         db: データベースセッション
         person_data: 候補者データの辞書
+        commit: Falseの場合はフラッシュのみ行い、コミットは呼び出し元に任せる
 
     Returns:
         作成された候補者のオブジェクト
@@ -27,13 +31,16 @@ def create_person(db: Session, person_data: Dict[str, Any]) -> Person:
     try:
         db_person = Person(**person_data)
         db.add(db_person)
-        db.commit()
-        db.refresh(db_person)
-        logger.info(f"候補者を作成しました: {db_person.id} - {db_person.full_name}")
+        if commit:
+            db.commit()
+            db.refresh(db_person)
+        else:
+            db.flush()
+        logger.info("候補者を作成しました: %s - %s", db_person.id, db_person.full_name)
         return db_person
     except Exception as e:
         db.rollback()
-        logger.error(f"候補者作成中にエラーが発生: {e}", exc_info=True)
+        logger.error("候補者作成中にエラーが発生: %s", e, exc_info=True)
         raise
 
 def get_person_by_id(db: Session, person_id: str) -> Optional[Person]:
@@ -49,6 +56,22 @@ def get_person_by_id(db: Session, person_id: str) -> Optional[Person]:
     """
     return db.query(Person).filter(Person.id == person_id).first()
 
+def get_persons_by_ids(db: Session, person_ids: List[str]) -> List[Person]:
+    """
+    複数のIDで候補者を1回のクエリでまとめて取得します。
+
+    Args:
+        db: データベースセッション
+        person_ids: 候補者IDのリスト
+
+    Returns:
+        候補者オブジェクトのリスト（person_idsの順序を保持、見つからないIDは除外）
+    """
+    if not person_ids:
+        return []
+    found = {p.id: p for p in db.query(Person).filter(Person.id.in_(person_ids)).all()}
+    return [found[pid] for pid in person_ids if pid in found]
+
 def get_all_persons(db: Session, skip: int = 0, limit: int = 100) -> List[Person]:
     """
     すべての候補者を取得します。
@@ -63,7 +86,76 @@ def get_all_persons(db: Session, skip: int = 0, limit: int = 100) -> List[Person
     """
     return db.query(Person).offset(skip).limit(limit).all()
 
-def update_person(db: Session, person_id: str, update_data: Dict[str, Any]) -> Optional[Person]:
+# 一覧表示用にDataFrameとして取得するカラム（生データのJSONは含めない）
+PERSON_LIST_COLUMNS = (
+    Person.id, Person.full_name, Person.email, Person.current_affiliation,
+    Person.github_username, Person.qiita_id, Person.orcid_id,
+    Person.linkedin_url, Person.personal_blog_url,
+    Person.is_researcher, Person.is_engineer,
+    Person.experience_summary, Person.data_sources, Person.last_updated_at,
+)
+
+def _role_filter(include_researchers: bool, include_engineers: bool):
+    """
+    候補者区分の絞り込み条件を作成します（両方含める場合は絞り込まない）。
+
+    Args:
+        include_researchers: 研究者を含めるか
+        include_engineers: エンジニアを含めるか
+
+    Returns:
+        WHERE句に渡す条件。絞り込まない場合はNone
+    """
+    if include_researchers and include_engineers:
+        return None
+    if include_researchers:
+        return Person.is_researcher.is_(True)
+    if include_engineers:
+        return Person.is_engineer.is_(True)
+    return false()
+
+def get_all_persons_df(db: Session, skip: int = 0, limit: Optional[int] = None,
+                       include_researchers: bool = True, include_engineers: bool = True) -> pd.DataFrame:
+    """
+    候補者一覧をORMオブジェクトを経由せずにDataFrameとして取得します（登録順）。
+
+    Args:
+        db: データベースセッション
+        skip: スキップする件数
+        limit: 取得する最大件数（Noneの場合は全件）
+        include_researchers: 研究者を含めるか
+        include_engineers: エンジニアを含めるか
+
+    Returns:
+        1候補者1行のDataFrame（カラム名はテーブルのカラム名）
+    """
+    query = select(*PERSON_LIST_COLUMNS)
+    role_filter = _role_filter(include_researchers, include_engineers)
+    if role_filter is not None:
+        query = query.where(role_filter)
+    # ページ単位で取得しても全件取得と同じ並びになるよう、登録順（rowid）で並べる
+    query = query.order_by(literal_column("persons.rowid")).offset(skip).limit(limit)
+    return pd.read_sql(query, db.connection())
+
+def count_persons(db: Session, include_researchers: bool = True, include_engineers: bool = True) -> int:
+    """
+    候補者区分の条件に一致する候補者数を取得します。
+
+    Args:
+        db: データベースセッション
+        include_researchers: 研究者を含めるか
+        include_engineers: エンジニアを含めるか
+
+    Returns:
+        候補者数
+    """
+    query = select(func.count(Person.id))
+    role_filter = _role_filter(include_researchers, include_engineers)
+    if role_filter is not None:
+        query = query.where(role_filter)
+    return db.execute(query).scalar_one()
+
+def update_person(db: Session, person_id: str, update_data: Dict[str, Any], commit: bool = True) -> Optional[Person]:
     """
     既存の候補者データを更新します。
 
@@ -71,6 +163,7 @@ def update_person(db: Session, person_id: str, update_data: Dict[str, Any]) -> O
         db: データベースセッション
         person_id: 更新する候補者のID
         update_data: 更新するフィールドと値の辞書
+        commit: Falseの場合はフラッシュのみ行い、コミットは呼び出し元に任せる
 
     Returns:
         更新された候補者オブジェクト。見つからない場合はNone。
@@ -80,13 +173,16 @@ def update_person(db: Session, person_id: str, update_data: Dict[str, Any]) -> O
         try:
             for key, value in update_data.items():
                 setattr(db_person, key, value)
-            db.commit()
-            db.refresh(db_person)
-            logger.info(f"候補者を更新しました: {db_person.id} - {db_person.full_name}")
+            if commit:
+                db.commit()
+                db.refresh(db_person)
+            else:
+                db.flush()
+            logger.info("候補者を更新しました: %s - %s", db_person.id, db_person.full_name)
             return db_person
         except Exception as e:
             db.rollback()
-            logger.error(f"候補者更新中にエラーが発生: {e}", exc_info=True)
+            logger.error("候補者更新中にエラーが発生: %s", e, exc_info=True)
             raise
     return None
 
@@ -106,11 +202,11 @@ def delete_person(db: Session, person_id: str) -> bool:
         try:
             db.delete(db_person)
             db.commit()
-            logger.info(f"候補者を削除しました: {person_id}")
+            logger.info("候補者を削除しました: %s", person_id)
             return True
         except Exception as e:
             db.rollback()
-            logger.error(f"候補者削除中にエラーが発生: {e}", exc_info=True)
+            logger.error("候補者削除中にエラーが発生: %s", e, exc_info=True)
             raise
     return False
 
@@ -134,7 +230,188 @@ def search_persons(db: Session, keyword: str) -> List[Person]:
         )
     ).all()
 
-def find_person_by_identifiers(db: Session, identifiers: Dict[str, Any]) -> Optional[Person]:
+# FTS5仮想テーブル（migration.migrate_create_persons_fts で作成、rowidはpersons.fts_rowidに対応）
+persons_fts = table("persons_fts", column("rowid"))
+
+# trigramトークナイザで索引される語の最小文字数（これより短い語は全文検索でヒットしない）
+FTS_MIN_TERM_LENGTH = 3
+
+def _build_fts_query(terms: List[str]) -> str:
+    """
+    検索語をFTS5のMATCHクエリに変換します（各語を前方一致のAND条件にする）。
+
+    Args:
+        terms: 検索語のリスト
+
+    Returns:
+        FTS5クエリ文字列
+    """
+    return " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+
+def _apply_keyword_filter(query, terms: List[str], use_fts: bool):
+    """
+    検索語による絞り込み条件をクエリに追加します（すべての語を含む候補者に絞り込む）。
+    全文検索を使う場合は3文字以上の語をFTS5で絞り込んでbm25の関連度順に並べ、短い語は語ごとのLIKE条件で絞り込みます。
+
+    Args:
+        query: 候補者を取得するSELECT文
+        terms: 検索語のリスト
+        use_fts: Falseの場合はすべての語をLIKE条件で絞り込む
+
+    Returns:
+        絞り込み条件を追加したSELECT文
+    """
+    fts_terms = [term for term in terms if use_fts and len(term) >= FTS_MIN_TERM_LENGTH]
+    for term in terms:
+        if term in fts_terms:
+            continue
+        search = f"%{term}%"
+        query = query.where(or_(
+            Person.full_name.ilike(search),
+            Person.current_affiliation.ilike(search),
+            Person.experience_summary.ilike(search)
+        ))
+    if fts_terms:
+        query = (
+            query
+            .join(persons_fts, persons_fts.c.rowid == literal_column("persons.fts_rowid"))
+            .where(text("persons_fts MATCH :query").bindparams(query=_build_fts_query(fts_terms)))
+            .order_by(text("bm25(persons_fts)"))
+        )
+    return query
+
+def _has_fts_terms(terms: List[str]) -> bool:
+    """
+    全文検索で絞り込める語（3文字以上）が含まれるかを判定します。
+
+    Args:
+        terms: 検索語のリスト
+
+    Returns:
+        全文検索で絞り込める語があればTrue
+    """
+    return any(len(term) >= FTS_MIN_TERM_LENGTH for term in terms)
+
+def search_persons_fts(db: Session, keyword: str, limit: Optional[int] = None) -> List[Person]:
+    """
+    FTS5全文検索で候補者を検索します（bm25の関連度順）。
+    空白区切りの各語をすべて含む候補者を返し、3文字未満の語は語ごとのLIKE条件で絞り込みます。
+    FTSテーブルが無い場合やヒットしない場合は、すべての語をLIKE条件で絞り込みます。
+
+    Args:
+        db: データベースセッション
+        keyword: 検索キーワード
+        limit: 取得する最大件数（Noneの場合は全件）
+
+    Returns:
+        マッチする候補者のリスト
+    """
+    terms = keyword.split()
+    if not terms:
+        return []
+
+    if _has_fts_terms(terms):
+        try:
+            persons = db.execute(_apply_keyword_filter(select(Person), terms, True).limit(limit)).scalars().all()
+            if persons:
+                return persons
+        except OperationalError as e:
+            db.rollback()
+            logger.warning("全文検索を実行できないためLIKE検索を使用します: %s", e)
+
+    return db.execute(_apply_keyword_filter(select(Person), terms, False).limit(limit)).scalars().all()
+
+def search_persons_df(db: Session, keyword: str, include_researchers: bool = True,
+                      include_engineers: bool = True, limit: Optional[int] = None) -> pd.DataFrame:
+    """
+    キーワードと候補者区分でSQL側で絞り込み、一覧表示用のDataFrameを返します。
+    全文検索（bm25の関連度順）を優先し、使えない場合やヒットしない場合はLIKE検索を使用します。
+    件数の上限は候補者区分とキーワードで絞り込んだ後に関連度順で適用します。
+
+    Args:
+        db: データベースセッション
+        keyword: 検索キーワード
+        include_researchers: 研究者を含めるか
+        include_engineers: エンジニアを含めるか
+        limit: 取得する最大件数（Noneの場合は全件）
+
+    Returns:
+        1候補者1行のDataFrame（カラム名はテーブルのカラム名）
+    """
+    role_conditions = []
+    if include_researchers:
+        role_conditions.append(Person.is_researcher.is_(True))
+    if include_engineers:
+        role_conditions.append(Person.is_engineer.is_(True))
+    if not role_conditions:
+        return pd.DataFrame(columns=[col.key for col in PERSON_LIST_COLUMNS])
+
+    base_query = select(*PERSON_LIST_COLUMNS).where(or_(*role_conditions))
+    terms = keyword.split()
+
+    if _has_fts_terms(terms):
+        try:
+            df = pd.read_sql(_apply_keyword_filter(base_query, terms, True).limit(limit), db.connection())
+            if not df.empty:
+                return df
+        except OperationalError as e:
+            db.rollback()
+            logger.warning("全文検索を実行できないためLIKE検索を使用します: %s", e)
+
+    return pd.read_sql(_apply_keyword_filter(base_query, terms, False).limit(limit), db.connection())
+
+# 強い識別子（一意に近い識別子）の照合の優先順位
+STRONG_IDENTIFIER_COLUMNS = (
+    ("email", Person.email),
+    ("orcid_id", Person.orcid_id),
+    ("github_username", Person.github_username),
+)
+
+def find_person_by_strong_ids(db: Session, identifiers: Dict[str, Any]) -> Optional[Person]:
+    """
+    メールアドレス・ORCID ID・GitHubユーザー名で候補者を検索します。
+    識別子ごとのインデックス検索をUNION ALLで1回のクエリにまとめ、優先順位の最も高い1件だけを取得します。
+
+    Args:
+        db: データベースセッション
+        identifiers: email / orcid_id / github_username を含む識別子の辞書
+
+    Returns:
+        一致する候補者（email, orcid_id, github_username の優先順位）。見つからない場合はNone。
+    """
+    lookups = [
+        select(Person, literal(priority).label("priority"), literal_column("persons.rowid").label("row_order"))
+        .where(column == identifiers[key])
+        for priority, (key, column) in enumerate(STRONG_IDENTIFIER_COLUMNS)
+        if identifiers.get(key)
+    ]
+    if not lookups:
+        return None
+
+    matches = union_all(*lookups).subquery()
+    query = select(aliased(Person, matches)).order_by(matches.c.priority, matches.c.row_order).limit(1)
+    return db.execute(query).scalars().first()
+
+def find_person_by_name_affiliation(db: Session, identifiers: Dict[str, Any]) -> Optional[Person]:
+    """
+    氏名と所属の完全一致で候補者を検索します。
+
+    Args:
+        db: データベースセッション
+        identifiers: full_name と current_affiliation を含む識別子の辞書
+
+    Returns:
+        一致する候補者。見つからない場合はNone。
+    """
+    if not (identifiers.get('full_name') and identifiers.get('current_affiliation')):
+        return None
+    return db.query(Person).filter(
+        Person.full_name == identifiers['full_name'],
+        Person.current_affiliation == identifiers['current_affiliation']
+    ).first()
+
+def find_person_by_identifiers(db: Session, identifiers: Dict[str, Any],
+                               match_name: bool = True) -> Optional[Person]:
     """
     識別子で候補者を検索します。
     同一人物検出用の関数です。
@@ -146,38 +423,95 @@ def find_person_by_identifiers(db: Session, identifiers: Dict[str, Any]) -> Opti
             - orcid_id: ORCID ID
             - github_username: GitHubユーザー名
             - (full_name + current_affiliation): 氏名と所属の組み合わせ
+        match_name: Falseの場合は氏名と所属の組み合わせでは照合しない
 
     Returns:
         一致する候補者。見つからない場合はNone。
     """
-    query = db.query(Person)
-
-    # 優先順位に従って検索
-    if identifiers.get('email'):
-        person = query.filter(Person.email == identifiers['email']).first()
-        if person:
-            return person
-
-    if identifiers.get('orcid_id'):
-        person = query.filter(Person.orcid_id == identifiers['orcid_id']).first()
-        if person:
-            return person
-
-    if identifiers.get('github_username'):
-        person = query.filter(Person.github_username == identifiers['github_username']).first()
-        if person:
-            return person
-
-    # 氏名と所属の完全一致
-    if identifiers.get('full_name') and identifiers.get('current_affiliation'):
-        person = query.filter(
-            Person.full_name == identifiers['full_name'],
-            Person.current_affiliation == identifiers['current_affiliation']
-        ).first()
-        if person:
-            return person
+    # 強い識別子で見つかれば氏名と所属の照合は行わない
+    person = find_person_by_strong_ids(db, identifiers)
+    if person is None and match_name:
+        person = find_person_by_name_affiliation(db, identifiers)
+    return person
+
+def find_persons_by_identifiers_bulk(db: Session, emails: List[str], orcid_ids: List[str],
+                                     github_usernames: List[str],
+                                     name_affiliations: List[Tuple[str, str]]) -> List[Person]:
+    """
+    複数の候補者の識別子に一致する既存の候補者を1回のクエリでまとめて取得します。
+    find_person_by_identifiers を候補者ごとに呼ぶ代わりに、一括保存の前に使用します。
 
-    return None
+    Args:
+        db: データベースセッション
+        emails: メールアドレスのリスト
+        orcid_ids: ORCID IDのリスト
+        github_usernames: GitHubユーザー名のリスト
+        name_affiliations: (氏名, 所属) の組み合わせのリスト
+
+    Returns:
+        いずれかの識別子が一致する候補者のリスト（登録順）
+    """
+    conditions = [
+        column.in_(values)
+        for column, values in (
+            (Person.email, emails),
+            (Person.orcid_id, orcid_ids),
+            (Person.github_username, github_usernames),
+        )
+        if values
+    ]
+    if name_affiliations:
+        # 氏名でインデックスを引いたうえで所属との組み合わせで絞り込み、同姓同名の別人を取得しない
+        conditions.append(and_(
+            Person.full_name.in_({full_name for full_name, _ in name_affiliations}),
+            tuple_(Person.full_name, Person.current_affiliation).in_(name_affiliations)
+        ))
+    if not conditions:
+        return []
+    return db.query(Person).filter(or_(*conditions)).order_by(literal_column("persons.rowid")).all()
+
+def get_data_version(db: Session) -> Tuple[int, Optional[datetime]]:
+    """
+    候補者データのバージョン（件数と最終更新日時）を取得します。
+    追加・更新・削除のいずれかで値が変わるため、キャッシュキーとして利用できます。
+
+    Args:
+        db: データベースセッション
+
+    Returns:
+        (候補者数, 最終更新日時)のタプル
+    """
+    count, latest = db.query(func.count(Person.id), func.max(Person.last_updated_at)).one()
+    return count, latest
+
+def get_person_stats(db: Session) -> Dict[str, Any]:
+    """
+    候補者の集計値を1回の集計クエリで取得します。
+
+    Args:
+        db: データベースセッション
+
+    Returns:
+        総数・研究者数・エンジニア数・データソース別人数・最終更新日時の辞書
+    """
+    def count_if(condition):
+        return func.sum(case((condition, 1), else_=0))
+
+    source_columns = [
+        count_if(Person.data_sources_mask.bitwise_and(bit) != 0).label(source)
+        for source, bit in DATA_SOURCE_BITS.items()
+    ]
+    row = db.query(
+        func.count(Person.id).label("total"),
+        count_if(Person.is_researcher.is_(True)).label("researcher"),
+        count_if(Person.is_engineer.is_(True)).label("engineer"),
+        *source_columns,
+        func.max(Person.last_updated_at).label("latest_update"),
+    ).one()
+
+    stats = {key: value or 0 for key, value in row._asdict().items()}
+    stats["latest_update"] = row.latest_update
+    return stats
 
 def update_match_scores(db: Session, score_dict: Dict[str, float]) -> int:
     """
@@ -190,20 +524,29 @@ def update_match_scores(db: Session, score_dict: Dict[str, float]) -> int:
     Returns:
         更新された候補者の数
     """
-    updated_count = 0
+    if not score_dict:
+        return 0
+
+    # 1件ずつ取得・更新せず、1つのUPDATE文をexecutemanyでまとめて実行する
+    # スコアは候補者データではないため、last_updated_at（データバージョン）は更新しない
+    persons_table = Person.__table__
+    statement = (
+        update(persons_table)
+        .where(persons_table.c.id == bindparam("person_id"))
+        .values(match_score=bindparam("score"), last_updated_at=persons_table.c.last_updated_at)
+    )
     try:
-        for person_id, score in score_dict.items():
-            db_person = get_person_by_id(db, person_id)
-            if db_person:
-                db_person.match_score = score
-                updated_count += 1
+        result = db.execute(statement, [
+            {"person_id": person_id, "score": score} for person_id, score in score_dict.items()
+        ])
+        updated_count = result.rowcount
 
         db.commit()
-        logger.info(f"{updated_count}件の候補者のマッチスコアを更新しました")
+        logger.info("%s件の候補者のマッチスコアを更新しました", updated_count)
         return updated_count
     except Exception as e:
         db.rollback()
-        logger.error(f"マッチスコア更新中にエラーが発生: {e}", exc_info=True)
+        logger.error("マッチスコア更新中にエラーが発生: %s", e, exc_info=True)
         raise
 
 def delete_all_persons(session):
@@ -216,7 +559,6 @@ def delete_all_persons(session):
     Returns:
         削除された候補者の数
     """
-    from src.database.models import Person
     deleted_count = session.query(Person).delete()
     session.commit()
     return deleted_count
@@ -7,7 +7,7 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, scoped_session
 
 import config
-from src.utils.common import setup_logger
+from src.utils.common import setup_logger, dumps_json, loads_json
 
 # ロガーの設定
 logger = setup_logger(__name__)
@@ -22,6 +22,9 @@ os.makedirs(os.path.dirname(config.DB_PATH), exist_ok=True)
 engine = create_engine(
     config.DB_URL,
     connect_args={"check_same_thread": False},  # SQLiteは複数スレッドから安全に操作するための設定
+    # 生データなどのJSONカラムの変換（orjsonがあれば高速な方を使う）
+    json_serializer=dumps_json,
+    json_deserializer=loads_json,
     echo=False  # SQLクエリのロギングを無効（本番環境では通常False）
 )
 
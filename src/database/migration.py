@@ -4,11 +4,13 @@
 import os
 import sqlite3
 import json
+from typing import Optional
 from sqlalchemy import create_engine, Column, JSON
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy import inspect
 
 import config
+from src.database.models import data_sources_to_mask
 from src.utils.common import setup_logger
 
 # ロガーの設定
@@ -68,6 +70,174 @@ def migrate_add_data_sources_column():
         logger.error(f"マイグレーション中にエラーが発生: {e}", exc_info=True)
         raise
 
+def migrate_add_data_sources_mask_column():
+    """
+    data_sources_maskカラムを追加するマイグレーションを実行する関数
+    既存レコードのdata_sourcesからビットマスクを計算して設定する
+    """
+    logger.info("マイグレーション実行: data_sources_maskカラム追加")
+
+    try:
+        conn = sqlite3.connect(config.DB_PATH)
+        cursor = conn.cursor()
+
+        cursor.execute("PRAGMA table_info(persons)")
+        columns = [col[1] for col in cursor.fetchall()]
+
+        if "data_sources_mask" not in columns:
+            cursor.execute("ALTER TABLE persons ADD COLUMN data_sources_mask INTEGER NOT NULL DEFAULT 0")
+            logger.info("data_sources_maskカラムを追加しました")
+
+            # 既存のdata_sourcesからビットマスクを設定
+            cursor.execute("SELECT id, data_sources FROM persons")
+            updates = [
+                (data_sources_to_mask(json.loads(data_sources) if data_sources else []), id)
+                for id, data_sources in cursor.fetchall()
+            ]
+            cursor.executemany("UPDATE persons SET data_sources_mask = ? WHERE id = ?", updates)
+
+            conn.commit()
+            logger.info("%s件のレコードにデータソースのビットマスクを設定しました", len(updates))
+        else:
+            logger.info("data_sources_maskカラムは既に存在しています")
+
+        conn.close()
+
+    except Exception as e:
+        logger.error("マイグレーション中にエラーが発生: %s", e, exc_info=True)
+        raise
+
+# persons_fts の作成SQL（{tokenize} にトークナイザを埋め込む）
+# personsの主キーは文字列のため、暗黙のrowidはVACUUMで振り直される可能性がある
+# 索引とpersonsの対応がずれないよう、rowidの代わりに固定の整数カラム fts_rowid で対応付ける
+PERSONS_FTS_SCHEMA = """
+    CREATE VIRTUAL TABLE persons_fts USING fts5(
+        full_name, current_affiliation, experience_summary, github_username, qiita_id,
+        content='persons', content_rowid='fts_rowid', tokenize='{tokenize}'
+    );
+
+    CREATE TRIGGER persons_fts_ai AFTER INSERT ON persons BEGIN
+        UPDATE persons SET fts_rowid = (SELECT IFNULL(MAX(fts_rowid), 0) + 1 FROM persons)
+        WHERE rowid = new.rowid AND fts_rowid IS NULL;
+        INSERT INTO persons_fts(rowid, full_name, current_affiliation, experience_summary, github_username, qiita_id)
+        SELECT fts_rowid, full_name, current_affiliation, experience_summary, github_username, qiita_id
+        FROM persons WHERE rowid = new.rowid;
+    END;
+
+    CREATE TRIGGER persons_fts_ad AFTER DELETE ON persons BEGIN
+        INSERT INTO persons_fts(persons_fts, rowid, full_name, current_affiliation, experience_summary, github_username, qiita_id)
+        VALUES ('delete', old.fts_rowid, old.full_name, old.current_affiliation, old.experience_summary, old.github_username, old.qiita_id);
+    END;
+
+    CREATE TRIGGER persons_fts_au AFTER UPDATE OF full_name, current_affiliation, experience_summary, github_username, qiita_id ON persons BEGIN
+        INSERT INTO persons_fts(persons_fts, rowid, full_name, current_affiliation, experience_summary, github_username, qiita_id)
+        VALUES ('delete', old.fts_rowid, old.full_name, old.current_affiliation, old.experience_summary, old.github_username, old.qiita_id);
+        INSERT INTO persons_fts(rowid, full_name, current_affiliation, experience_summary, github_username, qiita_id)
+        VALUES (new.fts_rowid, new.full_name, new.current_affiliation, new.experience_summary, new.github_username, new.qiita_id);
+    END;
+
+    INSERT INTO persons_fts(persons_fts) VALUES ('rebuild');
+"""
+
+# 日本語は空白で分かち書きされないため、部分一致できるtrigram（SQLite 3.34以降）を優先する
+PERSONS_FTS_TOKENIZERS = ("trigram", "unicode61")
+
+def _add_fts_rowid_column(conn: sqlite3.Connection) -> None:
+    """
+    persons_fts との対応付けに使う fts_rowid カラムを追加し、未設定のレコードに値を振る
+    （ORMのモデルには含めず、新規レコードの値は挿入トリガーで設定する）
+
+    Args:
+        conn: SQLite接続
+    """
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA table_info(persons)")
+    if "fts_rowid" not in [col[1] for col in cursor.fetchall()]:
+        cursor.execute("ALTER TABLE persons ADD COLUMN fts_rowid INTEGER")
+    cursor.execute(
+        "UPDATE persons SET fts_rowid = rowid + (SELECT IFNULL(MAX(fts_rowid), 0) FROM persons) "
+        "WHERE fts_rowid IS NULL"
+    )
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS ix_persons_fts_rowid ON persons (fts_rowid)")
+    conn.commit()
+
+def _create_persons_fts(conn: sqlite3.Connection) -> Optional[str]:
+    """
+    persons_fts テーブルとトリガーを作成し、既存データを索引する
+    使用できるトークナイザを優先順に試す
+
+    Args:
+        conn: SQLite接続
+
+    Returns:
+        使用したトークナイザ名（FTS5が使えない場合はNone）
+    """
+    _add_fts_rowid_column(conn)
+    for tokenize in PERSONS_FTS_TOKENIZERS:
+        try:
+            conn.executescript("BEGIN;" + PERSONS_FTS_SCHEMA.format(tokenize=tokenize) + "COMMIT;")
+            return tokenize
+        except sqlite3.OperationalError as e:
+            conn.rollback()
+            logger.warning("トークナイザ %s でFTS5テーブルを作成できませんでした: %s", tokenize, e)
+    return None
+
+def migrate_create_persons_fts():
+    """
+    候補者の全文検索用FTS5仮想テーブル（persons_fts）を作成するマイグレーション関数
+    personsテーブルを外部コンテンツとし、fts_rowid カラムで対応付けてトリガーで索引を同期する
+    """
+    logger.info("マイグレーション実行: persons_fts全文検索テーブル作成")
+
+    try:
+        conn = sqlite3.connect(config.DB_PATH)
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'persons_fts'")
+        if cursor.fetchone() is None:
+            tokenize = _create_persons_fts(conn)
+            if tokenize is None:
+                # FTS5が使えないSQLiteではLIKE検索にフォールバックする
+                logger.warning("FTS5テーブルを作成できませんでした（LIKE検索を使用します）")
+            else:
+                logger.info("persons_ftsテーブルとトリガーを作成し、既存データを索引しました（tokenize=%s）", tokenize)
+        else:
+            logger.info("persons_ftsテーブルは既に存在しています")
+
+        conn.close()
+
+    except Exception as e:
+        logger.error("マイグレーション中にエラーが発生: %s", e, exc_info=True)
+        raise
+
+# 同一人物判定に使う識別子のインデックス（models.Person の定義と同じ名前）
+IDENTIFIER_INDEXES = {
+    "ix_persons_email": "persons (email)",
+    "ix_persons_full_name_affiliation": "persons (full_name, current_affiliation)",
+}
+
+def migrate_create_identifier_indexes():
+    """
+    同一人物判定に使うメールアドレスと氏名・所属のインデックスを作成するマイグレーション関数
+    create_all は既存テーブルにインデックスを追加しないため、作成済みのDBにはここで追加する
+    """
+    logger.info("マイグレーション実行: 識別子インデックス作成")
+
+    try:
+        conn = sqlite3.connect(config.DB_PATH)
+        cursor = conn.cursor()
+
+        for name, target in IDENTIFIER_INDEXES.items():
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+        conn.commit()
+        conn.close()
+        logger.info("識別子インデックスを作成しました")
+
+    except Exception as e:
+        logger.error("マイグレーション中にエラーが発生: %s", e, exc_info=True)
+        raise
+
 def run_migrations():
     """
     全てのマイグレーションを実行する関数
@@ -77,6 +247,9 @@ def run_migrations():
     try:
         # マイグレーションを順に実行
         migrate_add_data_sources_column()
+        migrate_add_data_sources_mask_column()
+        migrate_create_persons_fts()
+        migrate_create_identifier_indexes()
 
         logger.info("データベースマイグレーション完了")
     except Exception as e:
@@ -1,26 +1,48 @@
 """
 データベースモデル（テーブル定義）を管理するモジュール
 """
-from sqlalchemy import Column, String, Boolean, Float, DateTime, JSON
+from functools import cached_property
+from typing import Iterable, Optional
+from sqlalchemy import Column, String, Boolean, Float, Integer, DateTime, JSON, Index
 from sqlalchemy.sql import func
 from datetime import datetime
 
 from src.database.db_manager import Base
 from src.utils.common import generate_id
 
+# データソースとビットマスクの対応（data_sources_maskカラムで使用）
+DATA_SOURCE_BITS = {"github": 1, "qiita": 2, "openalex": 4, "kaken": 8}
+
+def data_sources_to_mask(sources: Optional[Iterable[str]]) -> int:
+    """
+    データソース名のリストをビットマスクに変換する
+
+    Args:
+        sources: データソース名のリスト
+
+    Returns:
+        データソースのビットマスク（未知のソースは無視）
+    """
+    mask = 0
+    for source in sources or ():
+        mask |= DATA_SOURCE_BITS.get(source, 0)
+    return mask
+
 class Person(Base):
     """
     候補者（エンジニア・研究者）のテーブル
     要件定義書のpersonsテーブルの仕様に準拠
     """
     __tablename__ = "persons"
+    # 同一人物判定（氏名と所属の完全一致）用の複合インデックス
+    __table_args__ = (Index("ix_persons_full_name_affiliation", "full_name", "current_affiliation"),)
 
     # 主キー
     id = Column(String, primary_key=True, default=generate_id)
 
     # 基本情報
     full_name = Column(String, nullable=False)
-    email = Column(String, nullable=True)
+    email = Column(String, nullable=True, index=True)
     current_affiliation = Column(String, nullable=True)
 
     # プロフィール識別子
@@ -41,6 +63,8 @@ class Person(Base):
 
     # データソース追跡
     data_sources = Column(JSON, nullable=False, default=list)
+    # data_sourcesのビットマスク（集計用、DATA_SOURCE_BITS参照）
+    data_sources_mask = Column(Integer, nullable=False, default=0)
 
     # 生データ（JSON形式）
     raw_github_data = Column(JSON, nullable=True)
@@ -58,6 +82,18 @@ class Person(Base):
         """オブジェクトの文字列表現"""
         return f"<Person(id='{self.id}', name='{self.full_name}', affiliation='{self.current_affiliation}')>"
 
+    @cached_property
+    def search_text(self) -> str:
+        """
+        キーワード検索用の小文字化した結合テキスト（氏名・所属・経験サマリ）
+        初回参照時に一度だけ作成し、同じインスタンスへの検索では使い回す
+        """
+        return " ".join(filter(None, [
+            self.full_name,
+            self.current_affiliation,
+            self.experience_summary
+        ])).lower()
+
     def to_dict(self):
         """オブジェクトを辞書に変換"""
         return {
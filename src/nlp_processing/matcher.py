@@ -2,8 +2,12 @@
 テキスト間の適合度を計算するマッチングモジュール
 TF-IDFとコサイン類似度を用いて、人材要件と候補者の適合度を計算する
 """
+import os
+import pickle
+import tempfile
 import numpy as np
-from typing import List, Tuple, Dict, Any
+from functools import lru_cache
+from typing import List, Tuple, Dict, Any, Optional
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 
@@ -39,6 +43,20 @@ def prepare_corpus(requirements: str, persons: List[Person]) -> List[str]:
 
     return corpus
 
+@lru_cache(maxsize=4096)
+def preprocess_document(text: str) -> str:
+    """
+    文書を前処理し、トークンをスペースで結合した文字列を返す（結果はメモ化）
+    候補者の経験サマリはマッチングのたびに変わらないため、2回目以降は再トークナイズしない
+
+    Args:
+        text: 前処理対象のテキスト
+
+    Returns:
+        前処理済みトークンをスペースで結合した文字列
+    """
+    return " ".join(preprocess_text(text))
+
 def create_tfidf_matrix(corpus: List[str]) -> Tuple[TfidfVectorizer, np.ndarray]:
     """
     コーパスからTF-IDF行列を作成する
@@ -50,12 +68,7 @@ def create_tfidf_matrix(corpus: List[str]) -> Tuple[TfidfVectorizer, np.ndarray]
         TF-IDFベクトライザと作成されたTF-IDF行列のタプル
     """
     # 前処理済みテキストをスペースで結合した配列を作成
-    processed_corpus = []
-
-    for text in corpus:
-        tokens = preprocess_text(text)
-        processed_text = " ".join(tokens)
-        processed_corpus.append(processed_text)
+    processed_corpus = [preprocess_document(text) for text in corpus]
 
     # TF-IDFベクトライザの初期化と適用
     vectorizer = TfidfVectorizer()
@@ -84,6 +97,127 @@ def compute_similarity_scores(tfidf_matrix: np.ndarray) -> np.ndarray:
 
     return similarities
 
+# 候補者コーパスのTF-IDFインデックス（ベクトライザ, 行L2正規化済みTF-IDF行列, 候補者IDリスト）
+TfidfIndex = Tuple[TfidfVectorizer, Any, List[str]]
+
+def build_tfidf_index(persons: List[Person]) -> Optional[TfidfIndex]:
+    """
+    候補者の経験サマリからTF-IDFインデックスを作成する
+    候補者データが変わらない限り再利用でき、要件ごとの再学習が不要になる
+
+    Args:
+        persons: 候補者リスト
+
+    Returns:
+        TF-IDFインデックス。語彙が作れない場合（全員の経験サマリが空など）はNone
+    """
+    return build_tfidf_index_from_texts(
+        [person.id for person in persons],
+        [person.experience_summary or "" for person in persons]
+    )
+
+def build_tfidf_index_from_texts(ids: List[str], summaries: List[str]) -> Optional[TfidfIndex]:
+    """
+    候補者IDと経験サマリのリストからTF-IDFインデックスを作成する
+    ORMオブジェクトを持たない呼び出し元（キャッシュ済みDataFrameなど）向け
+
+    Args:
+        ids: 候補者IDのリスト
+        summaries: 候補者ごとの経験サマリのリスト（idsと同じ順序）
+
+    Returns:
+        TF-IDFインデックス。語彙が作れない場合（全員の経験サマリが空など）はNone
+    """
+    corpus = [preprocess_document(summary) for summary in summaries]
+
+    # float32で保持し、行列のメモリと疎行列積の計算量を半減させる
+    vectorizer = TfidfVectorizer(dtype=np.float32)
+    try:
+        tfidf_matrix = vectorizer.fit_transform(corpus)
+    except ValueError as e:
+        logger.warning("TF-IDFインデックスを作成できませんでした: %s", e)
+        return None
+
+    return vectorizer, tfidf_matrix, ids
+
+# 保存するファイル名（ベクトライザ・候補者ID・バージョンはpickle、文書行列は疎行列のnpz）
+TFIDF_INDEX_FILE = "tfidf_index.pkl"
+
+def save_tfidf_index(index: TfidfIndex, directory: str, version: Any) -> None:
+    """
+    TF-IDFインデックスをディレクトリに保存する
+    ベクトライザ・文書行列・候補者IDを1つのファイルにまとめ、別のバージョンの組み合わせで読まれないようにする
+
+    Args:
+        index: build_tfidf_index で作成したインデックス
+        directory: 保存先ディレクトリ
+        version: 候補者データのバージョントークン（読み込み時の照合に使用）
+    """
+    vectorizer, tfidf_matrix, ids = index
+    os.makedirs(directory, exist_ok=True)
+
+    # 書き込み途中のファイルを読まれないよう、同じディレクトリの一意な一時ファイルに書いてから置き換える
+    # （複数のセッションが同時に保存しても互いの一時ファイルを上書きしない）
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f"{TFIDF_INDEX_FILE}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump({"version": str(version), "vectorizer": vectorizer,
+                         "matrix": tfidf_matrix.tocsr(), "ids": ids}, f)
+        os.replace(tmp_path, os.path.join(directory, TFIDF_INDEX_FILE))
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def load_tfidf_index(directory: str, version: Any) -> Optional[TfidfIndex]:
+    """
+    保存済みのTF-IDFインデックスを読み込む
+
+    Args:
+        directory: 保存先ディレクトリ
+        version: 候補者データのバージョントークン
+
+    Returns:
+        TF-IDFインデックス。保存されていない場合やバージョンが異なる場合はNone
+    """
+    try:
+        with open(os.path.join(directory, TFIDF_INDEX_FILE), "rb") as f:
+            saved = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning("保存済みのTF-IDFインデックスを読み込めませんでした: %s", e)
+        return None
+
+    if saved.get("version") != str(version):
+        return None
+    tfidf_matrix, ids = saved["matrix"], saved["ids"]
+    if tfidf_matrix.shape[0] != len(ids):
+        return None
+    return saved["vectorizer"], tfidf_matrix, ids
+
+def score_requirements(requirements: str, index: TfidfIndex) -> List[Tuple[str, float]]:
+    """
+    TF-IDFインデックスを使って人材要件と全候補者の適合度を一括で計算する
+    各行はL2正規化済みのため、疎行列とクエリベクトルの積がそのままコサイン類似度になる
+
+    Args:
+        requirements: マッチングする人材要件テキスト
+        index: build_tfidf_index で作成したインデックス
+
+    Returns:
+        (候補者ID, マッチングスコア)のタプルのリスト（スコア降順）
+    """
+    vectorizer, tfidf_matrix, ids = index
+    query_vector = vectorizer.transform([preprocess_document(requirements)])
+    scores = (tfidf_matrix @ query_vector.T).toarray().ravel()
+
+    # 降順の並べ替えもNumPy側で行う（安定ソートのため同点は元の順序を保つ）
+    order = np.argsort(-scores, kind="stable")
+    return list(zip([ids[i] for i in order], scores[order].tolist()))
+
 def match_requirements(requirements: str, persons: List[Person]) -> List[Tuple[str, float]]:
     """
     人材要件と候補者リストのマッチングを行い、スコアを返す
@@ -100,20 +234,11 @@ def match_requirements(requirements: str, persons: List[Person]) -> List[Tuple[s
         return []
 
     try:
-        # コーパスの準備
-        corpus = prepare_corpus(requirements, persons)
-
-        # TF-IDF行列の作成
-        _, tfidf_matrix = create_tfidf_matrix(corpus)
-
-        # 類似度スコアの計算
-        similarity_scores = compute_similarity_scores(tfidf_matrix)
-
-        # 候補者IDとスコアのペアを作成
-        result_pairs = [(person.id, score) for person, score in zip(persons, similarity_scores)]
+        index = build_tfidf_index(persons)
+        if index is None:
+            return []
 
-        # スコア降順でソート
-        result_pairs.sort(key=lambda x: x[1], reverse=True)
+        result_pairs = score_requirements(requirements, index)
 
         logger.info(f"{len(result_pairs)}人の候補者に対するマッチングスコアを計算しました")
         return result_pairs
@@ -3,11 +3,72 @@
 """
 import os
 import uuid
+import hashlib
+import json
+import tempfile
+import atexit
+import concurrent.futures
+import functools
+import queue
 import logging
 import logging.handlers
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
 import config
 
+try:
+    # 利用できる場合は標準のjsonより高速なorjsonでAPI応答を解析する
+    import orjson
+except ImportError:
+    orjson = None
+
+class _FileHandlerDispatcher(logging.Handler):
+    """
+    キューから取り出したログレコードを、ロガー名ごとのファイルハンドラへ振り分けるハンドラ
+    """
+    def __init__(self):
+        super().__init__()
+        self.handlers_by_name = {}
+
+    def emit(self, record):
+        for handler in self.handlers_by_name.get(record.name, ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+# ファイルへの書き込みはバックグラウンドのスレッド1本にまとめ、呼び出し元はキューに積むだけにする
+_log_queue = queue.SimpleQueue()
+_file_dispatcher = _FileHandlerDispatcher()
+_queue_listener = None
+_queue_listener_lock = threading.Lock()
+
+def _add_file_handlers(name, handlers):
+    """
+    ロガー名に対応するファイルハンドラを登録し、キューへ積むハンドラを返します
+    初回呼び出し時にファイル書き込み用のバックグラウンドスレッドを開始します
+
+    Args:
+        name: ロガーの名前
+        handlers: 登録するファイルハンドラのリスト
+
+    Returns:
+        ロガーに追加するQueueHandler
+    """
+    global _queue_listener
+    with _queue_listener_lock:
+        _file_dispatcher.handlers_by_name[name] = handlers
+        if _queue_listener is None:
+            _queue_listener = logging.handlers.QueueListener(_log_queue, _file_dispatcher)
+            _queue_listener.start()
+            # 終了時にキューに残ったログを書き出してからスレッドを止める
+            atexit.register(_queue_listener.stop)
+    return logging.handlers.QueueHandler(_log_queue)
+
 # ロガーの設定
 def setup_logger(name, level=None, log_to_file=True):
     """
@@ -54,7 +115,7 @@ def setup_logger(name, level=None, log_to_file=True):
             )
             file_formatter = logging.Formatter(config.LOG_FILE_FORMAT)
             file_handler.setFormatter(file_formatter)
-            logger.addHandler(file_handler)
+            file_handlers = [file_handler]
 
             # エラーログ専用ハンドラ（オプション）
             if config.LOG_ERRORS_SEPARATELY:
@@ -67,7 +128,10 @@ def setup_logger(name, level=None, log_to_file=True):
                 )
                 error_handler.setLevel(logging.ERROR)
                 error_handler.setFormatter(file_formatter)
-                logger.addHandler(error_handler)
+                file_handlers.append(error_handler)
+
+            # ファイルハンドラは直接追加せず、キュー経由でバックグラウンドスレッドから書き込む
+            logger.addHandler(_add_file_handlers(name, file_handlers))
 
     return logger
 
@@ -90,3 +154,338 @@ def safe_api_call(func, *args, **kwargs):
     except Exception as e:
         logger.error(f"APIコール中にエラーが発生: {e}", exc_info=True)
         return None
+
+# API取得結果のメモ化
+_MEMO_ATTR_PREFIX = "_memo_"
+_memo_lock = threading.Lock()
+
+def memoize_results(maxsize: int = 4096):
+    """
+    APIクライアントのメソッドの取得結果をインスタンスごとにメモ化するデコレータ
+    同じIDの詳細を何度も取得しないようにします（None・空の結果は一時的な失敗の可能性があるためキャッシュしない）
+    同じ引数の取得が別スレッドで実行中の場合は、新たにリクエストせずその結果を待って共有します
+
+    Args:
+        maxsize: 保持する結果の最大件数（超えた場合は最も古く使われたものから破棄）
+
+    Returns:
+        メソッド用のデコレータ
+    """
+    def decorator(method):
+        attr = f"{_MEMO_ATTR_PREFIX}{method.__name__}"
+        inflight_attr = f"{_MEMO_ATTR_PREFIX}inflight_{method.__name__}"
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            with _memo_lock:
+                cache = self.__dict__.setdefault(attr, OrderedDict())
+                if key in cache:
+                    cache.move_to_end(key)
+                    return cache[key]
+                inflight = self.__dict__.setdefault(inflight_attr, {})
+                future = inflight.get(key)
+                is_owner = future is None
+                if is_owner:
+                    future = inflight[key] = concurrent.futures.Future()
+
+            if not is_owner:
+                # 実行中の取得の結果（例外を含む）をそのまま受け取る
+                return future.result()
+
+            try:
+                result = method(self, *args, **kwargs)
+            except BaseException as e:
+                with _memo_lock:
+                    inflight.pop(key, None)
+                future.set_exception(e)
+                raise
+
+            with _memo_lock:
+                if result:
+                    cache[key] = result
+                    if len(cache) > maxsize:
+                        cache.popitem(last=False)
+                inflight.pop(key, None)
+            future.set_result(result)
+            return result
+
+        return wrapper
+    return decorator
+
+def clear_memoized_results(obj):
+    """
+    memoize_results でメモ化したインスタンスの取得結果をすべて破棄します
+
+    Args:
+        obj: メモ化したメソッドを持つインスタンス
+    """
+    with _memo_lock:
+        for attr in [name for name in obj.__dict__ if name.startswith(_MEMO_ATTR_PREFIX)]:
+            del obj.__dict__[attr]
+
+# レート制限
+class RateLimiter:
+    """
+    トークンバケット方式のレートリミッタ（スレッドセーフ）
+    複数スレッドから同じAPIへ送るリクエストの合計レートを上限以下に保ちます
+    """
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Args:
+            rate: 1秒あたりに補充されるトークン数（許可するリクエスト数）
+            burst: バケットの容量（待機せずに連続して送れるリクエスト数）
+        """
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        トークンを1つ取得します。不足している場合は補充されるまで待機します
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            # 先にトークンを予約してからロックの外で待機し、待ち順を到着順に保つ
+            self.tokens -= 1
+            wait_time = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+# HTTPセッション
+class CachedHTTPSession(requests.Session):
+    """
+    GETの成功応答をディスクに保存し、再実行時に再利用するHTTPセッション
+    有効期間内の応答は通信せずに返し、期限切れの応答はETag/Last-Modifiedで再検証して
+    304（未変更）なら保存済みの本文を返す
+    応答はヘッダーと本文のテキストをJSONで保存し、通信せずに返した応答は from_cache がTrueになる
+    """
+    def __init__(self, cache_dir: str, ttl: float, max_size: int):
+        super().__init__()
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._size = None  # 保存済みの合計サイズ（初回保存時にディレクトリから求める）
+
+    def _cache_path(self, url: str, params=None) -> str:
+        """
+        URLとクエリパラメータに対応するキャッシュファイルのパスを返します
+        """
+        prepared_url = requests.Request("GET", url, params=params).prepare().url
+        return os.path.join(self.cache_dir, hashlib.sha1(prepared_url.encode("utf-8")).hexdigest() + ".json")
+
+    def _load(self, path: str):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, path: str, entry: dict) -> None:
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            stored_size = os.path.getsize(path)
+        except OSError as e:
+            logging.getLogger(__name__).warning("API応答キャッシュの保存に失敗しました: %s", e)
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                # 上書きした場合は多めに数えるが、上限を超えた時点で実際のサイズを数え直す
+                self._size += stored_size
+            if self._size > self.max_size:
+                self._prune()
+
+    def _scan_size(self) -> int:
+        return sum(entry.stat().st_size for entry in os.scandir(self.cache_dir) if entry.name.endswith(".json"))
+
+    def _prune(self) -> None:
+        """
+        合計サイズが上限の9割以下になるまで、古いキャッシュから削除します
+        """
+        entries = sorted(
+            (entry for entry in os.scandir(self.cache_dir) if entry.name.endswith(".json")),
+            key=lambda entry: entry.stat().st_mtime
+        )
+        size = sum(entry.stat().st_size for entry in entries)
+        for entry in entries:
+            if size <= self.max_size * 0.9:
+                break
+            try:
+                size -= entry.stat().st_size
+                os.remove(entry.path)
+            except OSError:
+                pass
+        self._size = size
+
+    @staticmethod
+    def _to_response(entry: dict, headers=None) -> requests.Response:
+        """
+        保存済みの応答からResponseを組み立てます
+        304応答のヘッダーがあれば上書きし、通信した応答として扱います（ない場合は from_cache をTrueにする）
+        """
+        response = requests.Response()
+        response.status_code = 200
+        response._content = entry["text"].encode(entry["encoding"], errors="replace")
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        if headers:
+            response.headers.update(headers)
+        response.url = entry["url"]
+        response.encoding = entry["encoding"]
+        response.from_cache = headers is None
+        return response
+
+    def is_fresh(self, url: str, params=None) -> bool:
+        """
+        有効期間内のキャッシュがあり、通信せずに応答できるかを返します
+
+        Args:
+            url: リクエストURL
+            params: クエリパラメータ
+
+        Returns:
+            通信せずに応答できる場合はTrue
+        """
+        try:
+            mtime = os.path.getmtime(self._cache_path(url, params))
+        except OSError:
+            return False
+        return time.time() - mtime < self.ttl
+
+    def request(self, method, url, params=None, headers=None, **kwargs):
+        if method.upper() != "GET":
+            return super().request(method, url, params=params, headers=headers, **kwargs)
+
+        path = self._cache_path(url, params)
+        entry = self._load(path)
+        if entry is not None and time.time() - entry["stored_at"] < self.ttl:
+            return self._to_response(entry)
+
+        # 保存済みの応答があれば条件付きリクエストにする
+        headers = dict(headers or {})
+        if entry is not None:
+            if entry["headers"].get("ETag"):
+                headers["If-None-Match"] = entry["headers"]["ETag"]
+            if entry["headers"].get("Last-Modified"):
+                headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+
+        response = super().request(method, url, params=params, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry is not None:
+            entry["stored_at"] = time.time()
+            self._store(path, entry)
+            return self._to_response(entry, response.headers)
+        if response.status_code == 200:
+            encoding = response.encoding or response.apparent_encoding or "utf-8"
+            self._store(path, {
+                "url": response.url,
+                "headers": dict(response.headers),
+                "text": response.content.decode(encoding, errors="replace"),
+                "encoding": encoding,
+                "stored_at": time.time(),
+            })
+        return response
+
+def has_fresh_cache(session: requests.Session, url: str, params=None) -> bool:
+    """
+    セッションが有効期間内のキャッシュから応答できるかを返します
+    キャッシュから応答する場合はAPIへの送信待ち（レート制限）を省略できます
+
+    Args:
+        session: HTTPセッション
+        url: リクエストURL
+        params: クエリパラメータ
+
+    Returns:
+        通信せずに応答できる場合はTrue（キャッシュを持たないセッションでは常にFalse）
+    """
+    return isinstance(session, CachedHTTPSession) and session.is_fresh(url, params)
+
+def create_http_session():
+    """
+    APIクライアント用のHTTPセッションを作成します
+    接続をプールして再利用し（TLSハンドシェイクを毎回行わない）、一時的なエラーは待機して再試行します
+    HTTP_CACHE_ENABLED の場合はGETの応答をディスクにキャッシュします
+
+    Returns:
+        設定済みのrequests.Session
+    """
+    retry = Retry(
+        total=config.HTTP_MAX_RETRIES,
+        backoff_factor=config.HTTP_RETRY_BACKOFF,
+        backoff_max=config.HTTP_RETRY_BACKOFF_MAX,
+        backoff_jitter=config.HTTP_RETRY_JITTER,
+        status_forcelist=config.HTTP_RETRY_STATUSES,
+        allowed_methods=["GET"],
+        raise_on_status=False  # 再試行しきった場合も応答を返し、呼び出し元でステータスを確認する
+    )
+    adapter = HTTPAdapter(
+        pool_connections=config.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=config.HTTP_POOL_MAXSIZE,
+        max_retries=retry
+    )
+    if config.HTTP_CACHE_ENABLED:
+        session = CachedHTTPSession(config.HTTP_CACHE_DIR, config.HTTP_CACHE_TTL, config.HTTP_CACHE_MAX_SIZE)
+    else:
+        session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def parse_json_response(response: requests.Response):
+    """
+    API応答の本文をJSONとして解析します
+    orjsonがインストールされていればそちらを使い、なければ requests の標準の解析を使います
+
+    Args:
+        response: HTTP応答
+
+    Returns:
+        解析したJSONの値
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+def dumps_json(value) -> str:
+    """
+    値をJSON文字列に変換します（DBのJSONカラムの保存に使用）
+    orjsonがインストールされていればそちらを使い、orjsonで変換できない値は標準のjsonで変換します
+
+    Args:
+        value: 変換する値
+
+    Returns:
+        JSON文字列
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(value)
+
+def loads_json(text):
+    """
+    JSON文字列を解析します（DBのJSONカラムの読み込みに使用）
+
+    Args:
+        text: JSON文字列
+
+    Returns:
+        解析したJSONの値
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
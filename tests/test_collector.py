@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+DataCollectorクラスのユニットテスト（候補者データの保存処理）
+"""
+import sys
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+# ルートディレクトリをシステムパスに追加
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import config
+from src.database.db_manager import Base
+from src.database.migration import run_migrations
+from src.database.models import Person
+from src.data_collection import collector as collector_module
+from src.data_collection.collector import DataCollector
+
+
+def _person_data(full_name, **kwargs):
+    """テスト用の候補者データを作成"""
+    data = {"full_name": full_name, "is_engineer": True, "data_sources": ["github"]}
+    data.update(kwargs)
+    return data
+
+
+class TestDataCollectorSave(unittest.TestCase):
+    """DataCollectorクラスの保存処理のテスト"""
+
+    def setUp(self):
+        """各テスト前の準備（一時ディレクトリにマイグレーション済みのDBを作成）"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmp_dir.name, "test.db")
+        self.engine = create_engine(f"sqlite:///{db_path}")
+        Base.metadata.create_all(bind=self.engine)
+        with mock.patch.object(config, "DB_PATH", db_path):
+            run_migrations()
+
+        self.db = sessionmaker(bind=self.engine)()
+        self.collector = DataCollector()
+
+    def tearDown(self):
+        """各テスト後の後片付け"""
+        self.collector.close()
+        self.db.close()
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def _count_persons(self):
+        return self.db.query(Person).count()
+
+    def test_save_persons_bulk(self):
+        """新規候補者をまとめて1回のコミットで保存することのテスト"""
+        persons_data = [
+            _person_data("候補者1", github_username="user1"),
+            _person_data("候補者2", github_username="user2"),
+        ]
+
+        with mock.patch.object(self.db, "commit", wraps=self.db.commit) as mock_commit:
+            person_ids = self.collector._save_persons_bulk(persons_data, self.db)
+
+        mock_commit.assert_called_once()
+        self.assertEqual(len(person_ids), 2)
+        self.assertEqual(
+            [self.db.get(Person, person_id).github_username for person_id in person_ids], ["user1", "user2"]
+        )
+
+    def test_save_persons_bulk_updates_existing(self):
+        """既存の候補者と同一人物のデータを統合して更新することのテスト"""
+        existing_id = self.collector._save_persons_bulk([
+            _person_data("候補者1", github_username="user1", experience_summary="既存の経歴")
+        ], self.db)[0]
+        self.collector.clear_caches()
+
+        person_ids = self.collector._save_persons_bulk([
+            _person_data("候補者1", github_username="user1", is_engineer=False, is_researcher=True,
+                         data_sources=["openalex"], experience_summary="論文の経歴"),
+        ], self.db)
+
+        self.assertEqual(person_ids, [existing_id])
+        self.assertEqual(self._count_persons(), 1)
+        person = self.db.get(Person, existing_id)
+        self.db.refresh(person)
+        self.assertEqual(person.experience_summary, "既存の経歴\n\n論文の経歴")
+        self.assertEqual(person.data_sources, ["github", "openalex"])
+        self.assertTrue(person.is_engineer)
+        self.assertTrue(person.is_researcher)
+
+    def test_save_persons_bulk_fallback(self):
+        """一括保存に失敗した場合にロールバックし、1件ずつ保存し直すことのテスト"""
+        create_person = collector_module.create_person
+
+        def failing_create_person(db, person_data, commit=True):
+            if person_data["full_name"] == "エラー候補者":
+                raise ValueError("保存エラー")
+            return create_person(db, person_data, commit=commit)
+
+        persons_data = [
+            _person_data("候補者1", github_username="user1"),
+            _person_data("エラー候補者", github_username="error"),
+            _person_data("候補者2", github_username="user2"),
+        ]
+
+        with mock.patch("src.data_collection.collector.create_person", side_effect=failing_create_person), \
+                mock.patch.object(self.db, "rollback", wraps=self.db.rollback) as mock_rollback:
+            person_ids = self.collector._save_persons_bulk(persons_data, self.db)
+
+        self.assertTrue(mock_rollback.called)
+        self.assertIsNotNone(person_ids[0])
+        self.assertIsNone(person_ids[1])
+        self.assertIsNotNone(person_ids[2])
+        self.assertEqual(
+            sorted(person.full_name for person in self.db.query(Person).all()), ["候補者1", "候補者2"]
+        )
+
+    def test_merge_duplicate_persons(self):
+        """同じバッチ内の同一人物のデータを1件にまとめることのテスト"""
+        persons_data = [
+            _person_data("候補者1", github_username="user1", experience_summary="GitHubの経歴"),
+            _person_data("候補者2", github_username="user2"),
+            _person_data("候補者1", github_username="user1", is_engineer=False, is_researcher=True,
+                         data_sources=["qiita"], experience_summary="Qiitaの経歴"),
+        ]
+
+        merged_data, positions = self.collector._merge_duplicate_persons(persons_data)
+
+        self.assertEqual(positions, [0, 1, 0])
+        self.assertEqual(len(merged_data), 2)
+        merged = merged_data[0]
+        self.assertEqual(merged["experience_summary"], "GitHubの経歴\n\nQiitaの経歴")
+        self.assertEqual(merged["data_sources"], ["github", "qiita"])
+        self.assertTrue(merged["is_engineer"])
+        self.assertTrue(merged["is_researcher"])
+        # 入力の候補者データは書き換えない
+        self.assertEqual(persons_data[0]["experience_summary"], "GitHubの経歴")
+
+    def test_merge_duplicate_persons_by_name_affiliation(self):
+        """氏名と所属の組み合わせでの統合が設定に従うことのテスト"""
+        persons_data = [
+            _person_data("研究者1", current_affiliation="東京大学", orcid_id="0000-0001"),
+            _person_data("研究者1", current_affiliation="東京大学", data_sources=["kaken"]),
+        ]
+
+        with mock.patch.object(config, "PERSON_NAME_MATCH_ENABLED", True):
+            self.assertEqual(self.collector._merge_duplicate_persons(persons_data)[1], [0, 0])
+        with mock.patch.object(config, "PERSON_NAME_MATCH_ENABLED", False):
+            self.assertEqual(self.collector._merge_duplicate_persons(persons_data)[1], [0, 1])
+
+    def test_save_persons_bulk_merges_duplicates(self):
+        """同じバッチ内の同一人物を1人の候補者として保存することのテスト"""
+        persons_data = [
+            _person_data("候補者1", github_username="user1"),
+            _person_data("候補者1", github_username="user1", email="user1@example.com"),
+        ]
+
+        person_ids = self.collector._save_persons_bulk(persons_data, self.db)
+
+        self.assertEqual(person_ids[0], person_ids[1])
+        self.assertEqual(self._count_persons(), 1)
+        self.assertEqual(self.db.get(Person, person_ids[0]).email, "user1@example.com")
+
+    def test_bulk_and_single_save_merge_none_fields_alike(self):
+        """Noneの項目の統合規則が、一括保存と1件ずつの保存で同じであることのテスト"""
+        def batch(username):
+            return [
+                _person_data("候補者", github_username=username, personal_blog_url="https://example.com",
+                             raw_github_data={"login": username}),
+                _person_data("候補者", github_username=username, personal_blog_url=None, raw_github_data=None,
+                             data_sources=["qiita"]),
+            ]
+
+        bulk_id = self.collector._save_persons_bulk(batch("bulk"), self.db)[0]
+        single_ids = [self.collector._save_person_to_db(person_data, self.db) for person_data in batch("single")]
+
+        bulk, single = self.db.get(Person, bulk_id), self.db.get(Person, single_ids[0])
+        self.db.refresh(bulk)
+        self.db.refresh(single)
+        self.assertEqual(single_ids, [single.id, single.id])
+        for field in ("personal_blog_url", "data_sources", "data_sources_mask", "is_engineer", "is_researcher"):
+            self.assertEqual(getattr(bulk, field), getattr(single, field), field)
+        # 項目はNoneで上書きされ、生データはNoneで上書きされない
+        self.assertIsNone(bulk.personal_blog_url)
+        self.assertEqual(bulk.raw_github_data, {"login": "bulk"})
+        self.assertEqual(single.raw_github_data, {"login": "single"})
+
+    def test_collect_data_saves_on_calling_thread(self):
+        """ワーカースレッドの取得結果を呼び出し元のスレッドでまとめて保存することのテスト"""
+        results = {
+            ("github", "python"): [_person_data("候補者1", github_username="user1")],
+            ("qiita", "python"): [_person_data("候補者2", qiita_id="user2", data_sources=["qiita"])],
+            ("github", "go"): [_person_data("候補者3", github_username="user3")],
+        }
+
+        def collect_from_source(source, keyword, max_results):
+            if source == "qiita" and keyword == "go":
+                raise RuntimeError("APIエラー")
+            return results.get((source, keyword), [])
+
+        save_threads = []
+        save_persons_bulk = self.collector._save_persons_bulk
+
+        def record_save_thread(persons_data, db_session):
+            save_threads.append(threading.current_thread())
+            return save_persons_bulk(persons_data, db_session)
+
+        progress_callback = mock.Mock()
+        with mock.patch.object(self.collector, "_collect_data_from_source", side_effect=collect_from_source), \
+                mock.patch.object(self.collector, "_save_persons_bulk", side_effect=record_save_thread):
+            total = self.collector.collect_data(
+                source_configs={
+                    "github": {"keywords": ["python", "go"], "max_results": 5},
+                    "qiita": {"keywords": ["python", "go"], "max_results": 5},
+                },
+                db_session=self.db,
+                progress_callback=progress_callback
+            )
+
+        self.assertEqual(total, 3)
+        self.assertEqual(self._count_persons(), 3)
+        self.assertTrue(save_threads)
+        self.assertTrue(all(thread is threading.current_thread() for thread in save_threads))
+        # 取得に失敗したキーワードも完了として数える
+        self.assertEqual(progress_callback.call_args_list[-1], mock.call(4, 4))
+        self.assertEqual([c.args[0] for c in progress_callback.call_args_list], [1, 2, 3, 4])
+
+
+
+class TestDataCollectorCache(unittest.TestCase):
+    """DataCollectorクラスの収集結果キャッシュのテスト"""
+
+    def setUp(self):
+        """各テスト前の準備（一時ディレクトリに過去日の収集結果キャッシュを作成）"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        for name, value in (("COLLECTOR_CACHE_ENABLED", True), ("COLLECTOR_CACHE_DIR", self.tmp_dir.name)):
+            patcher = mock.patch.object(config, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.collector = DataCollector()
+        self.cache_dir = self.collector._cache_dir("github", "python", 5)
+        self.stale_data = [_person_data("候補者1", github_username="user1")]
+        self.collector._store_cached_results(self.cache_dir, "2000-01-01", self.stale_data)
+
+    def tearDown(self):
+        """各テスト後の後片付け"""
+        self.collector.close()
+        self.tmp_dir.cleanup()
+
+    def test_no_results_does_not_use_stale_cache(self):
+        """検索結果が0件の場合は過去日のキャッシュで代用しないことのテスト"""
+        with mock.patch.object(self.collector.github_client, "search_users", return_value=[]):
+            data = self.collector._collect_data_from_source("github", "python", 5)
+
+        self.assertEqual(data, [])
+        # 0件という結果を当日分としてキャッシュする
+        self.assertEqual(self.collector._load_cached_results(self.cache_dir), [])
+
+    def test_fetch_error_uses_stale_cache(self):
+        """検索に失敗した場合は過去日のキャッシュで代用することのテスト"""
+        with mock.patch.object(self.collector.github_client, "_make_request", return_value=None):
+            data = self.collector._collect_data_from_source("github", "python", 5)
+
+        self.assertEqual(data, self.stale_data)
+        self.assertIsNone(self.collector.collect_from_github("python", 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+"""
+共通ユーティリティ（commonモジュール）のユニットテスト
+"""
+import sys
+import os
+import json
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import requests
+
+# ルートディレクトリをシステムパスに追加
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.common import (
+    CachedHTTPSession, RateLimiter, has_fresh_cache, memoize_results, clear_memoized_results, parse_json_response
+)
+
+
+def _make_response(status_code, text="", headers=None):
+    """テスト用のHTTP応答を作成"""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = text.encode("utf-8")
+    response.headers.update(headers or {})
+    response.encoding = "utf-8"
+    response.url = "https://api.example.com/items?q=test"
+    return response
+
+
+class TestCachedHTTPSession(unittest.TestCase):
+    """CachedHTTPSessionクラスのテスト"""
+
+    def setUp(self):
+        """各テスト前の準備"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.session = CachedHTTPSession(self.tmp_dir.name, ttl=60, max_size=1024 * 1024)
+        self.url = "https://api.example.com/items"
+        self.params = {"q": "test"}
+
+    def tearDown(self):
+        """各テスト後の後片付け"""
+        self.session.close()
+        self.tmp_dir.cleanup()
+
+    @mock.patch('src.utils.common.requests.Session.request')
+    def test_cache_hit(self, mock_request):
+        """有効期間内の応答を通信せずに返すことのテスト"""
+        mock_request.return_value = _make_response(200, '{"name": "テスト"}', {"X-RateLimit-Remaining": "10"})
+
+        first = self.session.get(self.url, params=self.params)
+        second = self.session.get(self.url, params=self.params)
+
+        mock_request.assert_called_once()
+        self.assertFalse(getattr(first, "from_cache", False))
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.json(), {"name": "テスト"})
+        self.assertTrue(has_fresh_cache(self.session, self.url, self.params))
+
+        # 保存形式はpickleではなくJSON（ヘッダーと本文のテキスト）
+        cache_files = os.listdir(self.tmp_dir.name)
+        self.assertEqual(len(cache_files), 1)
+        with open(os.path.join(self.tmp_dir.name, cache_files[0]), encoding="utf-8") as f:
+            entry = json.load(f)
+        self.assertEqual(entry["text"], '{"name": "テスト"}')
+        self.assertEqual(entry["headers"]["X-RateLimit-Remaining"], "10")
+
+    @mock.patch('src.utils.common.requests.Session.request')
+    def test_revalidate_expired_entry(self, mock_request):
+        """期限切れの応答をETagで再検証し、304なら保存済みの本文を返すことのテスト"""
+        mock_request.return_value = _make_response(200, '{"id": 1}', {"ETag": '"abc"'})
+        self.session.get(self.url, params=self.params)
+
+        self.session.ttl = 0
+        mock_request.return_value = _make_response(304, headers={"X-RateLimit-Remaining": "9"})
+        response = self.session.get(self.url, params=self.params)
+
+        self.assertEqual(mock_request.call_args.kwargs["headers"]["If-None-Match"], '"abc"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"id": 1})
+        self.assertEqual(response.headers["X-RateLimit-Remaining"], "9")
+        self.assertFalse(response.from_cache)
+
+    @mock.patch('src.utils.common.requests.Session.request')
+    def test_error_response_not_cached(self, mock_request):
+        """エラー応答は保存しないことのテスト"""
+        mock_request.return_value = _make_response(500, "error")
+
+        self.session.get(self.url, params=self.params)
+        self.session.get(self.url, params=self.params)
+
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertFalse(has_fresh_cache(self.session, self.url, self.params))
+
+
+class _Client:
+    """メモ化のテスト用のAPIクライアント"""
+
+    def __init__(self):
+        self.calls = []
+
+    @memoize_results(maxsize=2)
+    def get_details(self, item_id, detail=False):
+        self.calls.append((item_id, detail))
+        return {"id": item_id} if item_id != "missing" else None
+
+
+class TestMemoizeResults(unittest.TestCase):
+    """memoize_resultsデコレータのテスト"""
+
+    def test_memoize(self):
+        """同じ引数の取得結果を再利用することのテスト"""
+        client = _Client()
+
+        self.assertEqual(client.get_details("a"), {"id": "a"})
+        self.assertEqual(client.get_details("a"), {"id": "a"})
+        client.get_details("a", detail=True)
+
+        self.assertEqual(client.calls, [("a", False), ("a", True)])
+        # インスタンスごとに別のキャッシュを持つ
+        other = _Client()
+        other.get_details("a")
+        self.assertEqual(other.calls, [("a", False)])
+
+    def test_empty_result_not_cached(self):
+        """Noneの結果はキャッシュしないことのテスト"""
+        client = _Client()
+
+        client.get_details("missing")
+        client.get_details("missing")
+
+        self.assertEqual(len(client.calls), 2)
+
+    def test_maxsize(self):
+        """上限を超えた場合に最も古く使われた結果から破棄することのテスト"""
+        client = _Client()
+
+        client.get_details("a")
+        client.get_details("b")
+        client.get_details("a")  # aを最近使ったものにする
+        client.get_details("c")  # bが破棄される
+        client.get_details("a")
+        client.get_details("b")
+
+        self.assertEqual([item_id for item_id, _ in client.calls], ["a", "b", "c", "b"])
+
+    def test_clear_memoized_results(self):
+        """clear_memoized_resultsでキャッシュを破棄することのテスト"""
+        client = _Client()
+        client.get_details("a")
+
+        clear_memoized_results(client)
+        client.get_details("a")
+
+        self.assertEqual(len(client.calls), 2)
+
+
+class _BlockingClient:
+    """実行中の取得の共有をテストするための、呼び出しを止められるAPIクライアント"""
+
+    def __init__(self, error=None):
+        self.calls = 0
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.error = error
+
+    @memoize_results()
+    def get_details(self, item_id):
+        self.calls += 1
+        self.started.set()
+        self.release.wait(timeout=5)
+        if self.error:
+            raise self.error
+        return {"id": item_id}
+
+
+class TestMemoizeResultsInflight(unittest.TestCase):
+    """memoize_resultsの実行中の取得の共有のテスト"""
+
+    def _call_concurrently(self, client, count=3):
+        """同じ引数で複数スレッドから同時に呼び出し、各スレッドの結果（または例外）を返す"""
+        results = [None] * count
+
+        def call(position):
+            try:
+                results[position] = client.get_details("a")
+            except Exception as e:
+                results[position] = e
+
+        threads = [threading.Thread(target=call, args=(0,))]
+        threads[0].start()
+        client.started.wait(timeout=5)
+        # 最初の取得の実行中に、残りのスレッドから同じ引数で呼び出す
+        threads += [threading.Thread(target=call, args=(i,)) for i in range(1, count)]
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.05)
+        client.release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+        return results
+
+    def test_concurrent_calls_share_result(self):
+        """同じ引数の同時呼び出しでリクエストを1回にまとめることのテスト"""
+        client = _BlockingClient()
+
+        results = self._call_concurrently(client)
+
+        self.assertEqual(client.calls, 1)
+        self.assertEqual(results, [{"id": "a"}] * 3)
+
+    def test_concurrent_calls_share_exception(self):
+        """実行中の取得の例外を待っていた呼び出しにも伝え、キャッシュしないことのテスト"""
+        client = _BlockingClient(error=RuntimeError("APIエラー"))
+
+        results = self._call_concurrently(client)
+
+        self.assertEqual(client.calls, 1)
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+
+        client.error = None
+        self.assertEqual(client.get_details("a"), {"id": "a"})
+        self.assertEqual(client.calls, 2)
+
+
+class TestRateLimiter(unittest.TestCase):
+    """RateLimiterクラスのテスト"""
+
+    def setUp(self):
+        """各テスト前の準備（時刻と待機をモックにする）"""
+        self.now = 100.0
+        monotonic_patcher = mock.patch('src.utils.common.time.monotonic', side_effect=lambda: self.now)
+        monotonic_patcher.start()
+        self.addCleanup(monotonic_patcher.stop)
+        sleep_patcher = mock.patch('src.utils.common.time.sleep')
+        self.mock_sleep = sleep_patcher.start()
+        self.addCleanup(sleep_patcher.stop)
+
+    def test_burst(self):
+        """バケットの容量までは待機せずに送れることのテスト"""
+        limiter = RateLimiter(rate=2.0, burst=3)
+
+        for _ in range(3):
+            limiter.acquire()
+
+        self.mock_sleep.assert_not_called()
+
+    def test_wait_when_empty(self):
+        """トークンが不足している場合は補充されるまで待機することのテスト"""
+        limiter = RateLimiter(rate=2.0, burst=1)
+
+        limiter.acquire()
+        limiter.acquire()
+        limiter.acquire()
+
+        # 予約済みのトークンの分だけ待ち時間が延びる（到着順に0.5秒間隔）
+        self.assertEqual([c.args[0] for c in self.mock_sleep.call_args_list], [0.5, 1.0])
+
+    def test_refill(self):
+        """経過時間に応じてトークンが補充されることのテスト"""
+        limiter = RateLimiter(rate=2.0, burst=2)
+        limiter.acquire()
+        limiter.acquire()
+
+        self.now += 10.0  # 容量を超えては補充されない
+        limiter.acquire()
+        limiter.acquire()
+        self.mock_sleep.assert_not_called()
+
+        limiter.acquire()
+        self.mock_sleep.assert_called_once_with(0.5)
+
+
+
+class TestParseJsonResponse(unittest.TestCase):
+    """parse_json_response関数のテスト"""
+
+    def test_with_orjson(self):
+        """orjsonがある場合は応答の本文を直接解析することのテスト"""
+        response = _make_response(200, '{"name": "テスト", "count": 2}')
+        fake_orjson = mock.Mock(loads=mock.Mock(side_effect=json.loads))
+
+        with mock.patch("src.utils.common.orjson", fake_orjson), \
+                mock.patch.object(response, "json") as mock_json:
+            result = parse_json_response(response)
+
+        self.assertEqual(result, {"name": "テスト", "count": 2})
+        fake_orjson.loads.assert_called_once_with(response.content)
+        mock_json.assert_not_called()
+
+    def test_without_orjson(self):
+        """orjsonが無い場合はrequestsの標準の解析を使うことのテスト"""
+        response = _make_response(200, '{"name": "テスト", "count": 2}')
+
+        with mock.patch("src.utils.common.orjson", None):
+            result = parse_json_response(response)
+
+        self.assertEqual(result, {"name": "テスト", "count": 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
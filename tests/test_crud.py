@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+候補者のCRUD操作（crudモジュール）のユニットテスト
+"""
+import sys
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+# ルートディレクトリをシステムパスに追加
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import sessionmaker
+
+import config
+from src.database.db_manager import Base
+from src.database.migration import run_migrations
+from src.database.models import Person
+from src.database import crud
+
+
+class TestCrud(unittest.TestCase):
+    """crudモジュールのテスト"""
+
+    def setUp(self):
+        """各テスト前の準備（一時ディレクトリにマイグレーション済みのDBを作成）"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmp_dir.name, "test.db")
+        self.engine = create_engine(f"sqlite:///{db_path}")
+        Base.metadata.create_all(bind=self.engine)
+        with mock.patch.object(config, "DB_PATH", db_path):
+            run_migrations()
+
+        self.db = sessionmaker(bind=self.engine)()
+        self.db.add_all([
+            Person(full_name="山田太郎", current_affiliation="東京大学", is_researcher=True,
+                   experience_summary="Python と AI の研究者"),
+            Person(full_name="佐藤花子", current_affiliation="株式会社テスト", is_engineer=True,
+                   experience_summary="Python のWebエンジニア"),
+            Person(full_name="鈴木一郎", current_affiliation="株式会社サンプル", is_engineer=True,
+                   experience_summary="機械学習 と AI のエンジニア"),
+        ])
+        self.db.commit()
+
+    def tearDown(self):
+        """各テスト後の後片付け"""
+        self.db.close()
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def _names(self, persons):
+        return sorted(person.full_name for person in persons)
+
+    def _fts_names(self, keyword):
+        """LIKE検索へのフォールバックなしで全文検索した候補者の氏名"""
+        query = crud._apply_keyword_filter(select(Person), keyword.split(), True)
+        return self._names(self.db.execute(query).scalars())
+
+    def test_search_persons_fts(self):
+        """3文字以上の語の全文検索のテスト"""
+        persons = crud.search_persons_fts(self.db, "python")
+
+        self.assertEqual(self._names(persons), ["佐藤花子", "山田太郎"])
+
+    def test_search_persons_fts_mixed_term_lengths(self):
+        """3文字以上の語と短い語が混在する検索で、すべての語を含む候補者だけを返すことのテスト"""
+        self.assertEqual(self._names(crud.search_persons_fts(self.db, "Python AI")), ["山田太郎"])
+        self.assertEqual(self._names(crud.search_persons_fts(self.db, "機械 学習")), ["鈴木一郎"])
+
+    def test_search_persons_fts_short_terms(self):
+        """短い語だけの検索がLIKE条件で絞り込まれることのテスト"""
+        persons = crud.search_persons_fts(self.db, "AI")
+
+        self.assertEqual(self._names(persons), ["山田太郎", "鈴木一郎"])
+
+    def test_search_persons_fts_without_fts_table(self):
+        """全文検索テーブルが無い場合に語ごとのLIKE検索にフォールバックすることのテスト"""
+        with self.engine.begin() as conn:
+            conn.execute(text("DROP TABLE persons_fts"))
+
+        self.assertEqual(self._names(crud.search_persons_fts(self.db, "Python AI")), ["山田太郎"])
+        self.assertEqual(self._names(crud.search_persons_fts(self.db, "python")), ["佐藤花子", "山田太郎"])
+
+    def test_search_persons_fts_no_fts_hits(self):
+        """全文検索でヒットしない場合に語ごとのLIKE検索にフォールバックすることのテスト"""
+        with self.engine.begin() as conn:
+            conn.execute(text("INSERT INTO persons_fts(persons_fts) VALUES ('delete-all')"))
+
+        self.assertEqual(self._fts_names("python"), [])
+        self.assertEqual(self._names(crud.search_persons_fts(self.db, "python")), ["佐藤花子", "山田太郎"])
+        df = crud.search_persons_df(self.db, "Python AI")
+        self.assertEqual(df["full_name"].tolist(), ["山田太郎"])
+
+    def test_search_persons_fts_after_rowid_change(self):
+        """personsのrowidが振り直されても全文検索の結果が変わらないことのテスト"""
+        with self.engine.begin() as conn:
+            conn.execute(text("UPDATE persons SET rowid = rowid + 100"))
+
+        self.assertEqual(self._fts_names("python"), ["佐藤花子", "山田太郎"])
+
+        # 振り直し後に追加・更新・削除した候補者も索引に反映される
+        self.db.add(Person(full_name="高橋次郎", is_engineer=True, experience_summary="Python のデータエンジニア"))
+        self.db.query(Person).filter(Person.full_name == "佐藤花子").update({"experience_summary": "Go のエンジニア"})
+        self.db.query(Person).filter(Person.full_name == "山田太郎").delete()
+        self.db.commit()
+
+        self.assertEqual(self._fts_names("python"), ["高橋次郎"])
+
+    def test_search_persons_df_filters_roles_before_limit(self):
+        """候補者区分で絞り込んだ後に件数の上限を適用することのテスト"""
+        df = crud.search_persons_df(self.db, "AI", include_researchers=False, include_engineers=True, limit=1)
+
+        self.assertEqual(df["full_name"].tolist(), ["鈴木一郎"])
+        self.assertEqual(len(crud.search_persons_df(self.db, "Python")), 2)
+
+    def test_find_persons_by_identifiers_bulk(self):
+        """複数の識別子に一致する既存の候補者を1回のクエリで取得することのテスト"""
+        self.db.add_all([
+            Person(full_name="田中", email="tanaka@example.com"),
+            Person(full_name="伊藤", orcid_id="0000-0002"),
+            Person(full_name="渡辺", github_username="watanabe"),
+        ])
+        self.db.commit()
+
+        persons = crud.find_persons_by_identifiers_bulk(
+            self.db, ["tanaka@example.com", "unknown@example.com"], ["0000-0002"], ["watanabe"],
+            [("山田太郎", "東京大学")]
+        )
+
+        self.assertEqual(self._names(persons), ["伊藤", "山田太郎", "渡辺", "田中"])
+
+    def test_find_persons_by_identifiers_bulk_name_affiliation_pairs(self):
+        """氏名と所属は組み合わせで一致する候補者だけを取得することのテスト"""
+        self.db.add(Person(full_name="山田太郎", current_affiliation="株式会社テスト"))
+        self.db.commit()
+
+        persons = crud.find_persons_by_identifiers_bulk(
+            self.db, [], [], [], [("山田太郎", "株式会社サンプル"), ("佐藤花子", "東京大学")]
+        )
+
+        self.assertEqual(persons, [])
+        self.assertEqual(crud.find_persons_by_identifiers_bulk(self.db, [], [], [], []), [])
+
+    def test_find_persons_by_identifiers_bulk_order(self):
+        """同じ識別子の候補者が複数いる場合に登録順で返すことのテスト"""
+        self.db.add_all([
+            Person(full_name="先に登録", email="same@example.com"),
+            Person(full_name="後に登録", email="same@example.com"),
+        ])
+        self.db.commit()
+
+        persons = crud.find_persons_by_identifiers_bulk(self.db, ["same@example.com"], [], [], [])
+
+        self.assertEqual([person.full_name for person in persons], ["先に登録", "後に登録"])
+
+
+if __name__ == '__main__':
+    unittest.main()
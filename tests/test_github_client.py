@@ -28,14 +28,16 @@ class TestGitHubClient(unittest.TestCase):
         self.assertEqual(self.client.rate_limit_remaining, 5000)
         self.assertEqual(self.client.rate_limit_reset, 0)
 
-    @mock.patch('src.data_collection.github_client.requests.get')
+    @mock.patch('src.data_collection.github_client.requests.Session.get')
     def test_make_request(self, mock_get):
         """_make_requestメソッドのテスト"""
         # モックの設定
         mock_response = mock.Mock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"test": "data"}
+        mock_response.content = b'{"test": "data"}'
         mock_response.headers = {"X-RateLimit-Remaining": "50", "X-RateLimit-Reset": "1000"}
+        mock_response.from_cache = False
         mock_get.return_value = mock_response
 
         # テスト実行
@@ -47,6 +49,26 @@ class TestGitHubClient(unittest.TestCase):
         self.assertEqual(self.client.rate_limit_remaining, 50)
         self.assertEqual(self.client.rate_limit_reset, 1000)
 
+    @mock.patch('src.data_collection.github_client.requests.Session.get')
+    def test_make_request_from_cache(self, mock_get):
+        """キャッシュから返した応答でレートリミット情報を更新しないことのテスト"""
+        # モックの設定
+        mock_response = mock.Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"test": "data"}
+        mock_response.content = b'{"test": "data"}'
+        mock_response.headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1000"}
+        mock_response.from_cache = True
+        mock_get.return_value = mock_response
+
+        # テスト実行
+        result = self.client._make_request('/test')
+
+        # 検証
+        self.assertEqual(result, {"test": "data"})
+        self.assertEqual(self.client.rate_limit_remaining, 5000)
+        self.assertEqual(self.client.rate_limit_reset, 0)
+
     @mock.patch('src.data_collection.github_client.GitHubClient._make_request')
     def test_search_users(self, mock_make_request):
         """search_usersメソッドのテスト"""
@@ -163,6 +185,26 @@ class TestGitHubClient(unittest.TestCase):
         self.assertIn("Language: Python", person_data["experience_summary"])
         self.assertEqual(person_data["raw_github_data"], user_data)
 
+    def test_extract_person_data_trims_raw_data(self):
+        """extract_person_dataが候補者の情報でない項目を生データから除くことのテスト"""
+        user_data = {
+            "login": "testuser",
+            "node_id": "MDQ6VXNlcjE=",
+            "url": "https://api.github.com/users/testuser",
+            "avatar_url": "https://avatars.githubusercontent.com/u/1",
+            "repos_url": "https://api.github.com/users/testuser/repos",
+            "html_url": "https://github.com/testuser",
+            "followers": 10
+        }
+
+        person_data = self.client.extract_person_data(user_data, [])
+
+        self.assertEqual(person_data["raw_github_data"], {
+            "login": "testuser",
+            "html_url": "https://github.com/testuser",
+            "followers": 10
+        })
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -25,7 +25,7 @@ class TestKakenClient(unittest.TestCase):
         self.assertIsNotNone(self.client)
         self.assertEqual(self.client.base_url, "https://nrid.nii.ac.jp/opensearch/")
 
-    @mock.patch('src.data_collection.kaken_client.requests.get')
+    @mock.patch('src.data_collection.kaken_client.requests.Session.get')
     @mock.patch('src.data_collection.kaken_client.BeautifulSoup')
     def test_make_request(self, mock_bs, mock_get):
         """_make_requestメソッドのテスト"""
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+マッチング処理（matcherモジュール）のユニットテスト
+"""
+import sys
+import os
+import pickle
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+# ルートディレクトリをシステムパスに追加
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.nlp_processing import matcher
+
+
+class TestTfidfIndexPersistence(unittest.TestCase):
+    """TF-IDFインデックスの保存と読み込みのテスト"""
+
+    def setUp(self):
+        """各テスト前の準備（前処理は形態素解析の辞書に依存しないよう小文字化だけにする）"""
+        preprocess_patcher = mock.patch("src.nlp_processing.matcher.preprocess_text",
+                                        side_effect=lambda text: text.lower().split())
+        preprocess_patcher.start()
+        self.addCleanup(preprocess_patcher.stop)
+        matcher.preprocess_document.cache_clear()
+        self.addCleanup(matcher.preprocess_document.cache_clear)
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.version = (2, datetime(2024, 1, 1, 12, 0, 0))
+        self.index = matcher.build_tfidf_index_from_texts(
+            ["id1", "id2"], ["python machine learning", "java backend"]
+        )
+
+    def test_save_and_load(self):
+        """保存したインデックスを同じバージョンで読み込めることのテスト"""
+        matcher.save_tfidf_index(self.index, self.tmp_dir.name, self.version)
+
+        loaded = matcher.load_tfidf_index(self.tmp_dir.name, self.version)
+
+        self.assertIsNotNone(loaded)
+        self.assertEqual(loaded[2], ["id1", "id2"])
+        self.assertEqual(
+            matcher.score_requirements("python", loaded), matcher.score_requirements("python", self.index)
+        )
+
+    def test_load_other_version(self):
+        """データバージョンが異なる場合は読み込まないことのテスト"""
+        matcher.save_tfidf_index(self.index, self.tmp_dir.name, self.version)
+
+        self.assertIsNone(matcher.load_tfidf_index(self.tmp_dir.name, (3, self.version[1])))
+        self.assertIsNone(matcher.load_tfidf_index(self.tmp_dir.name, (2, datetime(2024, 1, 2))))
+
+    def test_load_missing(self):
+        """保存されていない場合はNoneを返すことのテスト"""
+        self.assertIsNone(matcher.load_tfidf_index(os.path.join(self.tmp_dir.name, "none"), self.version))
+
+    def test_save_overwrites_single_file(self):
+        """保存し直すとインデックス全体が1つのファイルごと置き換わることのテスト"""
+        matcher.save_tfidf_index(self.index, self.tmp_dir.name, self.version)
+        other = matcher.build_tfidf_index_from_texts(["id3"], ["go backend"])
+        other_version = (3, self.version[1])
+        matcher.save_tfidf_index(other, self.tmp_dir.name, other_version)
+
+        self.assertEqual(os.listdir(self.tmp_dir.name), [matcher.TFIDF_INDEX_FILE])
+        self.assertIsNone(matcher.load_tfidf_index(self.tmp_dir.name, self.version))
+        self.assertEqual(matcher.load_tfidf_index(self.tmp_dir.name, other_version)[2], ["id3"])
+
+    def test_load_mismatched_matrix(self):
+        """文書行列と候補者IDの件数が合わない場合は読み込まないことのテスト"""
+        vectorizer, tfidf_matrix, _ = self.index
+        with open(os.path.join(self.tmp_dir.name, matcher.TFIDF_INDEX_FILE), "wb") as f:
+            pickle.dump({"version": str(self.version), "vectorizer": vectorizer,
+                         "matrix": tfidf_matrix, "ids": ["id1"]}, f)
+
+        self.assertIsNone(matcher.load_tfidf_index(self.tmp_dir.name, self.version))
+
+
+if __name__ == '__main__':
+    unittest.main()
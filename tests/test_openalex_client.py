@@ -10,6 +10,7 @@ from unittest import mock
 # ルートディレクトリをシステムパスに追加
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import config
 from src.data_collection.openalex_client import OpenAlexClient
 
 
@@ -25,23 +26,24 @@ class TestOpenAlexClient(unittest.TestCase):
         self.assertIsNotNone(self.client)
         self.assertIsNotNone(self.client.headers)
         self.assertIn("User-Agent", self.client.headers)
-        self.assertEqual(self.client.request_delay, 0.1)  # 100msの遅延を確認
+        self.assertEqual(self.client.rate_limiter.rate, config.API_RATE_LIMITS["openalex"][0])  # リクエスト間隔はレートリミッタで制御
 
-    @mock.patch('src.data_collection.openalex_client.requests.get')
-    @mock.patch('src.data_collection.openalex_client.time.sleep')
-    def test_make_request(self, mock_sleep, mock_get):
+    @mock.patch('src.data_collection.openalex_client.requests.Session.get')
+    @mock.patch('src.data_collection.openalex_client.RateLimiter.acquire')
+    def test_make_request(self, mock_acquire, mock_get):
         """_make_requestメソッドのテスト"""
         # モックの設定
         mock_response = mock.Mock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"test": "data"}
+        mock_response.content = b'{"test": "data"}'
         mock_get.return_value = mock_response
 
         # テスト実行
         result = self.client._make_request('/test')
 
         # 検証
-        mock_sleep.assert_called_once_with(0.1)
+        mock_acquire.assert_called_once()
         mock_get.assert_called_once()
         self.assertEqual(result, {"test": "data"})
 
@@ -169,6 +171,18 @@ class TestOpenAlexClient(unittest.TestCase):
         self.assertIn("研究分野: Machine Learning, Artificial Intelligence", person_data["experience_summary"])
         self.assertEqual(person_data["raw_openalex_data"], author_data)
 
+    def test_reconstruct_abstract(self):
+        """_reconstruct_abstractメソッドのテスト（出現位置の順に並べ、繰り返し出現する単語も配置する）"""
+        inverted_index = {
+            "learning": [1, 4],
+            "Deep": [0],
+            "and": [2],
+            "machine": [3]
+        }
+
+        self.assertEqual(self.client._reconstruct_abstract(inverted_index), "Deep learning and machine learning")
+        self.assertEqual(self.client._reconstruct_abstract({}), "")
+
 
 if __name__ == "__main__":
     unittest.main()
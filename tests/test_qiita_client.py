@@ -26,14 +26,16 @@ class TestQiitaClient(unittest.TestCase):
         self.assertIsNotNone(self.client.headers)
         self.assertIn("Content-Type", self.client.headers)
 
-    @mock.patch('src.data_collection.qiita_client.requests.get')
+    @mock.patch('src.data_collection.qiita_client.requests.Session.get')
     def test_make_request(self, mock_get):
         """_make_requestメソッドのテスト"""
         # モックの設定
         mock_response = mock.Mock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"test": "data"}
+        mock_response.content = b'{"test": "data"}'
         mock_response.headers = {"Rate-Remaining": "50", "Rate-Reset": "1000"}
+        mock_response.from_cache = False
         mock_get.return_value = mock_response
 
         # テスト実行
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+RecruitmentServiceクラスのユニットテスト
+"""
+import sys
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+# ルートディレクトリをシステムパスに追加
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import Session
+
+from src.database.db_manager import Base, db_session, engine
+from src.database.models import Person
+from src.nlp_processing import matcher
+from src.core import recruitment_service
+from src.core.recruitment_service import RecruitmentService
+
+
+class TestRecruitmentService(unittest.TestCase):
+    """RecruitmentServiceクラスのテスト"""
+
+    def setUp(self):
+        """各テスト前の準備（一時ディレクトリのDBとインデックス保存先を使う）"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{os.path.join(self.tmp_dir.name, 'test.db')}")
+        Base.metadata.create_all(bind=self.engine)
+        db_session.remove()
+        db_session.configure(bind=self.engine)
+
+        index_dir_patcher = mock.patch.object(recruitment_service.config, "TFIDF_INDEX_DIR",
+                                              os.path.join(self.tmp_dir.name, "models"))
+        index_dir_patcher.start()
+        self.addCleanup(index_dir_patcher.stop)
+
+        # 形態素解析の辞書に依存しないよう、前処理は小文字化だけにする
+        preprocess_patcher = mock.patch("src.nlp_processing.matcher.preprocess_text",
+                                        side_effect=lambda text: text.lower().split())
+        preprocess_patcher.start()
+        self.addCleanup(preprocess_patcher.stop)
+        matcher.preprocess_document.cache_clear()
+        self.addCleanup(matcher.preprocess_document.cache_clear)
+
+        with mock.patch("src.core.recruitment_service.init_db"), \
+                mock.patch("src.core.recruitment_service.DataCollector"):
+            self.service = RecruitmentService()
+
+        # 最終更新日時を過去にしておき、マッチングで更新されればデータバージョンが変わるようにする
+        db = db_session()
+        db.add_all([
+            Person(full_name="候補者1", experience_summary="python machine learning engineer",
+                   last_updated_at=datetime(2024, 1, 1)),
+            Person(full_name="候補者2", experience_summary="java backend developer",
+                   last_updated_at=datetime(2024, 1, 1)),
+        ])
+        db.commit()
+        db_session.remove()
+
+    def tearDown(self):
+        """各テスト後の後片付け"""
+        db_session.remove()
+        db_session.configure(bind=engine)
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def test_session_scope_shares_session(self):
+        """セッションスコープ内の呼び出しが同じセッションを共有し、終了時に閉じることのテスト"""
+        person_id = self.service.get_all_persons()[0].id
+
+        with self.service:
+            first = self.service.get_person_by_id(person_id)
+            second = self.service.get_person_by_id(person_id)
+            self.assertIs(first, second)
+            self.assertIn(first, db_session())
+
+        self.assertIsNone(inspect(first).session)
+
+    def test_session_closed_outside_scope(self):
+        """セッションスコープ外では呼び出しごとにセッションを閉じることのテスト"""
+        person = self.service.get_all_persons()[0]
+
+        self.assertIsNone(inspect(person).session)
+
+    def test_match_keeps_session_open_until_scores_saved(self):
+        """スコープ外のマッチングで、インデックス取得後もスコア保存まで同じセッションを閉じないことのテスト"""
+        update_match_scores = recruitment_service.update_match_scores
+        closed_before_save = []
+
+        def record_update(db, score_dict):
+            closed_before_save.append(mock_close.called)
+            return update_match_scores(db, score_dict)
+
+        with mock.patch.object(Session, "close", autospec=True, side_effect=Session.close) as mock_close, \
+                mock.patch("src.core.recruitment_service.update_match_scores", side_effect=record_update):
+            self.service.match_requirements_with_persons("python machine learning")
+
+        self.assertEqual(closed_before_save, [False])
+        self.assertTrue(mock_close.called)
+
+    def test_match_does_not_change_data_version(self):
+        """マッチングスコアの保存でデータバージョンが変わらないことのテスト"""
+        version = self.service.get_data_version()
+
+        results = self.service.match_requirements_with_persons("python machine learning")
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(self.service.get_data_version(), version)
+
+    def test_second_match_reuses_saved_index(self):
+        """2回目以降のマッチングで保存済みインデックスを再利用することのテスト"""
+        with mock.patch("src.core.recruitment_service.build_tfidf_index_from_texts",
+                        wraps=recruitment_service.build_tfidf_index_from_texts) as mock_build:
+            first = self.service.match_requirements_with_persons("python machine learning")
+            second = self.service.match_requirements_with_persons("python machine learning")
+            self.service.match_requirements_with_persons("java backend")
+
+        mock_build.assert_called_once()
+        self.assertEqual(first, second)
+
+
+if __name__ == '__main__':
+    unittest.main()